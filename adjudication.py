@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Early adjudication of decided games.
+
+Games otherwise run until mate, a draw rule or max_moves (200 plies). A
+position that is clearly won or dead drawn can drag on for another hundred
+plies against a weak opponent, each of them costing an endpoint request, an
+opponent move and an ACPL analysis. Adjudication ends such games early:
+
+  resign      the engine eval has been beyond +-resign_cp for resign_plies
+              consecutive plies: the side it favors wins
+  draw        after move draw_after_move, |eval| has stayed within draw_cp for
+              draw_plies consecutive plies: draw
+  tablebase   with at most tablebase_pieces pieces on the board, the Syzygy
+              tablebase result (win, loss, or draw including cursed wins)
+
+Evaluations are the ACPL evaluations (centipawns, White's point of view): with
+the ACPL pipeline the rules see the positions before the current one whose
+analysis has finished, without waiting for the rest; otherwise the current position
+is evaluated on the engine pool and stored in the evaluation cache, where the
+game's ACPL analysis finds it again.
+
+Adjudicated games are reported with results such as
+"White wins (adjudicated: eval above +800 for 8 plies)", so
+they still count as wins, draws and losses but can be told apart.
+
+    adjudication = Adjudication(resign_cp=800, draw_cp=10, tablebase_dir="syzygy/")
+    adjudicator = adjudication.start_game(evals=game_analysis.evals_before)
+    result = adjudicator.check(board)  # None while the game goes on
+"""
+
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import chess
+import chess.syzygy
+
+from engine_pool import PooledAnalyzer
+
+# Marker in the result string of every adjudicated game
+ADJUDICATED = "adjudicated"
+
+
+def is_adjudicated(result: str) -> bool:
+    """Whether a game result string comes from adjudication."""
+    return f"({ADJUDICATED}:" in result
+
+
+def pool_evals(analyzer: PooledAnalyzer) -> Callable[[chess.Board], Dict[int, int]]:
+    """
+    Eval source that evaluates each position on the engine pool (blocking).
+
+    Args:
+        analyzer: Pooled analyzer at the ACPL limits (its cache is shared with
+            the game's ACPL analysis)
+
+    Returns:
+        Callable taking the current board and returning {ply: eval} so far
+    """
+    evals: Dict[int, int] = {}
+
+    def evaluate(board: chess.Board) -> Dict[int, int]:
+        evals[len(board.move_stack)] = analyzer.evaluate_positions([board.copy(stack=False)], [None])[0]
+        return evals
+
+    return evaluate
+
+
+class Adjudication:
+    """Run-wide adjudication rules and the shared tablebase."""
+
+    def __init__(self, resign_cp: Optional[int] = None, resign_plies: int = 8,
+                 draw_cp: Optional[int] = None, draw_plies: int = 8, draw_after_move: int = 40,
+                 tablebase_dir: Optional[str] = None, tablebase_pieces: int = 5):
+        """
+        Initialize the rules.
+
+        Args:
+            resign_cp: Eval magnitude (centipawns) that decides the game (None: off)
+            resign_plies: Consecutive plies the eval must stay beyond resign_cp
+            draw_cp: Eval magnitude within which the game is drawn (None: off)
+            draw_plies: Consecutive plies the eval must stay within draw_cp
+            draw_after_move: Full move from which draw adjudication applies
+            tablebase_dir: Directory (or os.pathsep-separated list) of Syzygy
+                tables (None: off)
+            tablebase_pieces: Adjudicate by tablebase with at most this many pieces
+        """
+        self.resign_cp = resign_cp
+        self.resign_plies = resign_plies
+        self.draw_cp = draw_cp
+        self.draw_plies = draw_plies
+        self.draw_after_move = draw_after_move
+        self.tablebase_pieces = tablebase_pieces
+        self.tablebase: Optional[chess.syzygy.Tablebase] = None
+        if tablebase_dir:
+            self.tablebase = chess.syzygy.open_tablebase(tablebase_dir)
+        # Probing reads shared table files and caches
+        self._tablebase_lock = threading.Lock()
+
+    @property
+    def needs_evals(self) -> bool:
+        """Whether any rule looks at engine evaluations."""
+        return self.resign_cp is not None or self.draw_cp is not None
+
+    def start_game(self, evals: Optional[Callable[[chess.Board], Dict[int, int]]] = None) -> "Adjudicator":
+        """
+        Create the per-game adjudicator.
+
+        Args:
+            evals: Called with the current board, returns the evaluations known
+                so far as {ply: centipawns for White} (None: tablebase only)
+        """
+        return Adjudicator(self, evals if self.needs_evals else None)
+
+    def probe(self, board: chess.Board) -> Optional[int]:
+        """Tablebase WDL for the side to move, or None if not applicable."""
+        if self.tablebase is None or chess.popcount(board.occupied) > self.tablebase_pieces:
+            return None
+        with self._tablebase_lock:
+            try:
+                return self.tablebase.probe_wdl(board)
+            except KeyError:  # table missing from the directory
+                return None
+
+    def describe(self) -> str:
+        """One-line description of the active rules for the run header."""
+        rules = []
+        if self.resign_cp is not None:
+            rules.append(f"resign at |eval| >= {self.resign_cp} for {self.resign_plies} plies")
+        if self.draw_cp is not None:
+            rules.append(f"draw at |eval| <= {self.draw_cp} for {self.draw_plies} plies "
+                         f"after move {self.draw_after_move}")
+        if self.tablebase is not None:
+            rules.append(f"tablebase at <= {self.tablebase_pieces} pieces")
+        return ", ".join(rules) or "Disabled"
+
+    def close(self):
+        """Close the tablebase files."""
+        if self.tablebase is not None:
+            self.tablebase.close()
+
+
+class Adjudicator:
+    """Adjudication state of one game."""
+
+    def __init__(self, adjudication: Adjudication,
+                 evals: Optional[Callable[[chess.Board], Dict[int, int]]] = None):
+        self.adjudication = adjudication
+        self.evals = evals
+
+    @staticmethod
+    def _window(evals: Dict[int, int], plies: int, ply: int) -> Optional[Tuple[int, List[int]]]:
+        """
+        Latest `plies` consecutive known evaluations ending at or before `ply`.
+
+        Pipelined evaluations complete out of order, so the window may end a
+        few plies before the current one.
+
+        Returns:
+            (first ply of the window, its evaluations), or None if there is none
+        """
+        for end in range(ply, max(plies - 2, ply - 2 * plies), -1):
+            start = end - plies + 1
+            window = [evals.get(p) for p in range(start, end + 1)]
+            if all(score is not None for score in window):
+                return start, window
+        return None
+
+    def check(self, board: chess.Board) -> Optional[str]:
+        """
+        Adjudicate the position before the side to move plays.
+
+        Args:
+            board: Current game position (with its move stack)
+
+        Returns:
+            Result string if the game is adjudicated, else None
+        """
+        rules = self.adjudication
+        wdl = rules.probe(board)
+        if wdl is not None:
+            mover = "White" if board.turn == chess.WHITE else "Black"
+            other = "Black" if board.turn == chess.WHITE else "White"
+            # Cursed wins and blessed losses (|wdl| == 1) are draws under the 50-move rule
+            if wdl > 1:
+                return f"{mover} wins ({ADJUDICATED}: tablebase)"
+            if wdl < -1:
+                return f"{other} wins ({ADJUDICATED}: tablebase)"
+            return f"Draw ({ADJUDICATED}: tablebase)"
+
+        if self.evals is None:
+            return None
+        evals = self.evals(board)
+        ply = len(board.move_stack)
+
+        if rules.resign_cp is not None:
+            found = self._window(evals, rules.resign_plies, ply)
+            if found is not None and all(score >= rules.resign_cp for score in found[1]):
+                return f"White wins ({ADJUDICATED}: eval above +{rules.resign_cp} for {rules.resign_plies} plies)"
+            if found is not None and all(score <= -rules.resign_cp for score in found[1]):
+                return f"Black wins ({ADJUDICATED}: eval below -{rules.resign_cp} for {rules.resign_plies} plies)"
+
+        if rules.draw_cp is not None:
+            found = self._window(evals, rules.draw_plies, ply)
+            # The window has to lie entirely after move draw_after_move
+            if (found is not None and found[0] >= 2 * rules.draw_after_move
+                    and all(abs(score) <= rules.draw_cp for score in found[1])):
+                return f"Draw ({ADJUDICATED}: |eval| within {rules.draw_cp} for {rules.draw_plies} plies)"
+        return None
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+ACPL analysis on threads vs worker processes.
+
+Plays `--games` pre-generated random games at 4, 16 and 64 games in flight.
+Each game thread replays its moves with a simulated endpoint delay per ply and
+some per-ply Python work (SAN conversion, as prompt building does), then has
+the finished game analyzed:
+
+  threads:    PooledAnalyzer on a shared EnginePool, in the game's thread
+              (UCI parsing and board replay share the GIL with all games)
+  processes:  ProcessAnalyzer with the same number of engines, one per worker
+              process; only move lists and ACPL results cross over
+
+Both use `--engines` Stockfish processes and no evaluation cache. Reports wall
+time, games/s, mean time per ply on the game threads (the GIL contention the
+games see) and mean analysis time per game.
+
+Usage:
+    python benchmarks/bench_acpl_executor.py --games 64 --engines 8 --depth 7 --movetime-ms 50
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import chess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from engine_pool import EnginePool, PooledAnalyzer, ProcessAnalyzer
+
+
+def random_games(count: int, plies: int, seed: int = 0):
+    """Random legal games of up to `plies` moves, in UCI."""
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        board = chess.Board()
+        moves = []
+        while len(moves) < plies and not board.is_game_over():
+            move = rng.choice(list(board.legal_moves))
+            moves.append(move.uci())
+            board.push(move)
+        games.append(moves)
+    return games
+
+
+def run(games, concurrency: int, analyzer, ply_delay_s: float):
+    """Play and analyze all games; return (wall s, per-ply s list, analysis s list)."""
+    ply_times = []
+    analysis_times = []
+
+    def play(moves):
+        board = chess.Board()
+        for uci in moves:
+            start = time.perf_counter()
+            move = chess.Move.from_uci(uci)
+            board.san(move)
+            [board.san(m) for m in board.legal_moves]
+            board.push(move)
+            time.sleep(ply_delay_s)
+            ply_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        analyzer.analyze_game(moves)
+        analysis_times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(play, games))
+    return time.perf_counter() - start, ply_times, analysis_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=64)
+    parser.add_argument("--plies", type=int, default=60, help="Moves per game")
+    parser.add_argument("--engines", type=int, default=os.cpu_count() or 4,
+                        help="Stockfish processes (pool size / worker processes)")
+    parser.add_argument("--depth", type=int, default=7)
+    parser.add_argument("--movetime-ms", type=int, default=50)
+    parser.add_argument("--ply-delay-ms", type=float, default=5.0, help="Simulated endpoint latency per ply")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[4, 16, 64])
+    args = parser.parse_args()
+
+    games = random_games(args.games, args.plies)
+    print(f"{args.games} games x {args.plies} plies, {args.engines} engines, "
+          f"depth {args.depth} / {args.movetime_ms} ms per position\n")
+    print(f"{'games':>6} {'mode':<10} {'wall s':>8} {'games/s':>8} {'ply ms':>8} {'analysis s':>11}")
+    for concurrency in args.concurrency:
+        for mode in ("threads", "processes"):
+            if mode == "threads":
+                pool = EnginePool(size=args.engines)
+                analyzer = PooledAnalyzer(pool, depth=args.depth, movetime_ms=args.movetime_ms)
+            else:
+                pool = None
+                analyzer = ProcessAnalyzer(args.engines, depth=args.depth, movetime_ms=args.movetime_ms)
+            # Start the engines (and worker processes) before timing
+            with ThreadPoolExecutor(max_workers=args.engines) as warmup:
+                list(warmup.map(analyzer.analyze_game, [[]] * args.engines))
+            wall, ply_times, analysis_times = run(games, concurrency, analyzer, args.ply_delay_ms / 1000.0)
+            if pool is not None:
+                pool.close()
+            else:
+                analyzer.close()
+            print(f"{concurrency:>6} {mode:<10} {wall:8.2f} {len(games) / wall:8.2f} "
+                  f"{statistics.mean(ply_times) * 1000:8.2f} {statistics.mean(analysis_times):11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Harness overhead per ply, with the model and the engine taken out.
+
+Points local_evaluation at an in-process chat-completions stub that answers
+instantly (a plain http.server on 127.0.0.1, no Flask) and at a fake UCI
+engine that answers every `go` at once, then plays full games through the
+usual scheduler, ChessEnvironment, ACPL analysis and game logging. What is
+left is the time the harness itself spends per ply.
+
+CPU time is attributed to stages by wrapping the harness functions below and
+counting each thread's CPU time exclusively (time spent in a nested stage is
+not counted again in the outer one):
+
+  env            ChessEnvironment stepping (play_game minus the agents' moves)
+  agent          choose_move minus prompt and parse: HTTP client, retries
+  prompt         building the prompt
+  parse          parsing and validating the reply
+  opponent       StockfishAgent.choose_move (UCI round trip to the fake engine)
+  analysis       ACPL analysis and result bookkeeping
+  logging        writing the game log
+  stub           the in-process endpoint's request handling
+  other          everything else: engine I/O threads, scheduler, GC
+
+Results are appended to benchmarks/results/harness_overhead.jsonl and compared
+with the previous entry.
+
+Usage:
+    python benchmarks/bench_harness_overhead.py --games 20 --max-games 1
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import chess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import local_evaluation
+from engine_pool import EnginePool
+from game_log_store import GameLogStore
+from game_scheduler import GameScheduler
+from local_evaluation import OpenAIEndpointAgent, StockfishAgent, evaluate_against_opponent
+
+RESULTS_PATH = os.path.join(REPO_ROOT, "benchmarks", "results", "harness_overhead.jsonl")
+STAGES = ("env", "agent", "prompt", "parse", "opponent", "analysis", "logging", "stub", "other")
+
+FEN_PATTERN = re.compile(r"([rnbqkpRNBQKP1-8/]+ [wb] [-KQkq]+ [-a-h1-8]+ \d+ \d+)")
+
+# Instant UCI engine: first legal move, score 0
+FAKE_ENGINE = '''import sys
+import chess
+board = chess.Board()
+for line in sys.stdin:
+    parts = line.split()
+    if not parts:
+        continue
+    if parts[0] == "uci":
+        print("id name InstantEngine")
+        for name in ("Skill Level", "Threads", "Hash"):
+            print(f"option name {name} type spin default 1 min 0 max 65536")
+        print("uciok")
+    elif parts[0] == "isready":
+        print("readyok")
+    elif parts[0] == "position":
+        moves = parts.index("moves") if "moves" in parts else len(parts)
+        board = chess.Board() if parts[1] == "startpos" else chess.Board(" ".join(parts[2:moves]))
+        for uci in parts[moves + 1:]:
+            board.push_uci(uci)
+    elif parts[0] == "go":
+        move = next(iter(board.legal_moves)).uci()
+        print(f"info depth 1 score cp 0 pv {move}")
+        print(f"bestmove {move}")
+    elif parts[0] == "quit":
+        break
+    sys.stdout.flush()
+'''
+
+
+class StageTimer:
+    """Per-stage exclusive CPU time, summed over all threads."""
+
+    def __init__(self):
+        self.cpu = defaultdict(float)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def wrap(self, stage: str, func):
+        @wraps(func)
+        def timed(*args, **kwargs):
+            stack = self._local.__dict__.setdefault("stack", [])
+            stack.append(0.0)  # CPU time of nested stages
+            start = time.thread_time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.thread_time() - start
+                nested = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                with self._lock:
+                    self.cpu[stage] += elapsed - nested
+        return timed
+
+
+def instrument(timer: StageTimer):
+    """Wrap the harness functions with stage timers."""
+    local_evaluation.play_game = timer.wrap("env", local_evaluation.play_game)
+    local_evaluation.analyze_and_record_game = timer.wrap("analysis", local_evaluation.analyze_and_record_game)
+    local_evaluation.save_game_log = timer.wrap("logging", local_evaluation.save_game_log)
+    OpenAIEndpointAgent.choose_move = timer.wrap("agent", OpenAIEndpointAgent.choose_move)
+    OpenAIEndpointAgent._format_prompt = timer.wrap("prompt", OpenAIEndpointAgent._format_prompt)
+    OpenAIEndpointAgent._handle_response = timer.wrap("parse", OpenAIEndpointAgent._handle_response)
+    StockfishAgent.choose_move = timer.wrap("opponent", StockfishAgent.choose_move)
+
+
+def start_stub_server(timer: StageTimer, seed: int) -> ThreadingHTTPServer:
+    """Chat-completions stub answering a random legal move for the prompt's FEN."""
+    rng = random.Random(seed)
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            prompt = body["messages"][-1]["content"]
+            board = chess.Board(FEN_PATTERN.search(prompt).group(1))
+            move = rng.choice(list(board.legal_moves)).uci()
+            reply = json.dumps({
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "stub",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": f"<uci_move>{move}</uci_move>"},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(reply)))
+            self.end_headers()
+            self.wfile.write(reply)
+
+        def log_message(self, format, *args):
+            pass
+
+    StubHandler.do_POST = timer.wrap("stub", StubHandler.do_POST)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def install_fake_engine(directory: str) -> str:
+    """Write the instant engine to `directory` and return its path."""
+    path = os.path.join(directory, "stockfish")
+    with open(path, "w") as f:
+        f.write(f"#!{sys.executable}\n{FAKE_ENGINE}")
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=20, help="Games to play (even)")
+    parser.add_argument("--max-games", type=int, default=1, help="Games in flight at once")
+    parser.add_argument("--engines", type=int, default=2, help="Fake engine processes in the pool")
+    parser.add_argument("--template-file", default="player_agents/llm_agent_prompt_template.jinja")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-save", action="store_true", help="Do not append to the results file")
+    args = parser.parse_args()
+
+    timer = StageTimer()
+    instrument(timer)
+    server = start_stub_server(timer, args.seed)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    with tempfile.TemporaryDirectory() as scratch:
+        pool = EnginePool(size=args.engines, path=install_fake_engine(scratch))
+        with pool.lease():
+            pass  # spawn the first engine before timing
+        player = OpenAIEndpointAgent(base_url=base_url, template_file=args.template_file)
+        opponent = StockfishAgent(depth=1, skill_level=0, engine_pool=pool)
+
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        results = evaluate_against_opponent(
+            player, "Instant engine", opponent, num_games=args.games,
+            template_file=args.template_file, engine_pool=pool,
+            scheduler=GameScheduler(max_games=args.max_games),
+            log_store=GameLogStore(os.path.join(scratch, "logs")),
+        )
+        wall = time.perf_counter() - wall_start
+        cpu_total = time.process_time() - cpu_start
+
+        player.close()
+        pool.close()
+    server.shutdown()
+
+    plies = sum(game.moves_played for game in results.games)
+    stage_cpu = {stage: timer.cpu.get(stage, 0.0) for stage in STAGES if stage != "other"}
+    stage_cpu["other"] = max(0.0, cpu_total - sum(stage_cpu.values()))
+    record = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "games": len(results.games),
+        "max_games": args.max_games,
+        "plies": plies,
+        "wall_s": wall,
+        "cpu_s": cpu_total,
+        "games_per_s": len(results.games) / wall,
+        "plies_per_s": plies / wall,
+        "cpu_ms_per_ply": {stage: cpu * 1000 / plies for stage, cpu in stage_cpu.items()} if plies else {},
+    }
+
+    previous = None
+    if os.path.exists(RESULTS_PATH):
+        with open(RESULTS_PATH) as f:
+            lines = [line for line in f if line.strip()]
+        previous = json.loads(lines[-1]) if lines else None
+
+    print(f"\n{record['games']} games, {plies} plies, {args.max_games} in flight, commit {record['commit']}")
+    print(f"  {record['games_per_s']:.2f} games/s, {record['plies_per_s']:.1f} plies/s, "
+          f"{cpu_total * 1000 / max(plies, 1):.2f} ms CPU per ply")
+    print(f"\n  {'stage':<10} {'CPU ms/ply':>11} {'share':>7}" + (f" {'previous':>9}" if previous else ""))
+    for stage in STAGES:
+        per_ply = record["cpu_ms_per_ply"].get(stage, 0.0)
+        share = stage_cpu[stage] / cpu_total * 100 if cpu_total else 0.0
+        line = f"  {stage:<10} {per_ply:11.3f} {share:6.1f}%"
+        if previous:
+            line += f" {previous.get('cpu_ms_per_ply', {}).get(stage, 0.0):9.3f}"
+        print(line)
+    if previous:
+        print(f"\n  previous ({previous['commit']}, {previous['timestamp']}): "
+              f"{previous['plies_per_s']:.1f} plies/s, {previous['games_per_s']:.2f} games/s")
+
+    if not args.no_save:
+        os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+        with open(RESULTS_PATH, "a") as f:
+            f.write(json.dumps(record) + "\n")
+        print(f"\nSaved to {RESULTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Per-move HTTP overhead: one client per game vs one shared client.
+
+Starts a local stub chat-completions server that answers instantly (HTTP/1.1
+keep-alive) and plays `--games` short games on `--concurrency` threads, each
+move being one OpenAIEndpointAgent.choose_move call:
+
+  per-game:  every game's agent creates its own OpenAI client and connection
+             pool (the behaviour before the shared client)
+  shared:    every agent uses one client from endpoint_client.create_client
+
+Reports mean/p50/p95 time per move and the number of TCP connections the
+server accepted.
+
+Usage:
+    python benchmarks/bench_http_overhead.py --games 200 --moves 20 --concurrency 16
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import chess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from endpoint_client import create_client
+from local_evaluation import OpenAIEndpointAgent
+
+REPLY = json.dumps({
+    "id": "chatcmpl-stub",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "stub",
+    "choices": [{
+        "index": 0,
+        "message": {"role": "assistant", "content": "<think>stub</think><uci_move>e2e4</uci_move>"},
+        "finish_reason": "stop",
+    }],
+    "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers every POST with the same chat completion."""
+    protocol_version = "HTTP/1.1"  # keep connections open between requests
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(REPLY)))
+        self.end_headers()
+        self.wfile.write(REPLY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(base_url: str, games: int, moves: int, concurrency: int, template_file: str, shared: bool):
+    """Play all games; return per-move times in seconds."""
+    client = create_client(base_url, max_connections=concurrency) if shared else None
+    board = chess.Board()
+    legal_moves = list(board.legal_moves)
+    times = []
+    lock = threading.Lock()
+
+    def play(_):
+        agent = OpenAIEndpointAgent(base_url=base_url, template_file=template_file, client=client)
+        game_times = []
+        for _ in range(moves):
+            start = time.perf_counter()
+            agent.choose_move(board, legal_moves, [], "White")
+            game_times.append(time.perf_counter() - start)
+        agent.close()
+        with lock:
+            times.extend(game_times)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(play, range(games)))
+    if client is not None:
+        client.close()
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--moves", type=int, default=20, help="Moves per game")
+    parser.add_argument("--concurrency", type=int, default=16, help="Games in flight at once")
+    parser.add_argument("--template-file", default="player_agents/llm_agent_prompt_template.jinja")
+    args = parser.parse_args()
+
+    template_file = os.path.join(REPO_ROOT, args.template_file)
+    print(f"{args.games} games x {args.moves} moves, {args.concurrency} at a time\n")
+    print(f"{'client':<10} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'connections':>12} {'wall s':>8}")
+    for label, shared in (("per-game", False), ("shared", True)):
+        server = start_stub_server()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+        start = time.perf_counter()
+        times = run(base_url, args.games, args.moves, args.concurrency, template_file, shared)
+        wall = time.perf_counter() - start
+        server.shutdown()
+        times_ms = sorted(t * 1000 for t in times)
+        p95 = times_ms[int(len(times_ms) * 0.95) - 1]
+        print(f"{label:<10} {statistics.mean(times_ms):9.3f} {statistics.median(times_ms):9.3f} "
+              f"{p95:9.3f} {server.connections:12d} {wall:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for prompt construction in local_evaluation.py.
+
+For every Jinja template in player_agents/, plays a set of seeded random games
+and times building the prompt for each ply two ways:
+
+  eager:  read + parse the template on every call and compute every variable,
+          replaying the whole game for the SAN history and last move
+          (the behaviour before templates were compiled once and the
+          history was kept in a per-game context; reproduced inline below)
+  lazy:   compiled template from the cache, computing only the variables the
+          template references
+
+Usage:
+    python benchmarks/bench_prompt_build.py --games 20 --plies 120
+"""
+
+import argparse
+import glob
+import os
+import random
+import sys
+import time
+
+import chess
+from jinja2 import Template
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from local_evaluation import OpenAIEndpointAgent
+
+
+def random_games(num_games: int, max_plies: int, seed: int):
+    """Generate seeded random games as lists of moves."""
+    rng = random.Random(seed)
+    games = []
+    for _ in range(num_games):
+        board = chess.Board()
+        moves = []
+        while not board.is_game_over() and len(moves) < max_plies:
+            move = rng.choice(list(board.legal_moves))
+            board.push(move)
+            moves.append(move)
+        games.append(moves)
+    return games
+
+
+def eager_context(agent: OpenAIEndpointAgent, board: chess.Board, legal_moves, move_history,
+                  side_to_move: str) -> dict:
+    """Every template variable, computed from scratch as the original _build_prompt_context did."""
+    fen = board.fen()
+    board_utf = agent._render_board_unicode(board)
+    board_ascii = board.unicode()
+
+    if board.move_stack:
+        # SAN of the last move needs the position before it: replay the game
+        temp_board = chess.Board()
+        for move in board.move_stack[:-1]:
+            temp_board.push(move)
+        last_side = "Black" if board.turn else "White"
+        last_move_desc = f"{last_side} played {temp_board.san(board.move_stack[-1])}"
+    else:
+        last_move_desc = "(start of game)"
+
+    legal_moves_uci_list = [move.uci() for move in legal_moves]
+    legal_moves_san_list = [board.san(move) for move in legal_moves]
+
+    if move_history:
+        move_history_uci_list = list(move_history)
+        move_history_uci_str = " ".join(move_history_uci_list)
+        # The whole SAN history, replayed from the start position on every call
+        history_board = chess.Board()
+        move_history_san_list = []
+        for uci_move in move_history:
+            try:
+                move = chess.Move.from_uci(uci_move)
+                move_history_san_list.append(history_board.san(move))
+                history_board.push(move)
+            except Exception:
+                move_history_san_list.append(uci_move)
+        move_history_san_str = " ".join(move_history_san_list)
+    else:
+        move_history_uci_list = []
+        move_history_san_list = []
+        move_history_uci_str = "(no moves yet)"
+        move_history_san_str = "(no moves yet)"
+
+    return {
+        "board_utf": board_utf,
+        "board_ascii": board_ascii,
+        "FEN": fen,
+        "side_to_move": side_to_move,
+        "last_move": last_move_desc,
+        "legal_moves_uci": " ".join(legal_moves_uci_list),
+        "legal_moves_san": " ".join(legal_moves_san_list),
+        "move_history_uci": move_history_uci_str,
+        "move_history_san": move_history_san_str,
+        "legal_moves_uci_list": legal_moves_uci_list,
+        "legal_moves_san_list": legal_moves_san_list,
+        "move_history_uci_list": move_history_uci_list,
+        "move_history_san_list": move_history_san_list,
+        "first_legal_move": legal_moves_uci_list[0] if legal_moves_uci_list else "",
+    }
+
+
+def time_template(template_file: str, games, eager: bool) -> tuple:
+    """Return (total seconds, prompts built) for one template over all games."""
+    template_path = os.path.join(REPO_ROOT, template_file)
+    total = 0.0
+    prompts = 0
+    for moves in games:
+        # One agent per game, as in evaluate_against_opponent
+        agent = OpenAIEndpointAgent(base_url="http://localhost:0/v1", template_file=template_file)
+        board = chess.Board()
+        history = []
+        for move in moves:
+            legal_moves = list(board.legal_moves)
+            side_to_move = "White" if board.turn == chess.WHITE else "Black"
+            start = time.perf_counter()
+            if eager:
+                context = eager_context(agent, board, legal_moves, history, side_to_move)
+                with open(template_path, "r") as f:
+                    Template(f.read()).render(**context)
+            else:
+                agent._format_prompt(board, legal_moves, history, side_to_move)
+            total += time.perf_counter() - start
+            prompts += 1
+            board.push(move)
+            history.append(move.uci())
+    return total, prompts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prompt building per template")
+    parser.add_argument("--games", type=int, default=20, help="Number of random games (default: 20)")
+    parser.add_argument("--plies", type=int, default=120, help="Maximum plies per game (default: 120)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    games = random_games(args.games, args.plies, args.seed)
+    templates = sorted(glob.glob(os.path.join(REPO_ROOT, "player_agents", "*.jinja")))
+
+    print(f"{'template':<40} {'eager us/prompt':>16} {'lazy us/prompt':>15} {'speedup':>8}")
+    print("-" * 82)
+    for path in templates:
+        template_file = os.path.relpath(path, REPO_ROOT)
+        eager_s, n = time_template(template_file, games, eager=True)
+        lazy_s, _ = time_template(template_file, games, eager=False)
+        eager_us = eager_s / n * 1e6
+        lazy_us = lazy_s / n * 1e6
+        print(f"{os.path.basename(path):<40} {eager_us:>16.1f} {lazy_us:>15.1f} {eager_us / lazy_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Load test for a chat-completions server: throughput and latency by concurrency.
+
+Sends `--requests` move prompts (built from seeded random positions with the
+prompt template, as OpenAIEndpointAgent would) at each concurrency level, with
+that many client threads sharing one keep-alive connection pool, and reports
+requests/s and p50/p95 latency. When the server's /health reports batching
+and prefix-cache stats (the servers in player_agents/), the mean batch
+size and the share of prompt tokens whose prefill the prefix cache saved are
+shown for each level as well.
+
+To compare dynamic batching with one `generate` per request, run the server
+once with its defaults and once with `--max-batch-size 1 --max-wait-ms 0`:
+
+    python player_agents/transformers_agent_flask_server.py --model <path> --port 5000
+    python benchmarks/bench_server_batching.py --endpoint http://localhost:5000/v1
+
+Likewise, restarting the server with `--prefix-cache` and comparing the
+concurrency-1 latency shows what reusing the prompt prefix's KV cache saves.
+
+Usage:
+    python benchmarks/bench_server_batching.py --concurrency 1 8 32 64 --requests 128
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import chess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from endpoint_client import create_client, httpx
+from local_evaluation import OpenAIEndpointAgent
+
+
+def random_prompts(count: int, template_file: str, seed: int):
+    """Build `count` prompts for positions from seeded random games."""
+    rng = random.Random(seed)
+    agent = OpenAIEndpointAgent(base_url="http://localhost:0/v1", template_file=template_file)
+    prompts = []
+    while len(prompts) < count:
+        board = chess.Board()
+        history = []
+        for _ in range(rng.randint(0, 60)):
+            if board.is_game_over():
+                break
+            move = rng.choice(list(board.legal_moves))
+            board.push(move)
+            history.append(move.uci())
+        if board.is_game_over():
+            continue
+        side_to_move = "White" if board.turn == chess.WHITE else "Black"
+        prompts.append(agent._format_prompt(board, list(board.legal_moves), history, side_to_move))
+    return prompts
+
+
+def server_stats(base_url: str) -> dict:
+    """The server's /health body (empty if unavailable)."""
+    try:
+        return httpx.get(base_url.rstrip("/").removesuffix("/v1") + "/health", timeout=5.0).json()
+    except Exception:
+        return {}
+
+
+def counter_delta(before: dict, after: dict, section: str, numerator: str, denominator: str):
+    """Ratio of two counters' increase in a /health section, or None if not reported."""
+    if section not in before or section not in after:
+        return None
+    total = after[section][denominator] - before[section][denominator]
+    return (after[section][numerator] - before[section][numerator]) / total if total else None
+
+
+def run_level(base_url: str, prompts, concurrency: int, max_tokens: int, temperature: float) -> dict:
+    """Send every prompt with `concurrency` threads; return throughput and latency stats."""
+    client = create_client(base_url, max_connections=concurrency)
+
+    def send(prompt):
+        """(latency in seconds, whether the request succeeded)"""
+        start = time.perf_counter()
+        try:
+            client.chat.completions.create(
+                model="aicrowd-chess-model",
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
+                temperature=temperature,
+            )
+        except Exception:
+            return time.perf_counter() - start, False
+        return time.perf_counter() - start, True
+
+    before = server_stats(base_url)
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(send, prompts))
+    wall = time.perf_counter() - wall_start
+    after = server_stats(base_url)
+    client.close()
+
+    # Latencies of successful requests only; failures are counted as errors
+    latencies = sorted(latency for latency, ok in results if ok)
+
+    stats = {
+        "concurrency": concurrency,
+        "requests_per_s": len(prompts) / wall,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else None,
+        "p95_ms": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] * 1000 if latencies else None,
+        "errors": len(results) - len(latencies),
+        "mean_batch": counter_delta(before, after, "serving", "requests", "batches"),
+        "cached": counter_delta(before, after, "prefix_cache", "prefill_tokens_saved", "prompt_tokens"),
+    }
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint", default="http://localhost:5000/v1", help="Chat-completions base URL")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64],
+                        help="Concurrency levels to test (default: 1 8 32 64)")
+    parser.add_argument("--requests", type=int, default=128, help="Requests per level (default: 128)")
+    parser.add_argument("--max-tokens", type=int, default=150)
+    parser.add_argument("--temperature", type=float, default=0.1)
+    parser.add_argument("--template-file", default="player_agents/llm_agent_prompt_template.jinja")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    prompts = random_prompts(args.requests, args.template_file, args.seed)
+    # Warm up the server (first-request allocations, CUDA kernels) outside the measurement
+    run_level(args.endpoint, prompts[:2], 1, args.max_tokens, args.temperature)
+
+    print(f"\n{args.requests} requests per level against {args.endpoint}")
+    print(f"\n  {'concurrency':>11} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'batch':>6} {'cached':>7} {'errors':>7}")
+    for concurrency in args.concurrency:
+        stats = run_level(args.endpoint, prompts, concurrency, args.max_tokens, args.temperature)
+        batch = f"{stats['mean_batch']:6.1f}" if stats["mean_batch"] is not None else f"{'-':>6}"
+        cached = f"{stats['cached']:7.1%}" if stats["cached"] is not None else f"{'-':>7}"
+        p50, p95 = (f"{stats[key]:9.1f}" if stats[key] is not None else f"{'-':>9}" for key in ("p50_ms", "p95_ms"))
+        print(f"  {concurrency:11d} {stats['requests_per_s']:8.2f} {p50} "
+              f"{p95} {batch} {cached} {stats['errors']:7d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Shared OpenAI clients for every game of an evaluation run.
+
+An `OpenAI` client owns an HTTP connection pool. Creating one per game means
+connections are never reused across games and every game pays TCP setup again.
+The harness instead creates one client per run, with a keep-alive pool sized to
+the number of requests that can be in flight, and hands it to every per-game
+agent:
+
+    client = create_client(base_url, api_key, max_connections=64)
+    agent = OpenAIEndpointAgent(base_url, api_key, client=client)
+
+HTTP/2 multiplexes all requests over one connection, but needs the `h2` package
+and a backend that speaks HTTP/2 (vLLM and the agent servers, both on uvicorn, only
+speak HTTP/1.1, where keep-alive reuse is what the pool provides).
+"""
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+
+def _http_options(max_connections: int, http2: bool) -> dict:
+    """httpx client options for a pool of `max_connections` kept-alive connections."""
+    options = {
+        "limits": httpx.Limits(max_connections=max_connections,
+                               max_keepalive_connections=max_connections,
+                               keepalive_expiry=60.0),
+    }
+    if http2:
+        try:
+            import h2  # noqa: F401
+            options["http2"] = True
+        except ImportError:
+            print("Warning: HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+    return options
+
+
+def create_client(base_url: str, api_key: str = "dummy", max_connections: int = 64,
+                  http2: bool = False) -> OpenAI:
+    """
+    Create the run-wide blocking client.
+
+    Args:
+        base_url: Base URL of the OpenAI-compatible API endpoint
+        api_key: API key for the endpoint
+        max_connections: Size of the keep-alive connection pool
+        http2: Negotiate HTTP/2 where the backend supports it
+
+    Returns:
+        OpenAI client backed by the shared pool
+    """
+    http_client = DefaultHttpxClient(**_http_options(max_connections, http2))
+    return OpenAI(base_url=base_url, api_key=api_key, http_client=http_client)
+
+
+def create_async_client(base_url: str, api_key: str = "dummy", max_connections: int = 64,
+                        http2: bool = False) -> AsyncOpenAI:
+    """
+    Create the run-wide asyncio client (call from the event loop that uses it).
+
+    Args:
+        base_url: Base URL of the OpenAI-compatible API endpoint
+        api_key: API key for the endpoint
+        max_connections: Size of the keep-alive connection pool
+        http2: Negotiate HTTP/2 where the backend supports it
+
+    Returns:
+        AsyncOpenAI client backed by the shared pool
+    """
+    http_client = DefaultAsyncHttpxClient(**_http_options(max_connections, http2))
+    return AsyncOpenAI(base_url=base_url, api_key=api_key, http_client=http_client)
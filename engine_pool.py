@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Pool of long-lived Stockfish processes shared by opponents and ACPL analysis.
+
+Spawning a fresh `stockfish` process (and UCI handshake) for every game and
+every analysis adds up over 1000-game runs, and each new process starts with a
+cold hash table. The pool keeps up to `size` engines alive for the whole run
+and hands them out as leases:
+
+    pool = EnginePool(size=8)
+    with pool.lease(options={"Skill Level": 0}, limit=chess.engine.Limit(depth=1)) as engine:
+        result = engine.play(board)
+
+Every lease applies the pool's base options plus its own (Skill Level, Threads,
+Hash, ...), so settings never leak from one role to the next, and searches are
+tagged with a game key so the engine receives `ucinewgame` whenever it switches
+to a different game.
+
+ProcessAnalyzer runs whole-game ACPL analysis in worker processes instead,
+each with its own engines, so UCI parsing and board replay do not compete with
+the game threads for the GIL.
+"""
+
+import asyncio
+import concurrent.futures
+import multiprocessing
+import multiprocessing.util
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import chess
+import chess.engine
+
+from eval_cache import MATE_SCORE, EvalCache, limits_key
+
+
+# Options applied to every lease unless overridden. Skill Level is reset to full
+# strength so an engine used as a weak opponent is not reused weak for analysis.
+DEFAULT_OPTIONS = {
+    "Skill Level": 20,
+    "Threads": 1,
+    "Hash": 16,
+}
+
+
+# Errors that leave a leased engine in an unknown state (dead, mid-search or
+# with a reply still pending): the engine is quit and a fresh one spawned.
+# EngineTerminatedError is an EngineError.
+BROKEN_ENGINE_ERRORS = (chess.engine.EngineError, TimeoutError, asyncio.TimeoutError,
+                        concurrent.futures.TimeoutError, OSError)
+
+
+class EngineLease:
+    """A pooled engine handed out for one game or one search."""
+
+    def __init__(self, engine: chess.engine.SimpleEngine, game: object,
+                 limit: Optional[chess.engine.Limit] = None):
+        self.engine = engine
+        self.game = game
+        self.limit = limit
+
+    def play(self, board: chess.Board, limit: Optional[chess.engine.Limit] = None,
+             **kwargs) -> chess.engine.PlayResult:
+        """Search for a move, using the lease's limit if none is given."""
+        return self.engine.play(board, limit or self.limit, game=self.game, **kwargs)
+
+    def analyse(self, board: chess.Board, limit: Optional[chess.engine.Limit] = None,
+                **kwargs):
+        """Analyse a position, using the lease's limit if none is given."""
+        return self.engine.analyse(board, limit or self.limit, game=self.game, **kwargs)
+
+
+class EnginePool:
+    """Bounded pool of Stockfish processes handed out as leases."""
+
+    def __init__(self, size: Optional[int] = None, path: str = "stockfish",
+                 base_options: Optional[Dict[str, object]] = None):
+        """
+        Initialize the pool. Engines are spawned lazily, up to `size`.
+
+        Args:
+            size: Maximum number of engine processes (default: CPU count)
+            path: Path to the Stockfish binary
+            base_options: UCI options applied to every lease before its own
+        """
+        self.size = size or os.cpu_count() or 4
+        self.path = path
+        self.base_options = dict(DEFAULT_OPTIONS)
+        if base_options:
+            self.base_options.update(base_options)
+        self._idle: List[chess.engine.SimpleEngine] = []
+        self._spawned = 0
+        self._closed = False
+        self._foreground_waiting = 0
+        self._cond = threading.Condition()
+        self.leases = 0
+        self.spawns = 0
+
+    def _acquire(self, background: bool = False) -> chess.engine.SimpleEngine:
+        """
+        Take an idle engine, spawning one if below `size`, else wait.
+
+        Background leases (analysis) yield to foreground ones (opponent moves):
+        they only get an engine while no foreground lease is waiting.
+        """
+        with self._cond:
+            if not background:
+                self._foreground_waiting += 1
+            try:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("engine pool is closed")
+                    if background and self._foreground_waiting:
+                        self._cond.wait()
+                        continue
+                    if self._idle:
+                        # LIFO: the most recently used engine has the warmest hash
+                        self.leases += 1
+                        return self._idle.pop()
+                    if self._spawned < self.size:
+                        # Counted under the lock; rolled back below if the spawn fails
+                        self._spawned += 1
+                        self.spawns += 1
+                        self.leases += 1
+                        break
+                    self._cond.wait()
+            finally:
+                if not background:
+                    self._foreground_waiting -= 1
+                    self._cond.notify_all()
+
+        try:
+            engine = chess.engine.SimpleEngine.popen_uci(self.path)
+        except Exception:
+            with self._cond:
+                self._spawned -= 1
+                self.spawns -= 1
+                self.leases -= 1
+                self._cond.notify_all()
+            raise
+        return engine
+
+    def _release(self, engine: chess.engine.SimpleEngine, broken: bool = False):
+        """Return an engine to the pool, or discard it if it died."""
+        with self._cond:
+            if broken or self._closed:
+                self._spawned -= 1
+            else:
+                self._idle.append(engine)
+            self._cond.notify_all()
+        if broken or self._closed:
+            try:
+                engine.quit()
+            except Exception:
+                pass
+
+    @contextmanager
+    def lease(self, options: Optional[Dict[str, object]] = None,
+              limit: Optional[chess.engine.Limit] = None, game: Optional[object] = None,
+              background: bool = False):
+        """
+        Lease an engine configured with the base options plus `options`.
+
+        Args:
+            options: UCI options for this lease (e.g. {"Skill Level": 0, "Hash": 64})
+            limit: Default search limit for the lease (e.g. Limit(depth=1))
+            game: Game key; the engine gets `ucinewgame` when it differs from the
+                engine's previous search. Defaults to a fresh key per lease.
+            background: Low-priority lease (analysis) that waits while any
+                foreground lease (opponent move) is waiting for an engine
+
+        Yields:
+            EngineLease wrapping the engine
+        """
+        engine = self._acquire(background=background)
+        broken = False
+        try:
+            config = dict(self.base_options)
+            if options:
+                config.update(options)
+            # python-chess only sends setoption for values that changed
+            engine.configure({name: value for name, value in config.items()
+                              if name in engine.options})
+            yield EngineLease(engine, game if game is not None else object(), limit)
+        except BROKEN_ENGINE_ERRORS:
+            broken = True
+            raise
+        except BaseException as e:
+            # KeyboardInterrupt and the like can land in the middle of a search
+            broken = not isinstance(e, Exception)
+            raise
+        finally:
+            self._release(engine, broken=broken)
+
+    def close(self):
+        """Quit all idle engines; leased engines are quit when returned."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._spawned -= len(idle)
+            self._cond.notify_all()
+        for engine in idle:
+            try:
+                engine.quit()
+            except Exception:
+                pass
+
+
+class PooledAnalyzer:
+    """
+    ACPL analyzer running on a leased pool engine.
+
+    Drop-in replacement for chess-env's _StockfishAnalyzer: every position of
+    the game is evaluated once at the given limits and each ply's loss is the
+    drop in evaluation from the mover's point of view. Positions found in the
+    evaluation cache are not searched again.
+    """
+
+    def __init__(self, pool: EnginePool, depth: int = 7, movetime_ms: int = 1000,
+                 cache: Optional[EvalCache] = None):
+        self.pool = pool
+        self.depth = depth
+        self.movetime_ms = movetime_ms
+        self.cache = cache
+        self.cache_limits = limits_key(depth, movetime_ms)
+
+    @property
+    def limit(self) -> chess.engine.Limit:
+        return chess.engine.Limit(depth=self.depth, time=self.movetime_ms / 1000.0)
+
+    def evaluate_positions(self, boards: List[chess.Board],
+                           outcomes: List[Optional[chess.Outcome]]) -> List[int]:
+        """Evaluate each board in centipawns from White's point of view."""
+        evals: List[Optional[int]] = []
+        for board, outcome in zip(boards, outcomes):
+            if outcome is not None:
+                # Terminal positions are scored directly; engines return no score
+                evals.append(terminal_score(outcome))
+            elif self.cache is not None:
+                evals.append(self.cache.get(board, self.cache_limits))
+            else:
+                evals.append(None)
+
+        missing = [ply for ply, score in enumerate(evals) if score is None]
+        if missing:
+            with self.pool.lease(options={"Skill Level": 20}, limit=self.limit, background=True) as lease:
+                for ply in missing:
+                    info = lease.analyse(boards[ply])
+                    evals[ply] = info["score"].white().score(mate_score=MATE_SCORE)
+                    if self.cache is not None:
+                        self.cache.put(boards[ply], self.cache_limits, evals[ply])
+        return evals
+
+    def analyze_game(self, move_history: List[str]) -> dict:
+        """
+        Compute per-side average centipawn loss for a game.
+
+        Args:
+            move_history: Moves played, in UCI notation
+
+        Returns:
+            Dictionary with "white_acpl" and "black_acpl"
+        """
+        board = chess.Board()
+        boards = [board.copy(stack=False)]
+        outcomes = [board.outcome()]
+        for uci in move_history:
+            board.push_uci(uci)
+            boards.append(board.copy(stack=False))
+            outcomes.append(board.outcome())
+
+        return acpl_from_evals(self.evaluate_positions(boards, outcomes))
+
+
+def terminal_score(outcome: chess.Outcome) -> int:
+    """Score of a finished game from White's point of view."""
+    if outcome.winner is None:
+        return 0
+    return MATE_SCORE if outcome.winner == chess.WHITE else -MATE_SCORE
+
+
+def acpl_from_evals(evals: List[int]) -> dict:
+    """
+    Turn White-relative evaluations of consecutive positions into ACPL.
+
+    Args:
+        evals: Evaluation of the start position and after every ply
+
+    Returns:
+        Dictionary with "white_acpl" and "black_acpl"
+    """
+    losses = {chess.WHITE: [], chess.BLACK: []}
+    for ply in range(len(evals) - 1):
+        mover = chess.WHITE if ply % 2 == 0 else chess.BLACK
+        before, after = evals[ply], evals[ply + 1]
+        if mover == chess.BLACK:
+            before, after = -before, -after
+        losses[mover].append(max(0, before - after))
+
+    def average(values):
+        return sum(values) / len(values) if values else 0.0
+
+    return {
+        "white_acpl": average(losses[chess.WHITE]),
+        "black_acpl": average(losses[chess.BLACK]),
+    }
+
+
+class AnalysisPipeline:
+    """
+    Run-wide ACPL pipeline that analyzes positions while games are in progress.
+
+    Each game gets a GameAnalysis; positions are queued as soon as they occur
+    and evaluated on pool engines in background leases, so analysis overlaps
+    with the time the LLM endpoint spends thinking. At game end only the
+    positions still in flight have to be waited for.
+    """
+
+    def __init__(self, pool: EnginePool, depth: int = 7, movetime_ms: int = 1000,
+                 cache: Optional[EvalCache] = None):
+        self.pool = pool
+        self.depth = depth
+        self.movetime_ms = movetime_ms
+        self.limit = chess.engine.Limit(depth=depth, time=movetime_ms / 1000.0)
+        self.cache = cache
+        self.cache_limits = limits_key(depth, movetime_ms)
+        self.executor = ThreadPoolExecutor(max_workers=pool.size, thread_name_prefix="acpl")
+
+    def start_game(self) -> "GameAnalysis":
+        """Create the per-game analysis handle."""
+        return GameAnalysis(self)
+
+    def evaluate(self, board: chess.Board, game: object) -> int:
+        """Evaluate one position in centipawns from White's point of view."""
+        if self.cache is not None:
+            score = self.cache.get(board, self.cache_limits)
+            if score is not None:
+                return score
+        with self.pool.lease(options={"Skill Level": 20}, limit=self.limit,
+                             game=game, background=True) as lease:
+            info = lease.analyse(board)
+        score = info["score"].white().score(mate_score=MATE_SCORE)
+        if self.cache is not None:
+            self.cache.put(board, self.cache_limits, score)
+        return score
+
+    def close(self):
+        """Wait for queued analyses and stop the worker threads."""
+        self.executor.shutdown(wait=True)
+
+
+class GameAnalysis:
+    """Per-game set of position evaluations, joined when the game ends."""
+
+    def __init__(self, pipeline: AnalysisPipeline):
+        self.pipeline = pipeline
+        self._futures: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+
+    def add_position(self, board: chess.Board):
+        """
+        Queue the position on `board` (ply = length of its move stack).
+
+        Safe to call more than once per ply; later calls are ignored.
+        """
+        ply = len(board.move_stack)
+        with self._lock:
+            if ply in self._futures:
+                return
+            position = board.copy(stack=False)
+            self._futures[ply] = self.pipeline.executor.submit(self.pipeline.evaluate, position, self)
+
+    def evals_before(self, board: chess.Board) -> Dict[int, int]:
+        """
+        Evaluations of the positions before `board` that have already finished.
+
+        Never waits: positions still being analysed are left out, so the game
+        keeps running ahead of its analysis and the adjudicator works with the
+        latest complete window it has. Serves as the adjudication eval source.
+
+        Args:
+            board: Current game position (its move stack length is the current ply)
+
+        Returns:
+            {ply: centipawns from White's point of view}
+        """
+        ply = len(board.move_stack)
+        with self._lock:
+            futures = [(p, future) for p, future in self._futures.items() if p < ply and future.done()]
+        evals = {}
+        for p, future in futures:
+            if future.exception() is None:  # failures are reported by result() at the end of the game
+                evals[p] = future.result()
+        return evals
+
+    def result(self, move_history: List[str]) -> dict:
+        """
+        Queue any positions not seen during the game, then wait for all of them.
+
+        Args:
+            move_history: Moves played, in UCI notation
+
+        Returns:
+            Dictionary with "white_acpl" and "black_acpl"
+        """
+        board = chess.Board()
+        evals: List[Optional[int]] = [None] * (len(move_history) + 1)
+        for ply in range(len(move_history) + 1):
+            if ply > 0:
+                board.push_uci(move_history[ply - 1])
+            outcome = board.outcome()
+            if outcome is not None:
+                # Terminal positions are scored directly; engines return no score
+                evals[ply] = terminal_score(outcome)
+            else:
+                self.add_position(board)
+
+        for ply, future in self._futures.items():
+            if ply < len(evals) and evals[ply] is None:
+                evals[ply] = future.result()
+
+        return acpl_from_evals(evals)
+
+
+# Analyzer of the current worker process (set by _init_analysis_worker)
+_worker_analyzer: Optional[PooledAnalyzer] = None
+
+
+def _init_analysis_worker(depth: int, movetime_ms: int, cache_path: Optional[str], engines: int,
+                          engine_path: str, base_options: Dict[str, object]):
+    global _worker_analyzer
+    pool = EnginePool(size=engines, path=engine_path, base_options=base_options)
+    # Quit the worker's engines when the worker process exits
+    multiprocessing.util.Finalize(None, pool.close, exitpriority=10)
+    cache = EvalCache(cache_path) if cache_path else None
+    _worker_analyzer = PooledAnalyzer(pool, depth=depth, movetime_ms=movetime_ms, cache=cache)
+
+
+def _analyze_in_worker(move_history: List[str]) -> dict:
+    return _worker_analyzer.analyze_game(move_history)
+
+
+class ProcessAnalyzer:
+    """
+    ACPL analysis in a pool of worker processes.
+
+    Each worker owns `engines_per_worker` Stockfish processes and its own
+    connection to the evaluation cache; only move lists go to the workers and
+    only the {"white_acpl", "black_acpl"} results come back. Same interface as
+    PooledAnalyzer, so it can stand in for it.
+    """
+
+    def __init__(self, workers: int, depth: int = 7, movetime_ms: int = 1000,
+                 cache_path: Optional[str] = None, engines_per_worker: int = 1,
+                 engine_path: str = "stockfish", base_options: Optional[Dict[str, object]] = None):
+        """
+        Start the worker processes.
+
+        Args:
+            workers: Number of worker processes (games analyzed at once)
+            depth: Stockfish depth per position
+            movetime_ms: Time per position in milliseconds
+            cache_path: Evaluation cache file shared by the workers (optional)
+            engines_per_worker: Stockfish processes per worker
+            engine_path: Path to the Stockfish binary
+            base_options: UCI options for the workers' engines
+        """
+        self.workers = workers
+        self.depth = depth
+        self.movetime_ms = movetime_ms
+        # spawn, not fork: the parent has engine, HTTP and scheduler threads running
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_analysis_worker,
+            initargs=(depth, movetime_ms, cache_path, engines_per_worker, engine_path, dict(base_options or {})),
+        )
+
+    def submit(self, move_history: List[str]) -> Future:
+        """Queue a game for analysis; the future resolves to its ACPL dictionary."""
+        return self.executor.submit(_analyze_in_worker, list(move_history))
+
+    def analyze_game(self, move_history: List[str]) -> dict:
+        """
+        Compute per-side average centipawn loss for a game in a worker process.
+
+        Args:
+            move_history: Moves played, in UCI notation
+
+        Returns:
+            Dictionary with "white_acpl" and "black_acpl"
+        """
+        return self.submit(move_history).result()
+
+    def close(self):
+        """Wait for queued analyses and stop the workers (their engines quit with them)."""
+        self.executor.shutdown(wait=True)
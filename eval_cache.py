@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache of Stockfish position evaluations.
+
+Evaluation suites replay the same openings against deterministic opponents, so
+the same positions are analyzed over and over, across games and across runs.
+The cache stores one centipawn score (White's point of view, mates mapped to
++/-MATE_SCORE) per position and analysis-limit combination:
+
+    key    = normalized EPD (FEN without the move clocks)
+    limits = e.g. "depth=7,movetime_ms=1000"
+
+Position suites also store Stockfish's top moves per position (multipv
+reference lines, side-to-move point of view) under the same keys.
+
+It is a SQLite database in WAL mode, so any number of threads and processes can
+read and write it at the same time. Each thread gets its own connection.
+
+    cache = EvalCache("eval_cache.sqlite3")
+    score = cache.get(board, limits)
+    if score is None:
+        score = ...search...
+        cache.put(board, limits, score)
+    print(cache.summary())
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import List, Optional, Tuple
+
+import chess
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "eval_cache.sqlite3")
+
+# Score used for forced mates when converting to centipawns (as in test_vs_stockfish.py)
+MATE_SCORE = 10000
+
+
+def position_key(board: chess.Board) -> str:
+    """Normalized EPD: placement, side to move, castling and legal en passant only."""
+    return board.epd()
+
+
+def limits_key(depth: Optional[int] = None, movetime_ms: Optional[int] = None) -> str:
+    """Canonical string for the analysis limits a score was computed with."""
+    parts = []
+    if depth is not None:
+        parts.append(f"depth={depth}")
+    if movetime_ms is not None:
+        parts.append(f"movetime_ms={movetime_ms}")
+    return ",".join(parts)
+
+
+class EvalCache:
+    """SQLite-backed position evaluation cache with hit-rate accounting."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        """
+        Open (and create if needed) the cache database.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS evals ("
+            " epd TEXT NOT NULL,"
+            " limits TEXT NOT NULL,"
+            " score INTEGER NOT NULL,"
+            " PRIMARY KEY (epd, limits)"
+            ") WITHOUT ROWID"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS lines ("
+            " epd TEXT NOT NULL,"
+            " limits TEXT NOT NULL,"
+            " moves TEXT NOT NULL,"
+            " PRIMARY KEY (epd, limits)"
+            ") WITHOUT ROWID"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection (sqlite3 connections must not be shared)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, board: chess.Board, limits: str) -> Optional[int]:
+        """
+        Look up a cached score.
+
+        Args:
+            board: Position to look up
+            limits: Analysis limits string (see limits_key)
+
+        Returns:
+            Centipawn score from White's point of view, or None on a miss
+        """
+        row = self._connection().execute(
+            "SELECT score FROM evals WHERE epd = ? AND limits = ?",
+            (position_key(board), limits),
+        ).fetchone()
+        with self._stats_lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return None if row is None else row[0]
+
+    def put(self, board: chess.Board, limits: str, score: int):
+        """
+        Store a score (White's point of view, centipawns).
+
+        Args:
+            board: Position that was analyzed
+            limits: Analysis limits string (see limits_key)
+            score: Centipawn score from White's point of view
+        """
+        self._connection().execute(
+            "INSERT OR REPLACE INTO evals (epd, limits, score) VALUES (?, ?, ?)",
+            (position_key(board), limits, int(score)),
+        )
+        with self._stats_lock:
+            self.writes += 1
+
+    def get_lines(self, board: chess.Board, limits: str) -> Optional[List[Tuple[str, int]]]:
+        """
+        Look up cached multipv reference lines.
+
+        Args:
+            board: Position to look up
+            limits: Analysis limits string, including the multipv count
+
+        Returns:
+            [(uci move, centipawns for the side to move), ...] best first, or None on a miss
+        """
+        row = self._connection().execute(
+            "SELECT moves FROM lines WHERE epd = ? AND limits = ?",
+            (position_key(board), limits),
+        ).fetchone()
+        with self._stats_lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return None if row is None else [(uci, score) for uci, score in json.loads(row[0])]
+
+    def put_lines(self, board: chess.Board, limits: str, lines: List[Tuple[str, int]]):
+        """
+        Store multipv reference lines.
+
+        Args:
+            board: Position that was analyzed
+            limits: Analysis limits string, including the multipv count
+            lines: [(uci move, centipawns for the side to move), ...] best first
+        """
+        self._connection().execute(
+            "INSERT OR REPLACE INTO lines (epd, limits, moves) VALUES (?, ?, ?)",
+            (position_key(board), limits, json.dumps([[uci, int(score)] for uci, score in lines])),
+        )
+        with self._stats_lock:
+            self.writes += 1
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def summary(self) -> str:
+        """One-line hit-rate report for the end of a run."""
+        return (f"Eval cache: {self.hits}/{self.lookups} hits ({self.hit_rate * 100:.1f}%), "
+                f"{self.writes} new positions stored in {self.path}")
+
+    def close(self):
+        """Close this thread's connection (other threads' close on exit)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -1,9 +1,10 @@
-import json
 import os
-from typing import List, Dict, Any
+from typing import Any, Optional
 
 import chess
-from flask import Flask, jsonify, send_from_directory
+from flask import Flask, jsonify, request, send_from_directory
+
+from game_log_store import GameLogStore
 
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -11,42 +12,28 @@ LOGS_DIR = os.path.join(BASE_DIR, "logs")
 
 app = Flask(__name__)
 
-
-def _list_game_logs() -> List[str]:
-    if not os.path.isdir(LOGS_DIR):
-        return []
-    files = [f for f in os.listdir(LOGS_DIR) if f.endswith(".json")]
-    files.sort(key=lambda x: os.path.getmtime(os.path.join(LOGS_DIR, x)), reverse=True)
-    return files
+_store: Optional[GameLogStore] = None
 
 
-def _load_game(path: str) -> Dict[str, Any]:
-    with open(path, "r") as f:
-        return json.load(f)
+def _get_store() -> GameLogStore:
+    global _store
+    if _store is None:
+        _store = GameLogStore(LOGS_DIR)
+    return _store
 
 
 @app.route("/api/games")
 def api_games() -> Any:
-    games = []
-    for fname in _list_game_logs():
-        full_path = os.path.join(LOGS_DIR, fname)
-        try:
-            data = _load_game(full_path)
-        except Exception:
-            continue
-
-        games.append(
-            {
-                "id": fname,
-                "timestamp": data.get("timestamp"),
-                "opponent": data.get("opponent"),
-                "player_color": data.get("player_color"),
-                "result": data.get("result"),
-                "moves_played": data.get("moves_played"),
-                "player_acpl": data.get("player_acpl"),
-                "opponent_acpl": data.get("opponent_acpl"),
-            }
-        )
+    # Listed from the summary index; per-file logs are parsed once, when first seen
+    store = _get_store()
+    store.index_files()
+    games = store.list_games(
+        run_id=request.args.get("run"),
+        opponent=request.args.get("opponent"),
+        player_color=request.args.get("color"),
+        result=request.args.get("result"),
+        limit=request.args.get("limit", type=int),
+    )
     return jsonify({"games": games})
 
 
@@ -55,12 +42,10 @@ def api_game_detail(game_id: str) -> Any:
     # Prevent directory traversal
     if "/" in game_id or ".." in game_id:
         return jsonify({"error": "invalid game id"}), 400
-    full_path = os.path.join(LOGS_DIR, game_id)
-    if not os.path.isfile(full_path):
+    data = _get_store().load_game(game_id)
+    if data is None:
         return jsonify({"error": "not found"}), 404
 
-    data = _load_game(full_path)
-
     # Reconstruct positions as FENs from move history for convenience
     move_history = data.get("move_history", [])
     move_comments = data.get("move_comments", [])
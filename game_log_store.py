@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Append-only store of evaluation game logs with a summary index.
+
+One pretty-printed JSON file per game adds up to tens of thousands of small
+files, and listing them means parsing every one. The store instead appends each
+game as one compact JSON line to a per-run file and records a summary row in a
+SQLite index next to it:
+
+    logs/<run-id>.games.jsonl   one game record per line (same fields as the
+                                per-file format)
+    logs/index.sqlite3          id, run, opponent, color, result, moves, ACPL,
+                                timestamp, plus the record's byte offset
+
+Listing and filtering only query the index; opening a game reads its one line
+by offset. Per-file logs (`game_<...>.json`, still written with
+`--log-format files` and produced by `export`) are indexed too, each file being
+parsed once, the first time it is seen.
+
+    store = GameLogStore("logs")
+    game_id = store.append(run_id, game_id, record)
+    games = store.list_games(opponent="Stockfish (depth 1, skill 0)", player_color="white")
+    record = store.load_game(game_id)
+
+Export a run to the per-file format:
+
+    python game_log_store.py export <run-id> [--out DIR]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+DEFAULT_LOGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+INDEX_NAME = "index.sqlite3"
+
+# Summary fields kept in the index for listing and filtering
+SUMMARY_FIELDS = ("timestamp", "opponent", "player_color", "result", "moves_played",
+                  "player_acpl", "opponent_acpl")
+
+
+class GameLogStore:
+    """Per-run JSONL game logs plus a SQLite summary index."""
+
+    def __init__(self, logs_dir: str = DEFAULT_LOGS_DIR):
+        """
+        Open (and create if needed) the store.
+
+        Args:
+            logs_dir: Directory holding the run logs and the index
+        """
+        self.logs_dir = logs_dir
+        self.index_path = os.path.join(logs_dir, INDEX_NAME)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+        os.makedirs(logs_dir, exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS games ("
+            " id TEXT PRIMARY KEY,"
+            " run_id TEXT,"
+            " path TEXT NOT NULL,"  # relative to logs_dir
+            " offset INTEGER,"  # NULL for a per-file log
+            " length INTEGER,"
+            " timestamp TEXT,"
+            " opponent TEXT,"
+            " player_color TEXT,"
+            " result TEXT,"
+            " moves_played INTEGER,"
+            " player_acpl REAL,"
+            " opponent_acpl REAL"
+            ")"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS games_by_run ON games (run_id)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection (sqlite3 connections must not be shared)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.index_path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _index(self, game_id: str, run_id: Optional[str], path: str, offset: Optional[int],
+               length: Optional[int], record: dict):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO games (id, run_id, path, offset, length, "
+            + ", ".join(SUMMARY_FIELDS) + ") VALUES (?, ?, ?, ?, ?, "
+            + ", ".join("?" * len(SUMMARY_FIELDS)) + ")",
+            (game_id, run_id, path, offset, length, *(record.get(name) for name in SUMMARY_FIELDS)),
+        )
+
+    def append(self, run_id: str, game_id: str, record: dict) -> str:
+        """
+        Append a game record to its run's log and index it.
+
+        Args:
+            run_id: Run the game belongs to (names the JSONL file)
+            game_id: Unique game identifier (e.g. the per-file log name without .json)
+            record: JSON-serializable game record
+
+        Returns:
+            The game id
+        """
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode()
+        path = f"{run_id}.games.jsonl"
+        with self._write_lock:
+            with open(os.path.join(self.logs_dir, path), "ab") as f:
+                offset = f.tell()
+                f.write(line)
+        self._index(game_id, run_id, path, offset, len(line), record)
+        return game_id
+
+    def index_files(self) -> int:
+        """
+        Index per-file logs in logs_dir that are not in the index yet.
+
+        Only new files are opened, so repeated calls are cheap.
+
+        Returns:
+            Number of files added to the index
+        """
+        names = [name for name in os.listdir(self.logs_dir)
+                 if name.startswith("game_") and name.endswith(".json")]
+        known = {row[0] for row in self._connection().execute("SELECT id FROM games WHERE offset IS NULL")}
+        added = 0
+        for name in names:
+            if name in known:
+                continue
+            try:
+                with open(os.path.join(self.logs_dir, name)) as f:
+                    record = json.load(f)
+            except (OSError, ValueError):
+                continue
+            self._index(name, None, name, None, None, record)
+            added += 1
+        return added
+
+    def list_games(self, run_id: Optional[str] = None, opponent: Optional[str] = None,
+                   player_color: Optional[str] = None, result: Optional[str] = None,
+                   limit: Optional[int] = None) -> List[Dict[str, object]]:
+        """
+        List game summaries from the index, newest first.
+
+        Args:
+            run_id: Only games of this run
+            opponent: Only games against this opponent
+            player_color: Only games where the player had this color
+            result: Only games whose result contains this text (e.g. "White wins")
+            limit: Maximum number of games
+
+        Returns:
+            One dictionary per game with "id", "run_id" and the summary fields
+        """
+        clauses, params = [], []
+        for column, value in (("run_id", run_id), ("opponent", opponent), ("player_color", player_color)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if result is not None:
+            clauses.append("result LIKE ?")
+            params.append(f"%{result}%")
+        query = "SELECT id, run_id, " + ", ".join(SUMMARY_FIELDS) + " FROM games"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY timestamp DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(int(limit))
+        return [dict(row) for row in self._connection().execute(query, params)]
+
+    def load_game(self, game_id: str) -> Optional[dict]:
+        """
+        Read one full game record.
+
+        Args:
+            game_id: Id from list_games
+
+        Returns:
+            The game record, or None if the id is unknown
+        """
+        row = self._connection().execute(
+            "SELECT path, offset, length FROM games WHERE id = ?", (game_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        with open(os.path.join(self.logs_dir, row["path"]), "rb") as f:
+            if row["offset"] is None:
+                return json.load(f)
+            f.seek(row["offset"])
+            return json.loads(f.read(row["length"]))
+
+    def export_files(self, run_id: str, out_dir: Optional[str] = None) -> List[str]:
+        """
+        Write a run's games in the per-file format (one indented JSON file per game).
+
+        Args:
+            run_id: Run to export
+            out_dir: Destination directory (default: logs_dir/export/<run_id>, outside
+                the directory whose per-file logs are indexed)
+
+        Returns:
+            Paths of the written files
+        """
+        out_dir = out_dir or os.path.join(self.logs_dir, "export", run_id)
+        os.makedirs(out_dir, exist_ok=True)
+        paths = []
+        for game in self.list_games(run_id=run_id):
+            filepath = os.path.join(out_dir, f"{game['id']}.json")
+            with open(filepath, "w") as f:
+                json.dump(self.load_game(game["id"]), f, indent=2)
+            paths.append(filepath)
+        return paths
+
+    def close(self):
+        """Close this thread's index connection (other threads' close on exit)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluation game log store")
+    parser.add_argument("--logs-dir", default=DEFAULT_LOGS_DIR, help="Directory holding the logs and index")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="Write a run's games as one JSON file per game")
+    export.add_argument("run_id", help="Run ID printed by local_evaluation.py")
+    export.add_argument("--out", default=None, help="Destination directory (default: logs/export/<run-id>)")
+    commands.add_parser("list", help="Print the indexed games")
+    args = parser.parse_args()
+
+    store = GameLogStore(args.logs_dir)
+    if args.command == "export":
+        paths = store.export_files(args.run_id, args.out)
+        print(f"Exported {len(paths)} games of run {args.run_id} to "
+              f"{args.out or os.path.join(args.logs_dir, 'export', args.run_id)}")
+    else:
+        store.index_files()
+        for game in store.list_games():
+            print(f"{game['id']}: {game['opponent']} ({game['player_color']}) {game['result']}, "
+                  f"{game['moves_played']} moves, ACPL {game['player_acpl'] or 0.0:.1f}")
+
+
+if __name__ == "__main__":
+    main()
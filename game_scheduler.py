@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Single scheduler for every (opponent, color, game) task of an evaluation run.
+
+Previously each opponent got its own 10-worker pool inside another 10-worker
+pool, so real concurrency was the product of the two and unrelated to what the
+endpoint or the machine could sustain. The scheduler instead runs all tasks of
+a run with independent limits:
+
+    max_games         games in flight at once (worker count)
+    max_llm_requests  chat-completion requests in flight at once (`llm_slots`)
+
+In-flight engine searches are bounded by the shared EnginePool.
+
+Tasks are started longest-expected-game first, so the slowest games do not end
+up as a tail after everything else has finished. The expected length of a task
+is the mean length of the finished games with the same player, opponent and
+color, starting from `max_moves` before any of them has finished.
+"""
+
+import asyncio
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class GameTask:
+    """One game slot to play against an opponent."""
+    opponent_name: str
+    opponent_agent: Any
+    player_color: str  # "white" or "black"
+    game_num: int
+    num_games: int  # games scheduled against this opponent (for reporting)
+    timestamp: str  # evaluation session timestamp (for log filenames)
+    player: Optional[str] = None  # endpoint label in a tournament (None: the run's only endpoint)
+
+
+class GameScheduler:
+    """Runs GameTasks on one worker pool, longest expected game first."""
+
+    def __init__(self, max_games: int = 10, max_llm_requests: Optional[int] = None,
+                 max_moves: int = 200):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_games: Maximum number of games in flight at once
+            max_llm_requests: Maximum chat-completion requests in flight at once
+                (default: same as max_games)
+            max_moves: Game length assumed before any game has finished
+        """
+        self.max_games = max_games
+        self.max_llm_requests = max_llm_requests or max_games
+        self.max_moves = max_moves
+        self.llm_slots = threading.BoundedSemaphore(self.max_llm_requests)
+        self.async_llm_slots: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self._pending: List[GameTask] = []
+        self._plies: Dict[Tuple[Optional[str], str, str], Tuple[int, int]] = {}
+
+    def expected_plies(self, task: GameTask) -> float:
+        """Mean length of finished games with the same player, opponent and color."""
+        total, count = self._plies.get((task.player, task.opponent_name, task.player_color), (0, 0))
+        # One pseudo-observation at max_moves keeps early estimates conservative
+        return (total + self.max_moves) / (count + 1)
+
+    def record(self, task: GameTask, moves_played: int):
+        """Update the length estimate with a finished game."""
+        with self._lock:
+            key = (task.player, task.opponent_name, task.player_color)
+            total, count = self._plies.get(key, (0, 0))
+            self._plies[key] = (total + moves_played, count + 1)
+
+    def _next_task(self) -> Optional[GameTask]:
+        """Pop the pending task with the longest expected game."""
+        with self._lock:
+            if not self._pending:
+                return None
+            best = max(range(len(self._pending)),
+                       key=lambda i: (self.expected_plies(self._pending[i]), -i))
+            return self._pending.pop(best)
+
+    def cancel(self, predicate: Callable[[GameTask], bool]) -> int:
+        """
+        Drop pending tasks matching `predicate`; games already started finish.
+
+        Returns:
+            Number of tasks cancelled
+        """
+        with self._lock:
+            keep = [task for task in self._pending if not predicate(task)]
+            cancelled = len(self._pending) - len(keep)
+            self._pending = keep
+        return cancelled
+
+    def _finish(self, task: GameTask, stats, on_result) -> None:
+        moves_played = getattr(stats, "moves_played", None)
+        if moves_played is not None:
+            self.record(task, moves_played)
+        if on_result is not None:
+            try:
+                on_result(task, stats)
+            except Exception as e:
+                print(f"Warning: result callback failed for game {task.game_num}: {e}")
+
+    def run(self, tasks: List[GameTask], play: Callable[[GameTask], Any],
+            on_result: Optional[Callable[[GameTask, Any], None]] = None) -> List[Tuple[GameTask, Any]]:
+        """
+        Play all tasks on worker threads.
+
+        Args:
+            tasks: Game tasks to play
+            play: Plays one task and returns its GameStats
+            on_result: Called on the worker thread with each completed task and
+                its stats (e.g. to journal it)
+
+        Returns:
+            (task, stats) pairs for the tasks that completed
+        """
+        with self._lock:
+            self._pending.extend(tasks)
+        results: List[Tuple[GameTask, Any]] = []
+        results_lock = threading.Lock()
+
+        def worker():
+            while True:
+                task = self._next_task()
+                if task is None:
+                    return
+                try:
+                    stats = play(task)
+                except Exception as e:
+                    print(f"Error in game execution: {e}")
+                    traceback.print_exc()
+                    continue
+                self._finish(task, stats, on_result)
+                with results_lock:
+                    results.append((task, stats))
+
+        workers = max(1, min(self.max_games, len(tasks)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="game") as executor:
+            for _ in range(workers):
+                executor.submit(worker)
+        return results
+
+    async def arun(self, tasks: List[GameTask], play: Callable[[GameTask], Awaitable[Any]],
+                   on_result: Optional[Callable[[GameTask, Any], None]] = None) -> List[Tuple[GameTask, Any]]:
+        """
+        Play all tasks as coroutines on the running event loop.
+
+        Args:
+            tasks: Game tasks to play
+            play: Coroutine function playing one task and returning its GameStats
+            on_result: Called on the event loop with each completed task and its
+                stats (e.g. to journal it)
+
+        Returns:
+            (task, stats) pairs for the tasks that completed
+        """
+        if self.async_llm_slots is None:
+            self.async_llm_slots = asyncio.Semaphore(self.max_llm_requests)
+        with self._lock:
+            self._pending.extend(tasks)
+        results: List[Tuple[GameTask, Any]] = []
+
+        async def worker():
+            while True:
+                task = self._next_task()
+                if task is None:
+                    return
+                try:
+                    stats = await play(task)
+                except Exception as e:
+                    print(f"Error in game execution: {e}")
+                    traceback.print_exc()
+                    continue
+                self._finish(task, stats, on_result)
+                results.append((task, stats))
+
+        workers = max(1, min(self.max_games, len(tasks)))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return results
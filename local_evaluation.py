@@ -13,14 +13,20 @@ import sys
 import time
 import json
 import argparse
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+import asyncio
+import threading
+from functools import partial
+from dataclasses import asdict, dataclass, field, replace
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+from collections import Counter
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from openai import OpenAI
-from jinja2 import Template
+from contextlib import nullcontext
+from concurrent.futures import Executor, ThreadPoolExecutor
+from openai import AsyncOpenAI, OpenAI
+from jinja2 import Environment, Template, meta
 
 import chess
+import chess.engine
 
 # Add chess-env to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "chess-env"))
@@ -30,6 +36,75 @@ from env import ChessEnvironment
 from run_game import _StockfishAnalyzer
 from chess_renderer import ChessRenderer
 
+from engine_pool import AnalysisPipeline, EnginePool, GameAnalysis, PooledAnalyzer, ProcessAnalyzer
+from eval_cache import DEFAULT_CACHE_PATH, EvalCache
+from game_scheduler import GameScheduler, GameTask
+from move_batcher import MoveBatcher
+from endpoint_client import create_async_client, create_client
+from run_journal import RunJournal
+from position_suite import PositionResult, SuiteReferences, load_suite, summarize_suite
+from sprt import SPRT
+from move_repair import REPAIRS, repair_move
+from game_log_store import GameLogStore
+from adjudication import Adjudication, Adjudicator, is_adjudicated, pool_evals
+from tournament import Crosstable, bayeselo, pairwise_elo, parse_endpoints, print_tournament
+
+
+# Compiled templates keyed by absolute path: (Template, referenced variable names)
+_TEMPLATE_CACHE: Dict[str, Tuple[Template, FrozenSet[str]]] = {}
+_TEMPLATE_CACHE_LOCK = threading.Lock()
+_TEMPLATE_ENV = Environment()
+
+# Seconds a side may take for one move before it loses (as in ChessEnvironment)
+MOVE_TIME_LIMIT = 30.0
+
+
+def load_template(template_name: str) -> Tuple[Template, FrozenSet[str]]:
+    """
+    Load and compile a Jinja2 template once, caching it for later calls.
+    
+    The template source is parsed a single time and its AST is inspected to
+    find the variables it references, so callers can compute only those.
+    
+    Args:
+        template_name: Name of the template file (relative to script directory)
+    
+    Returns:
+        Tuple of (compiled template, set of referenced variable names)
+    
+    Raises:
+        SystemExit: If template file not found or compilation fails
+    """
+    template_dir = os.path.dirname(os.path.abspath(__file__))
+    template_path = os.path.join(template_dir, template_name)
+    
+    cached = _TEMPLATE_CACHE.get(template_path)
+    if cached is not None:
+        return cached
+    
+    with _TEMPLATE_CACHE_LOCK:
+        cached = _TEMPLATE_CACHE.get(template_path)
+        if cached is not None:
+            return cached
+        
+        if not os.path.exists(template_path):
+            print(f"Error: Template file not found: {template_path}")
+            sys.exit(1)
+        
+        try:
+            with open(template_path, 'r') as f:
+                template_content = f.read()
+            
+            ast = _TEMPLATE_ENV.parse(template_content)
+            variables = frozenset(meta.find_undeclared_variables(ast))
+            template = _TEMPLATE_ENV.from_string(template_content)
+        except Exception as e:
+            print(f"Error compiling template '{template_name}': {e}")
+            sys.exit(1)
+        
+        _TEMPLATE_CACHE[template_path] = (template, variables)
+        return template, variables
+
 
 def render_template(template_name: str, **kwargs) -> str:
     """
@@ -45,24 +120,31 @@ def render_template(template_name: str, **kwargs) -> str:
     Raises:
         SystemExit: If template file not found or rendering fails
     """
-    template_dir = os.path.dirname(os.path.abspath(__file__))
-    template_path = os.path.join(template_dir, template_name)
-    
-    if not os.path.exists(template_path):
-        print(f"Error: Template file not found: {template_path}")
-        sys.exit(1)
+    template, _ = load_template(template_name)
     
     try:
-        with open(template_path, 'r') as f:
-            template_content = f.read()
-        
-        template = Template(template_content)
         return template.render(**kwargs)
     except Exception as e:
         print(f"Error rendering template '{template_name}': {e}")
         sys.exit(1)
 
 
+@dataclass
+class MoveMetrics:
+    """Timing and token accounting for one player move (all attempts)."""
+    prompt_build_s: float = 0.0  # rendering the prompt template
+    request_s: float = 0.0  # chat-completion round trips (excluding slot waits)
+    parse_s: float = 0.0  # extracting and validating the move
+    total_s: float = 0.0  # wall time of the whole choose_move call
+    prompt_tokens: int = 0  # server-reported, from response.usage
+    completion_tokens: int = 0
+    retries: int = 0  # attempts after the first
+    retry_overhead_s: float = 0.0  # wall time spent on attempts that were retried
+    samples: int = 0  # completions received (more than one per attempt with num_samples)
+    legal_samples: int = 0  # of those, the ones holding a legal move
+    repair: Optional[str] = None  # move_repair repair that produced the played move, if any
+
+
 @dataclass
 class GameStats:
     """Statistics for a single game."""
@@ -73,6 +155,7 @@ class GameStats:
     white_acpl: float
     black_acpl: float
     player_color: str  # "white" or "black"
+    move_metrics: List[MoveMetrics] = field(default_factory=list)  # player moves only
 
 
 @dataclass
@@ -86,6 +169,100 @@ class EvaluationResults:
     avg_acpl: float
     avg_time_per_move: float
     games: List[GameStats]
+    # Player move latency and throughput (see MoveMetrics)
+    latency_p50: float = 0.0
+    latency_p95: float = 0.0
+    latency_p99: float = 0.0
+    latency_max: float = 0.0
+    avg_prompt_build_ms: float = 0.0
+    avg_parse_ms: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    tokens_per_sec: float = 0.0  # completion tokens per second of request time
+    retries: int = 0
+    retry_overhead_s: float = 0.0
+    repairs: Dict[str, int] = field(default_factory=dict)  # moves repaired locally, by repair
+    sprt: Optional[str] = None  # Stopping point when --sprt is used
+    player_name: str = "Player"  # endpoint label in a tournament
+    # Games ended by adjudication, from the player's point of view (included in wins/draws/losses)
+    adjudicated_wins: int = 0
+    adjudicated_draws: int = 0
+    adjudicated_losses: int = 0
+
+
+# Every variable a prompt template may reference (see player_agents/README.md)
+PROMPT_VARIABLES = frozenset({
+    "board_utf", "board_ascii", "FEN", "side_to_move", "last_move",
+    "legal_moves_uci", "legal_moves_san", "legal_moves_uci_list", "legal_moves_san_list",
+    "move_history_uci", "move_history_san", "move_history_uci_list", "move_history_san_list",
+    "first_legal_move",
+})
+_LEGAL_UCI_VARIABLES = frozenset({"legal_moves_uci", "legal_moves_uci_list", "first_legal_move"})
+_LEGAL_SAN_VARIABLES = frozenset({"legal_moves_san", "legal_moves_san_list"})
+_MOVE_HISTORY_VARIABLES = frozenset({
+    "move_history_uci", "move_history_san", "move_history_uci_list", "move_history_san_list",
+})
+_HISTORY_VARIABLES = _MOVE_HISTORY_VARIABLES | {"last_move"}
+
+
+class GameContext:
+    """
+    Incrementally maintained per-game move history for prompt building.
+
+    Keeps a replica board plus UCI/SAN history lists that grow by one entry per
+    ply, so building a prompt costs the same at move 5 and at move 190 instead
+    of replaying the whole game on every call. The context dictionary for the
+    current ply is cached so retries of the same move reuse it.
+    """
+
+    def __init__(self):
+        self.board = chess.Board()
+        self.moves: List[chess.Move] = []
+        self.history_uci: List[str] = []
+        self.history_san: List[str] = []
+        self.cached_key: Optional[tuple] = None
+        self.cached_context: Optional[dict] = None
+
+    def reset(self, board: chess.Board):
+        """Start tracking a new game from the root position of `board`."""
+        self.board = board.root()
+        self.moves = []
+        self.history_uci = []
+        self.history_san = []
+        self.cached_key = None
+        self.cached_context = None
+
+    def sync(self, board: chess.Board):
+        """
+        Bring the history up to date with `board.move_stack`.
+
+        Only the plies pushed since the last call are converted to SAN. If the
+        board no longer extends the tracked game (a new game was started with
+        the same agent), the context is rebuilt from the board's root. The
+        check looks at the root position and the last tracked ply only, so it
+        does not grow with the game either.
+        """
+        move_stack = board.move_stack
+        tracked = len(self.moves)
+        if (tracked > len(move_stack) or (tracked and move_stack[tracked - 1] != self.moves[-1])
+                or board.root() != self.board.root()):
+            self.reset(board)
+            tracked = 0
+
+        for move in move_stack[tracked:]:
+            try:
+                san = self.board.san(move)
+            except Exception:
+                san = move.uci()
+            self.board.push(move)
+            self.moves.append(move)
+            self.history_uci.append(move.uci())
+            self.history_san.append(san)
+
+    @property
+    def last_move_san(self) -> Optional[str]:
+        """SAN of the most recent ply, or None at the start of the game."""
+        return self.history_san[-1] if self.history_san else None
 
 
 class OpenAIEndpointAgent(ChessAgent):
@@ -114,7 +291,10 @@ class OpenAIEndpointAgent(ChessAgent):
     }
     
     def __init__(self, base_url: str, api_key: str = "dummy", max_retries: int = 2, model: str = "aicrowd-chess-model", 
-                 template_file: Optional[str] = None, debug: bool = False):
+                 template_file: Optional[str] = None, debug: bool = False, request_slots=None,
+                 batcher: Optional[MoveBatcher] = None, client: Optional[OpenAI] = None,
+                 async_client: Optional[AsyncOpenAI] = None, num_samples: int = 1,
+                 move_timeout: Optional[float] = None):
         """
         Initialize the OpenAI endpoint agent.
         
@@ -125,13 +305,41 @@ class OpenAIEndpointAgent(ChessAgent):
             model: Model name to use for API calls (default: "aicrowd-chess-model")
             template_file: Path to Jinja2 template file for prompt formatting (optional)
             debug: If True, print prompts and responses for debugging
+            request_slots: Semaphore held around each chat-completion request, to
+                cap requests in flight across games (threading.Semaphore for
+                choose_move, asyncio.Semaphore for achoose_move; optional)
+            batcher: Send requests through this run-wide MoveBatcher instead of
+                one chat completion per move (optional)
+            client: Run-wide OpenAI client whose connection pool is shared by all
+                games (default: a client of this agent's own)
+            async_client: Run-wide AsyncOpenAI client for achoose_move (default:
+                one of this agent's own, created on first use)
+            num_samples: Completions requested per attempt (the `n` parameter).
+                With more than one, the most frequent legal move is played and
+                the other legal samples stand in before a new request is made.
+            move_timeout: Seconds one choose_move call may take in all: each
+                request gets the time left as its HTTP timeout and no retry
+                starts once it has passed (optional)
         """
-        self.client = OpenAI(base_url=base_url, api_key=api_key)
+        self.base_url = base_url
+        self.api_key = api_key
+        self._owns_client = client is None
+        self.client = client or OpenAI(base_url=base_url, api_key=api_key)
+        # Created on first use by achoose_move unless shared (must live on the running event loop)
+        self._owns_async_client = async_client is None
+        self.async_client: Optional[AsyncOpenAI] = async_client
         self.max_retries = max_retries
         self.model = model
         self.template_file = template_file
         self.debug = debug
+        self.request_slots = request_slots
+        self.batcher = batcher
+        self.num_samples = num_samples
+        self.move_timeout = move_timeout
         self.move_times = []  # Track time for each move
+        self.move_metrics: List[MoveMetrics] = []  # One entry per choose_move call
+        # Per-game UCI/SAN history, extended by one ply per move
+        self.game_context = GameContext()
         # Initialize chess renderer for board ASCII representation
         self.renderer = ChessRenderer(show_coordinates=True, show_move_numbers=False, 
                                       empty_square_char="·", use_rich=False)
@@ -202,142 +410,156 @@ class OpenAIEndpointAgent(ChessAgent):
         legal_moves: List[chess.Move],
         move_history: List[str],
         side_to_move: str,
+        variables: Optional[FrozenSet[str]] = None,
     ) -> dict:
         """
         Build the context dictionary for Jinja2 template rendering.
         
+        Only the variables the template references are computed; SAN for every
+        legal move and the board renderings are comparatively expensive and most
+        templates only need the FEN and the UCI move list.
+        
         Args:
             board: Current chess board state
             legal_moves: List of legal moves available
             move_history: List of moves played so far (in UCI notation)
             side_to_move: Which side is to move ('White' or 'Black')
+            variables: Template variable names to compute (default: all of them)
             
         Returns:
-            Dictionary with all template variables (both string and list forms)
+            Dictionary with the requested template variables (both string and list forms)
         """
+        needed = PROMPT_VARIABLES if variables is None else variables
+        ctx = self.game_context
+        # The position, its ply and the move that led to it: a retry of the same
+        # move matches, another game's position does not (constant-size key)
+        cache_key = (board._transposition_key(), board.halfmove_clock, len(board.move_stack),
+                     board.move_stack[-1] if board.move_stack else None, needed)
+        if ctx.cached_key == cache_key and ctx.cached_context is not None:
+            # Retry of the same move: reuse the context built on the first attempt
+            return ctx.cached_context
+        
+        context = {}
+        
         # Get FEN representation
-        fen = board.fen()
+        if "FEN" in needed:
+            context["FEN"] = board.fen()
         
         # Get UTF board representation with Unicode chess pieces
-        board_utf = self._render_board_unicode(board)
+        if "board_utf" in needed:
+            context["board_utf"] = self._render_board_unicode(board)
         
         # Get ASCII board representation
-        board_ascii = board.unicode()
+        if "board_ascii" in needed:
+            context["board_ascii"] = board.unicode()
+        
+        if "side_to_move" in needed:
+            context["side_to_move"] = side_to_move
+        
+        # Bring the per-game history up to date (one SAN conversion per new ply)
+        if needed & _HISTORY_VARIABLES:
+            ctx.sync(board)
         
         # Get last move description
-        if board.move_stack:
-            last_move = board.move_stack[-1]
-            # We need to get the SAN before the move was made
-            # Create a temporary board to get the SAN
-            temp_board = chess.Board()
-            for move in board.move_stack[:-1]:
-                temp_board.push(move)
-            last_move_san = temp_board.san(last_move)
-            last_side = "Black" if board.turn else "White"
-            last_move_desc = f"{last_side} played {last_move_san}"
-        else:
-            last_move_desc = "(start of game)"
+        if "last_move" in needed:
+            if ctx.last_move_san is not None:
+                last_side = "Black" if board.turn else "White"
+                context["last_move"] = f"{last_side} played {ctx.last_move_san}"
+            else:
+                context["last_move"] = "(start of game)"
         
         # Format legal moves as both UCI and SAN lists
-        legal_moves_uci_list = [move.uci() for move in legal_moves]
-        legal_moves_san_list = [board.san(move) for move in legal_moves]
-        legal_moves_uci_str = " ".join(legal_moves_uci_list)
-        legal_moves_san_str = " ".join(legal_moves_san_list)
+        if needed & _LEGAL_UCI_VARIABLES:
+            legal_moves_uci_list = [move.uci() for move in legal_moves]
+            context["legal_moves_uci_list"] = legal_moves_uci_list
+            context["legal_moves_uci"] = " ".join(legal_moves_uci_list)
+            # Get first legal move as an example
+            context["first_legal_move"] = legal_moves_uci_list[0] if legal_moves_uci_list else ""
+        if needed & _LEGAL_SAN_VARIABLES:
+            # board.san() does a push/pop check test per move, so only when asked for
+            legal_moves_san_list = [board.san(move) for move in legal_moves]
+            context["legal_moves_san_list"] = legal_moves_san_list
+            context["legal_moves_san"] = " ".join(legal_moves_san_list)
         
         # Format move history as both UCI and SAN
-        if move_history:
-            # Move history is already in UCI format
-            move_history_uci_list = list(move_history)
-            move_history_uci_str = " ".join(move_history_uci_list)
-            
-            # Convert UCI moves to SAN if possible
-            try:
-                history_board = chess.Board()
-                move_history_san_list = []
-                for uci_move in move_history:
-                    try:
-                        move = chess.Move.from_uci(uci_move)
-                        san = history_board.san(move)
-                        move_history_san_list.append(san)
-                        history_board.push(move)
-                    except Exception:
-                        move_history_san_list.append(uci_move)
-                
+        if needed & _MOVE_HISTORY_VARIABLES:
+            if ctx.history_uci:
+                move_history_uci_list = list(ctx.history_uci)
+                move_history_san_list = list(ctx.history_san)
+                move_history_uci_str = " ".join(move_history_uci_list)
                 move_history_san_str = " ".join(move_history_san_list)
-            except Exception:
+            elif move_history:
+                # Board carries no move stack (e.g. set up from a FEN); keep UCI as given
+                move_history_uci_list = list(move_history)
                 move_history_san_list = list(move_history)
+                move_history_uci_str = " ".join(move_history)
                 move_history_san_str = " ".join(move_history)
-        else:
-            move_history_uci_list = []
-            move_history_san_list = []
-            move_history_uci_str = "(no moves yet)"
-            move_history_san_str = "(no moves yet)"
-        
-        # Get first legal move as an example
-        first_legal_move = legal_moves_uci_list[0] if legal_moves_uci_list else ""
-        
-        # Build and return the context dictionary
-        return {
-            "board_utf": board_utf,
-            "board_ascii": board_ascii,
-            "FEN": fen,
-            "side_to_move": side_to_move,
-            "last_move": last_move_desc,
-            "legal_moves_uci": legal_moves_uci_str,
-            "legal_moves_san": legal_moves_san_str,
-            "move_history_uci": move_history_uci_str,
-            "move_history_san": move_history_san_str,
-            "legal_moves_uci_list": legal_moves_uci_list,
-            "legal_moves_san_list": legal_moves_san_list,
-            "move_history_uci_list": move_history_uci_list,
-            "move_history_san_list": move_history_san_list,
-            "first_legal_move": first_legal_move,
-        }
+            else:
+                move_history_uci_list = []
+                move_history_san_list = []
+                move_history_uci_str = "(no moves yet)"
+                move_history_san_str = "(no moves yet)"
+            context["move_history_uci"] = move_history_uci_str
+            context["move_history_san"] = move_history_san_str
+            context["move_history_uci_list"] = move_history_uci_list
+            context["move_history_san_list"] = move_history_san_list
+        
+        # Cache the context for retries of this ply
+        ctx.cached_key = cache_key
+        ctx.cached_context = context
+        return context
     
     def _format_prompt(self, board: chess.Board, legal_moves: List[chess.Move], 
                       move_history: List[str], side_to_move: str) -> str:
         """Format the prompt for the API call."""
-        # Build the context using the shared method (same as openai_agent.py)
-        context = self._build_prompt_context(board, legal_moves, move_history, side_to_move)
-        
         # If template file is specified, use it
         if self.template_file:
-            prompt = render_template(
-                self.template_file,
-                **context
-            )
+            # Compiled once per process; tells us which variables to compute
+            template, variables = load_template(self.template_file)
         else:
             raise FileNotFoundError(f"Template file not found: {self.template_file}")
         
+        # Build the context using the shared method (same as openai_agent.py)
+        context = self._build_prompt_context(board, legal_moves, move_history, side_to_move,
+                                             variables=variables)
+        
+        try:
+            prompt = template.render(**context)
+        except Exception as e:
+            print(f"Error rendering template '{self.template_file}': {e}")
+            sys.exit(1)
+        
         return prompt
     
-    def _parse_move(self, response: str, legal_moves: List[chess.Move]) -> Optional[chess.Move]:
-        """Parse the move from the API response."""
+    def _parse_move(self, response: str, legal_moves: List[chess.Move],
+                    board: Optional[chess.Board] = None) -> Tuple[Optional[chess.Move], Optional[str]]:
+        """
+        Parse the move from the API response, repairing near misses locally.
+        
+        SAN, stray case/whitespace, a missing promotion piece and similar slips
+        are fixed here (see move_repair) instead of costing another request.
+        
+        Returns:
+            (move, repair): the legal move or None, and the name of the repair
+            that produced it (None when the reply was an exact UCI move)
+        """
         # Extract move from <uci_move> tags
         match = re.search(r'<uci_move>(.*?)</uci_move>', response, re.IGNORECASE | re.DOTALL)
-        if not match:
-            print(f"Warning: Could not find <uci_move> tags in response: {response[:100]}")
-            return None
-        
-        move_str = match.group(1).strip()
+        move_str = match.group(1).strip() if match else None
         
         # Check for resignation
-        if move_str.lower() == "resign":
-            return None
+        if move_str is not None and move_str.lower() == "resign":
+            return None, None
         
-        try:
-            move = chess.Move.from_uci(move_str)
-            if move in legal_moves:
-                return move
-            else:
+        move, repair = repair_move(move_str, response, board, legal_moves)
+        if move is None:
+            if match:
                 print(f"Warning: Parsed move {move_str} is not in legal moves")
-                return None
-        except FileNotFoundError:
-            print(f"Warning: Template file not found: {self.template_file}")
-            import sys; sys.exit(1)
-        except Exception as e:
-            print(f"Warning: Failed to parse move '{move_str}': {e}")
-            return None
+            else:
+                print(f"Warning: Could not find <uci_move> tags in response: {response[:100]}")
+        elif repair is not None:
+            print(f"Note: repaired move {move_str if match else '(no <uci_move> tag)'!r} -> {move.uci()} ({repair})")
+        return move, repair
     
     def choose_move(
         self,
@@ -355,75 +577,253 @@ class OpenAIEndpointAgent(ChessAgent):
         if not legal_moves:
             return None, "No legal moves available"
         
-        for attempt in range(self.max_retries + 1):
-            try:
-                # Format prompt
-                prompt = self._format_prompt(board, legal_moves, move_history, side_to_move)
-                
-                # Debug: Print input prompt
-                if self.debug:
-                    print(f"\n{'='*70}")
-                    print(f"DEBUG - INPUT PROMPT (Attempt {attempt + 1}):")
-                    print(f"{'='*70}")
-                    print(prompt)
-                    print(f"{'='*70}\n")
-                
-                # Call API
-                start_time = time.time()
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=500,
-
-                )
-                elapsed_time = time.time() - start_time
-                self.move_times.append(elapsed_time)
-                
-                # Extract response
-                if not response.choices:
-                    print(f"Warning: Empty response from API (attempt {attempt + 1}/{self.max_retries + 1})")
-                    continue
-                
-                content = response.choices[0].message.content
-                
-                # Debug: Print output response
-                if self.debug:
-                    print(f"\n{'='*70}")
-                    print(f"DEBUG - OUTPUT RESPONSE (Attempt {attempt + 1}, Time: {elapsed_time:.2f}s):")
-                    print(f"{'='*70}")
-                    print(content)
-                    print(f"{'='*70}\n")
-                
-                # Extract optional <think> reasoning for logging/UI
-                comment = None
-                think_match = re.search(r"<think>(.*?)</think>", content, re.IGNORECASE | re.DOTALL)
-                if think_match:
-                    comment = think_match.group(1).strip()
-
-                # Parse move
-                move = self._parse_move(content, legal_moves)
-
-                if move is not None:
-                    # Return move plus optional human-readable comment
-                    return move, (comment or f"API move (attempt {attempt + 1})")
-                elif attempt < self.max_retries:
-                    print(f"Warning: Invalid move on attempt {attempt + 1}, retrying...")
-                    continue
-                else:
-                    print(f"Warning: Failed after {self.max_retries + 1} attempts, resigning")
-                    return None, f"Resigned after {self.max_retries + 1} failed attempts"
-                
-            except Exception as e:
-                if attempt < self.max_retries:
-                    print(f"Warning: API call failed on attempt {attempt + 1}: {e}, retrying...")
-                    continue
-                else:
-                    print(f"Error: API call failed after {self.max_retries + 1} attempts: {e}")
-                    return None, f"Resigned due to API error: {e}"
+        metrics = MoveMetrics()
+        self.move_metrics.append(metrics)
+        move_start = time.perf_counter()
+        deadline = move_start + self.move_timeout if self.move_timeout else None
+        try:
+            for attempt in range(self.max_retries + 1):
+                attempt_start = time.perf_counter()
+                if deadline is not None and attempt_start >= deadline:
+                    return None, f"Exceeded time limit of {self.move_timeout:.0f}s"
+                metrics.retries = attempt
+                try:
+                    # Format prompt
+                    prompt = self._format_prompt(board, legal_moves, move_history, side_to_move)
+                    metrics.prompt_build_s += time.perf_counter() - attempt_start
+                    self._debug_prompt(prompt, attempt)
+                    
+                    # Call API
+                    with self.request_slots or nullcontext():
+                        # Timed inside the slot so queueing is not counted as move time
+                        start_time = time.time()
+                        messages = [{"role": "user", "content": prompt}]
+                        # The request gives up when the move's time is up, so no call outlives the move
+                        timeout = max(0.0, deadline - time.perf_counter()) if deadline is not None else None
+                        if self.batcher is not None:
+                            response = self.batcher.complete(messages, timeout=timeout, **self._request_params())
+                        else:
+                            response = self.client.chat.completions.create(
+                                model=self.model,
+                                messages=messages,
+                                **({"timeout": timeout} if timeout is not None else {}),
+                                **self._request_params(),
+                            )
+                    elapsed_time = time.time() - start_time
+                    self.move_times.append(elapsed_time)
+                    
+                    outcome = self._handle_response(response, legal_moves, attempt, elapsed_time, metrics,
+                                                    board=board)
+                    if outcome is not None:
+                        return outcome
+                    
+                except Exception as e:
+                    if attempt < self.max_retries:
+                        print(f"Warning: API call failed on attempt {attempt + 1}: {e}, retrying...")
+                    else:
+                        print(f"Error: API call failed after {self.max_retries + 1} attempts: {e}")
+                        return None, f"Resigned due to API error: {e}"
+                metrics.retry_overhead_s += time.perf_counter() - attempt_start
+            
+            return None, "Failed to get valid move"
+        finally:
+            metrics.total_s = time.perf_counter() - move_start
+    
+    async def achoose_move(
+        self,
+        board: chess.Board,
+        legal_moves: List[chess.Move],
+        move_history: List[str],
+        side_to_move: str,
+    ) -> Tuple[Optional[chess.Move], Optional[str]]:
+        """
+        Asyncio counterpart of choose_move using the AsyncOpenAI client.
+        
+        Same retry and resignation semantics; the event loop is free to drive
+        other games while this request is in flight.
+        """
+        if not legal_moves:
+            return None, "No legal moves available"
+        
+        if self.async_client is None and self.batcher is None:
+            self.async_client = AsyncOpenAI(base_url=self.base_url, api_key=self.api_key)
+        
+        metrics = MoveMetrics()
+        self.move_metrics.append(metrics)
+        move_start = time.perf_counter()
+        try:
+            for attempt in range(self.max_retries + 1):
+                attempt_start = time.perf_counter()
+                metrics.retries = attempt
+                try:
+                    prompt = self._format_prompt(board, legal_moves, move_history, side_to_move)
+                    metrics.prompt_build_s += time.perf_counter() - attempt_start
+                    self._debug_prompt(prompt, attempt)
+                    
+                    async with self.request_slots or nullcontext():
+                        start_time = time.time()
+                        messages = [{"role": "user", "content": prompt}]
+                        if self.batcher is not None:
+                            response = await self.batcher.acomplete(messages, **self._request_params())
+                        else:
+                            response = await self.async_client.chat.completions.create(
+                                model=self.model,
+                                messages=messages,
+                                **self._request_params(),
+                            )
+                    elapsed_time = time.time() - start_time
+                    self.move_times.append(elapsed_time)
+                    
+                    outcome = self._handle_response(response, legal_moves, attempt, elapsed_time, metrics,
+                                                    board=board)
+                    if outcome is not None:
+                        return outcome
+                    
+                except Exception as e:
+                    if attempt < self.max_retries:
+                        print(f"Warning: API call failed on attempt {attempt + 1}: {e}, retrying...")
+                    else:
+                        print(f"Error: API call failed after {self.max_retries + 1} attempts: {e}")
+                        return None, f"Resigned due to API error: {e}"
+                metrics.retry_overhead_s += time.perf_counter() - attempt_start
+            
+            return None, "Failed to get valid move"
+        finally:
+            # Also runs when a move timeout cancels the coroutine
+            metrics.total_s = time.perf_counter() - move_start
+    
+    def _request_params(self) -> dict:
+        """Chat-completions parameters besides model and messages."""
+        params = {"max_tokens": 500}
+        if self.num_samples > 1:
+            # One prefill shared by all samples (vLLM `n`, num_return_sequences on our server)
+            params["n"] = self.num_samples
+        return params
+    
+    def _debug_prompt(self, prompt: str, attempt: int):
+        """Print the input prompt in debug mode."""
+        if self.debug:
+            print(f"\n{'='*70}")
+            print(f"DEBUG - INPUT PROMPT (Attempt {attempt + 1}):")
+            print(f"{'='*70}")
+            print(prompt)
+            print(f"{'='*70}\n")
+    
+    def _handle_response(
+        self,
+        response,
+        legal_moves: List[chess.Move],
+        attempt: int,
+        elapsed_time: float,
+        metrics: Optional[MoveMetrics] = None,
+        board: Optional[chess.Board] = None,
+    ) -> Optional[Tuple[Optional[chess.Move], Optional[str]]]:
+        """
+        Turn a chat completion into a (move, comment) decision.
+        
+        Args:
+            response: Chat completion returned by the endpoint
+            legal_moves: Legal moves in the position
+            attempt: Zero-based attempt number
+            elapsed_time: Request latency in seconds
+            metrics: Per-move metrics to add request time, tokens and parse time to
+            board: Position the move is for (lets SAN replies be repaired)
+        
+        Returns:
+            The final (move, comment) pair, or None if the caller should retry
+        """
+        if metrics is None:
+            return self._parse_response(response, legal_moves, attempt, elapsed_time, board=board)
+        metrics.request_s += elapsed_time
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            metrics.prompt_tokens += usage.prompt_tokens or 0
+            metrics.completion_tokens += usage.completion_tokens or 0
+        parse_start = time.perf_counter()
+        try:
+            return self._parse_response(response, legal_moves, attempt, elapsed_time, metrics, board)
+        finally:
+            metrics.parse_s += time.perf_counter() - parse_start
+    
+    def _parse_response(
+        self,
+        response,
+        legal_moves: List[chess.Move],
+        attempt: int,
+        elapsed_time: float,
+        metrics: Optional[MoveMetrics] = None,
+        board: Optional[chess.Board] = None,
+    ) -> Optional[Tuple[Optional[chess.Move], Optional[str]]]:
+        """
+        Extract the move (and optional <think> comment) from a chat completion.
+        
+        With several choices (num_samples > 1) the legal move given most often
+        wins, ties going to the earliest; illegal or unparsable samples only
+        cost a retry if no sample holds a legal move.
+        """
+        # Extract response
+        if not response.choices:
+            print(f"Warning: Empty response from API (attempt {attempt + 1}/{self.max_retries + 1})")
+            return None
+        
+        votes: Counter = Counter()
+        contents: Dict[chess.Move, str] = {}
+        repairs: Dict[chess.Move, Optional[str]] = {}
+        for sample, choice in enumerate(response.choices):
+            content = choice.message.content or ""
+            
+            # Debug: Print output response
+            if self.debug:
+                print(f"\n{'='*70}")
+                print(f"DEBUG - OUTPUT RESPONSE (Attempt {attempt + 1}, Sample {sample + 1}, Time: {elapsed_time:.2f}s):")
+                print(f"{'='*70}")
+                print(content)
+                print(f"{'='*70}\n")
+            
+            # Parse move
+            sample_move, repair = self._parse_move(content, legal_moves, board)
+            if sample_move is not None:
+                votes[sample_move] += 1
+                contents.setdefault(sample_move, content)
+                if sample_move not in repairs or repair is None:
+                    # Counts as repaired only if no sample gave the move exactly
+                    repairs[sample_move] = repair
+        if metrics is not None:
+            metrics.samples += len(response.choices)
+            metrics.legal_samples += sum(votes.values())
         
-        return None, "Failed to get valid move"
+        move = votes.most_common(1)[0][0] if votes else None
+        if move is not None and metrics is not None:
+            metrics.repair = repairs[move]
+        
+        # Extract optional <think> reasoning for logging/UI
+        comment = None
+        if move is not None:
+            think_match = re.search(r"<think>(.*?)</think>", contents[move], re.IGNORECASE | re.DOTALL)
+            if think_match:
+                comment = think_match.group(1).strip()
+
+        if move is not None:
+            # Return move plus optional human-readable comment
+            return move, (comment or f"API move (attempt {attempt + 1})")
+        elif attempt < self.max_retries:
+            print(f"Warning: Invalid move on attempt {attempt + 1}, retrying...")
+            return None
+        else:
+            print(f"Warning: Failed after {self.max_retries + 1} attempts, resigning")
+            return None, f"Resigned after {self.max_retries + 1} failed attempts"
+    
+    def close(self):
+        """Close this agent's own client (shared clients are left open)."""
+        if self._owns_client:
+            self.client.close()
+    
+    async def aclose(self):
+        """Close this agent's own clients (shared clients are left open)."""
+        if self._owns_async_client and self.async_client is not None:
+            await self.async_client.close()
+            self.async_client = None
+        self.close()
     
     def get_avg_move_time(self) -> float:
         """Get average time per move."""
@@ -432,12 +832,14 @@ class OpenAIEndpointAgent(ChessAgent):
     def reset_stats(self):
         """Reset move time statistics."""
         self.move_times = []
+        self.move_metrics = []
 
 
 class StockfishAgent(ChessAgent):
     """Simple Stockfish agent using python-chess engine."""
     
-    def __init__(self, depth: int = 1, skill_level: int = 0, time_limit_ms: int = 100):
+    def __init__(self, depth: int = 1, skill_level: int = 0, time_limit_ms: int = 100,
+                 engine_pool: Optional[EnginePool] = None):
         """
         Initialize Stockfish agent.
         
@@ -445,13 +847,19 @@ class StockfishAgent(ChessAgent):
             depth: Search depth for Stockfish
             skill_level: Skill level (0-20, lower is weaker)
             time_limit_ms: Time limit in milliseconds
+            engine_pool: If given, lease a pooled engine per move instead of
+                spawning a dedicated Stockfish process
         """
         self.depth = depth
         self.skill_level = skill_level
         self.time_limit_ms = time_limit_ms
-        self.engine = chess.engine.SimpleEngine.popen_uci("stockfish")
-        if skill_level is not None:
-            self.engine.configure({"Skill Level": skill_level})
+        self.engine_pool = engine_pool
+        if engine_pool is not None:
+            self.engine = None
+        else:
+            self.engine = chess.engine.SimpleEngine.popen_uci("stockfish")
+            if skill_level is not None:
+                self.engine.configure({"Skill Level": skill_level})
     
     def choose_move(
         self,
@@ -464,8 +872,63 @@ class StockfishAgent(ChessAgent):
         if not legal_moves:
             return None, "No legal moves available"
         
+        limit = chess.engine.Limit(depth=self.depth, time=self.time_limit_ms / 1000.0)
+        try:
+            if self.engine_pool is not None:
+                # Keyed by this agent, so the engine only gets ucinewgame when it
+                # last searched for a different game
+                options = {"Skill Level": self.skill_level} if self.skill_level is not None else None
+                with self.engine_pool.lease(options=options, limit=limit, game=self) as engine:
+                    result = engine.play(board)
+            else:
+                result = self.engine.play(board, limit)
+            return result.move, "Stockfish move"
+        except Exception as e:
+            print(f"Stockfish error: {e}")
+            return None, f"Stockfish error: {e}"
+    
+    def close(self):
+        """Close the Stockfish engine."""
+        if getattr(self, 'engine', None) is not None:
+            self.engine.quit()
+
+
+class AsyncStockfishAgent:
+    """Stockfish opponent driven through python-chess's asyncio engine API."""
+    
+    def __init__(self, depth: int = 1, skill_level: int = 0, time_limit_ms: int = 100):
+        """
+        Initialize the agent; the engine process is started by `start()`.
+        
+        Args:
+            depth: Search depth for Stockfish
+            skill_level: Skill level (0-20, lower is weaker)
+            time_limit_ms: Time limit in milliseconds
+        """
+        self.depth = depth
+        self.skill_level = skill_level
+        self.time_limit_ms = time_limit_ms
+        self.engine: Optional[chess.engine.UciProtocol] = None
+    
+    async def start(self):
+        """Spawn the Stockfish process on the running event loop."""
+        _, self.engine = await chess.engine.popen_uci("stockfish")
+        if self.skill_level is not None:
+            await self.engine.configure({"Skill Level": self.skill_level})
+    
+    async def achoose_move(
+        self,
+        board: chess.Board,
+        legal_moves: List[chess.Move],
+        move_history: List[str],
+        side_to_move: str,
+    ) -> Tuple[Optional[chess.Move], Optional[str]]:
+        """Choose a move using Stockfish."""
+        if not legal_moves:
+            return None, "No legal moves available"
+        
         try:
-            result = self.engine.play(
+            result = await self.engine.play(
                 board,
                 chess.engine.Limit(depth=self.depth, time=self.time_limit_ms / 1000.0)
             )
@@ -474,14 +937,58 @@ class StockfishAgent(ChessAgent):
             print(f"Stockfish error: {e}")
             return None, f"Stockfish error: {e}"
     
-    def close(self):
+    async def aclose(self):
         """Close the Stockfish engine."""
-        if hasattr(self, 'engine'):
-            self.engine.quit()
+        if self.engine is not None:
+            await self.engine.quit()
+            self.engine = None
+
+
+class PositionTap(ChessAgent):
+    """
+    Wraps an agent and runs a per-ply hook before every move it is asked for.
+    
+    ChessEnvironment owns the game loop, so this is how positions reach the
+    ACPL pipeline while the game is still being played, and how an
+    adjudicator stops the game: once `stop` returns a result, the wrapped
+    agent is not asked, ChessEnvironment ends the game on the missing move
+    and play_game reports the stop result (`stopped`) instead.
+    """
+    
+    def __init__(self, agent: ChessAgent, on_position: Optional[Callable[[chess.Board], None]] = None,
+                 stop: Optional[Callable[[chess.Board], Optional[str]]] = None):
+        self.agent = agent
+        self.on_position = on_position
+        self.stop = stop
+        self.stopped: Optional[str] = None
+    
+    def choose_move(
+        self,
+        board: chess.Board,
+        legal_moves: List[chess.Move],
+        move_history: List[str],
+        side_to_move: str,
+    ) -> Tuple[Optional[chess.Move], Optional[str]]:
+        """Report the position and check `stop`, then let the wrapped agent choose."""
+        if self.on_position is not None:
+            try:
+                self.on_position(board)
+            except Exception as e:
+                print(f"Warning: Failed to queue position for analysis: {e}")
+        if self.stop is not None:
+            self.stopped = self.stop(board)
+            if self.stopped is not None:
+                return None, f"Game adjudicated: {self.stopped}"
+        return self.agent.choose_move(board, legal_moves, move_history, side_to_move)
+    
+    def __getattr__(self, name):
+        return getattr(self.agent, name)
 
 
 def play_game(player_agent: OpenAIEndpointAgent, opponent_agent: ChessAgent,
-              player_color: str, game_id: int, verbose: bool = False) -> dict:
+              player_color: str, game_id: int, verbose: bool = False,
+              on_position: Optional[Callable[[chess.Board], None]] = None,
+              adjudicator: Optional[Adjudicator] = None) -> dict:
     """
     Play a single game between player and opponent.
     
@@ -491,6 +998,9 @@ def play_game(player_agent: OpenAIEndpointAgent, opponent_agent: ChessAgent,
         player_color: "white" or "black"
         game_id: Game number (for logging)
         verbose: Whether to print game progress
+        on_position: Called with the board before every move (e.g. to queue
+            the position for ACPL analysis)
+        adjudicator: End the game early once it is decided (optional)
     
     Returns:
         Dictionary with game statistics
@@ -503,8 +1013,13 @@ def play_game(player_agent: OpenAIEndpointAgent, opponent_agent: ChessAgent,
         white_agent = opponent_agent
         black_agent = player_agent
     
+    stop = adjudicator.check if adjudicator is not None else None
+    if on_position is not None or stop is not None:
+        white_agent = PositionTap(white_agent, on_position, stop)
+        black_agent = PositionTap(black_agent, on_position, stop)
+    
     # Create environment
-    env = ChessEnvironment(white_agent, black_agent, max_moves=200, time_limit=30.0)
+    env = ChessEnvironment(white_agent, black_agent, max_moves=200, time_limit=MOVE_TIME_LIMIT)
     
     # Track move times
     white_times = []
@@ -517,9 +1032,15 @@ def play_game(player_agent: OpenAIEndpointAgent, opponent_agent: ChessAgent,
         print(f"{'='*60}")
     
     result = env.play_game(verbose=verbose)
+    if stop is not None:
+        # The stopped side "failed to move"; report the adjudication instead
+        stopped = white_agent.stopped or black_agent.stopped
+        if stopped is not None:
+            result["result"] = stopped
     
     # Extract move times from player agent
     player_times = player_agent.move_times.copy()
+    move_metrics = list(player_agent.move_metrics)
     player_agent.reset_stats()
     
     # Calculate times
@@ -530,67 +1051,238 @@ def play_game(player_agent: OpenAIEndpointAgent, opponent_agent: ChessAgent,
         white_time = 0.0
         black_time = sum(player_times) / len(player_times) if player_times else 0.0
     
-    return {
+    game = {
         "result": result["result"],
         "moves_played": result["moves_played"],
         "move_history": result["move_history"],
         "white_time": white_time,
-        "black_time": black_time
+        "black_time": black_time,
+        "move_metrics": move_metrics,
     }
+    if "move_comments" in result:
+        game["move_comments"] = result["move_comments"]
+    return game
 
 
-def save_game_log(
-    game_num: int,
-    opponent_name: str,
-    player_color: str,
-    game_result: dict,
-    white_acpl: float,
-    black_acpl: float,
-    timestamp: str,
-):
+def _final_result(board: chess.Board, max_moves: int) -> str:
+    """Result string of a game that ended on the board or at the move limit."""
+    outcome = board.outcome()
+    if outcome is None:
+        return f"Draw (max moves {max_moves} reached)"
+    if outcome.winner is None:
+        return f"Draw ({outcome.termination.name.lower()})"
+    winner = "White" if outcome.winner == chess.WHITE else "Black"
+    return f"{winner} wins ({outcome.termination.name.lower()})"
+
+
+async def async_play_game(player_agent: OpenAIEndpointAgent, opponent_agent,
+                          player_color: str, game_id: int, verbose: bool = False,
+                          max_moves: int = 200, time_limit: float = MOVE_TIME_LIMIT,
+                          on_position: Optional[Callable[[chess.Board], None]] = None,
+                          adjudicator: Optional[Adjudicator] = None,
+                          executor: Optional[Executor] = None) -> dict:
     """
-    Save game data to a JSON file in the logs/ directory.
+    Play a single game on the event loop.
+    
+    ChessEnvironment drives agents synchronously, so async mode runs its own
+    loop with the same limits: at most `max_moves` plies and `time_limit`
+    seconds per move. A side that fails to produce a move (resignation,
+    API error or timeout) loses.
     
     Args:
-        game_num: Game number
-        opponent_name: Name of the opponent
+        player_agent: The player agent being evaluated
+        opponent_agent: Opponent with `achoose_move` (or a plain ChessAgent)
         player_color: "white" or "black"
-        game_result: Dictionary with game result data
-        white_acpl: White's average centipawn loss
-        black_acpl: Black's average centipawn loss
-        timestamp: Timestamp string for the log filename
+        game_id: Game number (for logging)
+        verbose: Whether to print game progress
+        max_moves: Maximum number of plies before the game is drawn
+        time_limit: Maximum seconds per move
+        on_position: Called with the board before every move (must not block)
+        adjudicator: End the game early once it is decided (checked in a
+            worker thread, as it may search the position)
+        executor: Threads for the blocking calls (adjudication and agents
+            without `achoose_move`); default: the loop's default executor
+    
+    Returns:
+        Dictionary with game statistics (same keys as play_game)
     """
-    # Create logs directory if it doesn't exist
-    logs_dir = os.path.join(os.path.dirname(__file__), "logs")
-    os.makedirs(logs_dir, exist_ok=True)
+    if player_color == "white":
+        agents = {chess.WHITE: player_agent, chess.BLACK: opponent_agent}
+    else:
+        agents = {chess.WHITE: opponent_agent, chess.BLACK: player_agent}
     
-    # Determine player ACPL based on color
-    player_acpl = white_acpl if player_color == "white" else black_acpl
-    opponent_acpl = black_acpl if player_color == "white" else white_acpl
+    if verbose:
+        print(f"\n{'='*60}")
+        print(f"Game {game_id}: Player as {player_color.upper()} vs {opponent_agent.__class__.__name__}")
+        print(f"{'='*60}")
     
-    # Create game data structure
-    game_data = {
-        "timestamp": timestamp,
-        "game_number": game_num,
-        "opponent": opponent_name,
-        "player_color": player_color,
-        "result": game_result["result"],
-        "moves_played": game_result["moves_played"],
-        "move_history": game_result["move_history"],
+    loop = asyncio.get_running_loop()
+    board = chess.Board()
+    move_history: List[str] = []
+    move_comments: List[Optional[str]] = []
+    result = None
+    
+    while not board.is_game_over() and len(move_history) < max_moves:
+        side = "White" if board.turn == chess.WHITE else "Black"
+        other = "Black" if board.turn == chess.WHITE else "White"
+        agent = agents[board.turn]
+        legal_moves = list(board.legal_moves)
+        if on_position is not None:
+            on_position(board)
+        if adjudicator is not None:
+            result = await loop.run_in_executor(executor, adjudicator.check, board.copy())
+            if result is not None:
+                break
+        
+        try:
+            if hasattr(agent, "achoose_move"):
+                pending = agent.achoose_move(board, legal_moves, list(move_history), side)
+            else:
+                pending = loop.run_in_executor(executor, agent.choose_move, board.copy(), legal_moves,
+                                               list(move_history), side)
+            move, comment = await asyncio.wait_for(pending, timeout=time_limit)
+        except asyncio.TimeoutError:
+            move, comment = None, f"Exceeded time limit of {time_limit:.0f}s"
+        
+        if move is None or move not in legal_moves:
+            result = f"{other} wins ({side} failed to move: {comment})"
+            break
+        
+        if verbose:
+            print(f"{side}: {board.san(move)}")
+        board.push(move)
+        move_history.append(move.uci())
+        move_comments.append(comment)
+    
+    if result is None:
+        result = _final_result(board, max_moves)
+    
+    player_times = player_agent.move_times.copy()
+    move_metrics = list(player_agent.move_metrics)
+    player_agent.reset_stats()
+    avg_time = sum(player_times) / len(player_times) if player_times else 0.0
+    
+    return {
+        "result": result,
+        "moves_played": len(move_history),
+        "move_history": move_history,
+        "move_comments": move_comments,
+        "white_time": avg_time if player_color == "white" else 0.0,
+        "black_time": avg_time if player_color == "black" else 0.0,
+        "move_metrics": move_metrics,
+    }
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0-100) of `values`; 0.0 if empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))  # ceil(n * q / 100)
+    return ordered[int(rank) - 1]
+
+
+def summarize_move_metrics(move_metrics: List[MoveMetrics]) -> dict:
+    """
+    Latency percentiles, token throughput and retry overhead of a set of moves.
+    
+    Args:
+        move_metrics: Per-move metrics of the player
+    
+    Returns:
+        Dictionary with the EvaluationResults latency/throughput fields
+    """
+    latencies = [m.total_s for m in move_metrics]
+    request_s = sum(m.request_s for m in move_metrics)
+    completion_tokens = sum(m.completion_tokens for m in move_metrics)
+    count = len(move_metrics)
+    return {
+        "latency_p50": percentile(latencies, 50),
+        "latency_p95": percentile(latencies, 95),
+        "latency_p99": percentile(latencies, 99),
+        "latency_max": max(latencies, default=0.0),
+        "avg_prompt_build_ms": sum(m.prompt_build_s for m in move_metrics) * 1000 / count if count else 0.0,
+        "avg_parse_ms": sum(m.parse_s for m in move_metrics) * 1000 / count if count else 0.0,
+        "prompt_tokens": sum(m.prompt_tokens for m in move_metrics),
+        "completion_tokens": completion_tokens,
+        "tokens_per_sec": completion_tokens / request_s if request_s > 0 else 0.0,
+        "retries": sum(m.retries for m in move_metrics),
+        "retry_overhead_s": sum(m.retry_overhead_s for m in move_metrics),
+        "repairs": dict(Counter(m.repair for m in move_metrics if m.repair)),
+    }
+
+
+def save_game_log(
+    game_num: int,
+    opponent_name: str,
+    player_color: str,
+    game_result: dict,
+    white_acpl: float,
+    black_acpl: float,
+    timestamp: str,
+    log_store: Optional[GameLogStore] = None,
+    player_name: Optional[str] = None,
+):
+    """
+    Save game data to the logs/ directory.
+    
+    With a log store the game is appended as one line to the run's JSONL log
+    and indexed; otherwise it is written to its own JSON file.
+    
+    Args:
+        game_num: Game number
+        opponent_name: Name of the opponent
+        player_color: "white" or "black"
+        game_result: Dictionary with game result data
+        white_acpl: White's average centipawn loss
+        black_acpl: Black's average centipawn loss
+        timestamp: Timestamp string for the log filename (the run ID)
+        log_store: Append to this store instead of writing a file (optional)
+        player_name: Endpoint label of the player in a tournament (optional)
+    
+    Returns:
+        Path of the written file, or the game's id in the log store
+    """
+    # Create logs directory if it doesn't exist
+    logs_dir = os.path.join(os.path.dirname(__file__), "logs")
+    os.makedirs(logs_dir, exist_ok=True)
+    
+    # Determine player ACPL based on color
+    player_acpl = white_acpl if player_color == "white" else black_acpl
+    opponent_acpl = black_acpl if player_color == "white" else white_acpl
+    
+    # Create game data structure
+    game_data = {
+        "timestamp": timestamp,
+        "game_number": game_num,
+        "opponent": opponent_name,
+        "player_color": player_color,
+        "result": game_result["result"],
+        "moves_played": game_result["moves_played"],
+        "move_history": game_result["move_history"],
         # Optional per-move comments (e.g. LLM <think> reasoning)
         "move_comments": game_result.get("move_comments", []),
         "player_acpl": player_acpl,
         "opponent_acpl": opponent_acpl,
         "white_acpl": white_acpl,
         "black_acpl": black_acpl,
-        "player_avg_time_per_move": game_result.get("white_time" if player_color == "white" else "black_time", 0.0)
+        "player_avg_time_per_move": game_result.get("white_time" if player_color == "white" else "black_time", 0.0),
+        # Per-move prompt-build/request/parse times, tokens and retries of the player
+        "player_move_metrics": [asdict(m) for m in game_result.get("move_metrics", [])],
+        "player_latency": summarize_move_metrics(game_result.get("move_metrics", [])),
     }
+    if player_name is not None:
+        game_data["player"] = player_name
     
     # Generate filename with timestamp and game number
     # Safe opponent name (replace spaces and special chars)
     safe_opponent = opponent_name.replace(" ", "_").replace("(", "").replace(")", "").replace(",", "")
-    filename = f"game_{timestamp}_{safe_opponent}_{player_color}_g{game_num}.json"
-    filepath = os.path.join(logs_dir, filename)
+    if player_name is not None:
+        safe_opponent = f"{re.sub(r'[^A-Za-z0-9_.-]', '_', player_name)}_vs_{safe_opponent}"
+    game_id = f"game_{timestamp}_{safe_opponent}_{player_color}_g{game_num}"
+    if log_store is not None:
+        return log_store.append(timestamp, game_id, game_data)
+    filepath = os.path.join(logs_dir, f"{game_id}.json")
     
     # Write JSON file
     with open(filepath, 'w') as f:
@@ -599,6 +1291,505 @@ def save_game_log(
     return filepath
 
 
+def analyze_and_record_game(
+    game_num: int,
+    num_games: int,
+    opponent_name: str,
+    player_color: str,
+    game_result: dict,
+    timestamp: str,
+    acpl_depth: int = 7,
+    acpl_movetime_ms: int = 1000,
+    engine_pool: Optional[EnginePool] = None,
+    game_analysis: Optional[GameAnalysis] = None,
+    eval_cache: Optional[EvalCache] = None,
+    log_store: Optional[GameLogStore] = None,
+    process_analyzer: Optional[ProcessAnalyzer] = None,
+    player_name: Optional[str] = None,
+) -> GameStats:
+    """
+    Run ACPL analysis on a finished game, save its log and report it.
+    
+    Args:
+        game_num: Game number
+        num_games: Total number of games against this opponent (for reporting)
+        opponent_name: Name of the opponent
+        player_color: "white" or "black"
+        game_result: Dictionary returned by play_game / async_play_game
+        timestamp: Timestamp string for the log filename
+        acpl_depth: Stockfish depth for ACPL analysis
+        acpl_movetime_ms: Time per ACPL analysis in milliseconds
+        engine_pool: If given, analyze on a leased pool engine
+        game_analysis: Pipelined analysis already fed during the game; only the
+            positions still in flight are waited for
+        eval_cache: Position-evaluation cache consulted before pooled searches
+        log_store: Append the game log to this store instead of its own file
+        process_analyzer: Analyze the game in a worker process (optional)
+        player_name: Endpoint label of the player in a tournament (optional)
+    
+    Returns:
+        GameStats for the game
+    """
+    # Analyze ACPL - create a new analyzer for each game since it closes after analyze_game
+    white_acpl = 0.0
+    black_acpl = 0.0
+    if len(game_result["move_history"]) > 0:
+        try:
+            # Use a strong Stockfish instance for ACPL analysis
+            if game_analysis is not None:
+                acpl_result = game_analysis.result(game_result["move_history"])
+            elif process_analyzer is not None:
+                acpl_result = process_analyzer.analyze_game(game_result["move_history"])
+            else:
+                if engine_pool is not None:
+                    analyzer = PooledAnalyzer(engine_pool, depth=acpl_depth, movetime_ms=acpl_movetime_ms,
+                                              cache=eval_cache)
+                else:
+                    analyzer = _StockfishAnalyzer(depth=acpl_depth, movetime_ms=acpl_movetime_ms)
+                acpl_result = analyzer.analyze_game(game_result["move_history"])
+            white_acpl = acpl_result["white_acpl"]
+            black_acpl = acpl_result["black_acpl"]
+        except Exception as e:
+            print(f"Warning: ACPL analysis failed for game {game_num}: {e}")
+    
+    stats = GameStats(
+        result=game_result["result"],
+        moves_played=game_result["moves_played"],
+        white_time=game_result["white_time"],
+        black_time=game_result["black_time"],
+        white_acpl=white_acpl,
+        black_acpl=black_acpl,
+        player_color=player_color,
+        move_metrics=game_result.get("move_metrics", []),
+    )
+    
+    # Save game log
+    log_path = save_game_log(
+        game_num=game_num,
+        opponent_name=opponent_name,
+        player_color=player_color,
+        game_result=game_result,
+        white_acpl=white_acpl,
+        black_acpl=black_acpl,
+        timestamp=timestamp,
+        log_store=log_store,
+        player_name=player_name,
+    )
+    
+    player_acpl = white_acpl if player_color == "white" else black_acpl
+    player_time = game_result['white_time'] if player_color == "white" else game_result['black_time']
+    
+    player_p95 = percentile([m.total_s for m in stats.move_metrics], 95)
+    
+    matchup = f"{player_name} vs {opponent_name}, " if player_name is not None else ""
+    print(f"✓ Game {game_num}/{num_games} ({matchup}{player_color}): {game_result['result']} "
+          f"in {game_result['moves_played']} moves "
+          f"(Player ACPL: {player_acpl:.1f}, Time: {player_time:.2f}s, p95: {player_p95:.2f}s)")
+    
+    return stats
+
+
+def player_score(stats: GameStats) -> float:
+    """Game score from the player's perspective: 1 win, 0.5 draw, 0 loss."""
+    player = "White" if stats.player_color == "white" else "Black"
+    opponent = "Black" if stats.player_color == "white" else "White"
+    if f"{player} wins" in stats.result:
+        return 1.0
+    if f"{opponent} wins" in stats.result:
+        return 0.0
+    return 0.5
+
+
+class SPRTStopping:
+    """
+    Per-opponent SPRT that cancels an opponent's queued games once it decides.
+    
+    Games already in flight still finish and are counted in the results.
+    """
+    
+    def __init__(self, scheduler: GameScheduler, elo0: float, elo1: float,
+                 alpha: float = 0.05, beta: float = 0.05):
+        self.scheduler = scheduler
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+        self.tests: Dict[str, SPRT] = {}
+        self._lock = threading.Lock()
+    
+    def test(self, opponent_name: str) -> SPRT:
+        """The running test against one opponent."""
+        with self._lock:
+            if opponent_name not in self.tests:
+                self.tests[opponent_name] = SPRT(self.elo0, self.elo1, self.alpha, self.beta)
+            return self.tests[opponent_name]
+    
+    def decided(self, opponent_name: str) -> bool:
+        return self.test(opponent_name).decision is not None
+    
+    def add(self, task: GameTask, stats: GameStats):
+        """Count a finished game; on a decision, cancel the opponent's queued games."""
+        test = self.test(task.opponent_name)
+        with self._lock:
+            undecided = test.decision is None
+            decision = test.add(player_score(stats))
+        if undecided and decision is not None:
+            cancelled = self.scheduler.cancel(lambda queued: queued.opponent_name == task.opponent_name)
+            print(f"\n{task.opponent_name}: {test.summary()}; cancelled {cancelled} queued games")
+
+
+def summarize_games(opponent_name: str, num_games: int, game_stats: List[GameStats]) -> EvaluationResults:
+    """
+    Aggregate per-game statistics into EvaluationResults.
+    
+    Args:
+        opponent_name: Name of the opponent (for reporting)
+        num_games: Number of games scheduled against this opponent
+        game_stats: Statistics of the games that completed
+    
+    Returns:
+        EvaluationResults object with statistics
+    """
+    wins = 0
+    draws = 0
+    losses = 0
+    total_acpl = 0.0
+    adjudicated = Counter()
+    
+    for stats in game_stats:
+        result = stats.result
+        if is_adjudicated(result):
+            adjudicated[player_score(stats)] += 1
+        
+        # Determine outcome from player's perspective
+        if stats.player_color == "white":
+            if "White wins" in result:
+                wins += 1
+            elif "Black wins" in result:
+                losses += 1
+            else:
+                draws += 1
+            total_acpl += stats.white_acpl
+        else:
+            if "Black wins" in result:
+                wins += 1
+            elif "White wins" in result:
+                losses += 1
+            else:
+                draws += 1
+            total_acpl += stats.black_acpl
+    
+    avg_acpl = total_acpl / len(game_stats) if game_stats else 0.0
+    
+    move_metrics = [m for stats in game_stats for m in stats.move_metrics]
+    total_time = sum(m.total_s for m in move_metrics)
+    timed_moves = float(len(move_metrics))
+    for stats in game_stats:
+        if not stats.move_metrics:
+            # No per-move metrics (e.g. journaled before they were recorded):
+            # the player's mean move time over about half of the plies
+            player_time = stats.white_time if stats.player_color == "white" else stats.black_time
+            total_time += player_time * stats.moves_played / 2
+            timed_moves += stats.moves_played / 2
+    avg_time = total_time / timed_moves if timed_moves else 0.0
+    
+    return EvaluationResults(
+        opponent_name=opponent_name,
+        total_games=num_games,
+        wins=wins,
+        draws=draws,
+        losses=losses,
+        avg_acpl=avg_acpl,
+        avg_time_per_move=avg_time,
+        games=game_stats,
+        adjudicated_wins=adjudicated[1.0],
+        adjudicated_draws=adjudicated[0.5],
+        adjudicated_losses=adjudicated[0.0],
+        **summarize_move_metrics(move_metrics),
+    )
+
+
+def print_results(results: List[EvaluationResults]):
+    """Print evaluation results in a nice format."""
+    print("\n" + "="*70)
+    print(" "*20 + "EVALUATION RESULTS")
+    print("="*70)
+    
+    for result in results:
+        print(f"{result.player_name} vs {result.opponent_name}:")
+        print(f"  Games Played:    {result.total_games}")
+        print(f"  Wins:            {result.wins} ({result.wins/result.total_games*100:.1f}%)")
+        print(f"  Draws:           {result.draws} ({result.draws/result.total_games*100:.1f}%)")
+        print(f"  Losses:          {result.losses} ({result.losses/result.total_games*100:.1f}%)")
+        print(f"  Average ACPL:    {result.avg_acpl:.2f}")
+        print(f"  Avg Time/Move:   {result.avg_time_per_move:.3f}s")
+        print(f"  Move latency:    p50 {result.latency_p50:.3f}s, p95 {result.latency_p95:.3f}s, "
+              f"p99 {result.latency_p99:.3f}s, max {result.latency_max:.3f}s")
+        print(f"  Prompt/Parse:    {result.avg_prompt_build_ms:.2f} ms / {result.avg_parse_ms:.2f} ms per move")
+        print(f"  Tokens:          {result.prompt_tokens} prompt, {result.completion_tokens} completion "
+              f"({result.tokens_per_sec:.1f} completion tokens/s)")
+        print(f"  Retries:         {result.retries} ({result.retry_overhead_s:.2f}s spent on retried attempts)")
+        if result.repairs:
+            repaired = ", ".join(f"{name} {result.repairs[name]}" for name in REPAIRS if name in result.repairs)
+            print(f"  Repaired moves:  {sum(result.repairs.values())} ({repaired}) fixed locally instead of retried")
+        adjudicated = result.adjudicated_wins + result.adjudicated_draws + result.adjudicated_losses
+        if adjudicated:
+            print(f"  Adjudicated:     {adjudicated} games (+{result.adjudicated_wins} ={result.adjudicated_draws} "
+                  f"-{result.adjudicated_losses}, included above)")
+        if result.sprt:
+            print(f"  {result.sprt}")
+    
+    # Overall statistics
+    total_games = sum(r.total_games for r in results)
+    total_wins = sum(r.wins for r in results)
+    total_draws = sum(r.draws for r in results)
+    total_losses = sum(r.losses for r in results)
+    overall_acpl = sum(r.avg_acpl * r.total_games for r in results) / total_games if total_games > 0 else 0
+    overall_time = sum(r.avg_time_per_move * r.total_games for r in results) / total_games if total_games > 0 else 0
+    
+    print(f"\n{'='*70}")
+    print(" "*25 + "OVERALL")
+    print(f"{'='*70}")
+    print(f"  Total Games:     {total_games}")
+    print(f"  Total Wins:      {total_wins} ({total_wins/total_games*100:.1f}%)")
+    print(f"  Total Draws:     {total_draws} ({total_draws/total_games*100:.1f}%)")
+    print(f"  Total Losses:    {total_losses} ({total_losses/total_games*100:.1f}%)")
+    total_adjudicated = sum(r.adjudicated_wins + r.adjudicated_draws + r.adjudicated_losses for r in results)
+    if total_adjudicated:
+        print(f"  Adjudicated:     {total_adjudicated} "
+              f"(+{sum(r.adjudicated_wins for r in results)} ={sum(r.adjudicated_draws for r in results)} "
+              f"-{sum(r.adjudicated_losses for r in results)})")
+    print(f"  Overall ACPL:    {overall_acpl:.2f}")
+    print(f"  Overall Time:    {overall_time:.3f}s per move")
+    print(f"{'='*70}\n")
+
+
+@dataclass
+class GameSettings:
+    """Configuration shared by every game of an evaluation run."""
+    base_url: str
+    api_key: str = "dummy"
+    max_retries: int = 2
+    template_file: Optional[str] = None
+    debug: bool = False
+    verbose: bool = False
+    acpl_depth: int = 7
+    acpl_movetime_ms: int = 1000
+    engine_pool: Optional[EnginePool] = None
+    analysis_pipeline: Optional[AnalysisPipeline] = None
+    eval_cache: Optional[EvalCache] = None
+    batcher: Optional[MoveBatcher] = None
+    # Run-wide clients sharing one connection pool across games
+    client: Optional[OpenAI] = None
+    async_client: Optional[AsyncOpenAI] = None
+    num_samples: int = 1
+    log_store: Optional[GameLogStore] = None  # None writes one JSON file per game
+    process_analyzer: Optional[ProcessAnalyzer] = None  # whole-game ACPL in worker processes
+    # Requests in flight to this endpoint (tournaments cap each endpoint; default: the scheduler's)
+    request_slots: Optional[threading.BoundedSemaphore] = None
+    adjudication: Optional[Adjudication] = None  # end decided games early
+    # --async: threads for blocking pool searches (opponent moves, adjudication), one per pool engine
+    engine_executor: Optional[ThreadPoolExecutor] = None
+
+
+def schedule_opponent_games(opponent_name: str, opponent_agent: ChessAgent, num_games: int,
+                            timestamp: str) -> List[GameTask]:
+    """
+    Create the game tasks against one opponent, half as white and half as black.
+    
+    Args:
+        opponent_name: Name of the opponent (for reporting)
+        opponent_agent: Opponent template agent
+        num_games: Number of games to play (must be even)
+        timestamp: Evaluation session timestamp (for log filenames)
+    
+    Returns:
+        List of GameTask
+    """
+    if num_games % 2 != 0:
+        raise ValueError("num_games must be even (for equal white/black distribution)")
+    
+    print(f"\n{'='*70}")
+    print(f"EVALUATING AGAINST: {opponent_name}")
+    print(f"{'='*70}")
+    print(f"Playing {num_games} games ({num_games//2} as white, {num_games//2} as black)")
+    
+    games_per_color = num_games // 2
+    tasks = []
+    # Alternate colors so a run stopped early (SPRT) has played both about equally
+    for i in range(games_per_color):
+        tasks.append(GameTask(opponent_name, opponent_agent, "white", i + 1, num_games, timestamp))
+        tasks.append(GameTask(opponent_name, opponent_agent, "black", games_per_color + i + 1, num_games, timestamp))
+    return tasks
+
+
+def _start_adjudicator(settings: GameSettings, game_analysis: Optional[GameAnalysis]) -> Optional[Adjudicator]:
+    """Per-game adjudicator reading the ACPL pipeline's evaluations, or searching on the pool without one."""
+    if settings.adjudication is None:
+        return None
+    evals = None
+    if game_analysis is not None:
+        evals = game_analysis.evals_before
+    elif settings.engine_pool is not None:
+        evals = pool_evals(PooledAnalyzer(settings.engine_pool, depth=settings.acpl_depth,
+                                          movetime_ms=settings.acpl_movetime_ms, cache=settings.eval_cache))
+    return settings.adjudication.start_game(evals)
+
+
+def play_scheduled_game(task: GameTask, settings: GameSettings, scheduler: GameScheduler) -> GameStats:
+    """
+    Play a single game and analyze it (runs on a scheduler worker thread).
+    
+    Args:
+        task: Game to play
+        settings: Run-wide configuration
+        scheduler: Scheduler whose LLM request slots the player agent uses
+    
+    Returns:
+        GameStats for the game
+    """
+    # Create a fresh player agent for this game
+    game_player_agent = OpenAIEndpointAgent(
+        base_url=settings.base_url,
+        api_key=settings.api_key,
+        max_retries=settings.max_retries,
+        template_file=settings.template_file,
+        debug=settings.debug,
+        request_slots=settings.request_slots or scheduler.llm_slots,
+        batcher=settings.batcher,
+        client=settings.client,
+        num_samples=settings.num_samples,
+        move_timeout=MOVE_TIME_LIMIT,
+    )
+    
+    # Create a fresh opponent agent for this game (especially important for Stockfish)
+    opponent_agent = task.opponent_agent
+    if isinstance(opponent_agent, StockfishAgent):
+        game_opponent_agent = StockfishAgent(
+            depth=opponent_agent.depth if hasattr(opponent_agent, 'depth') else 1,
+            skill_level=opponent_agent.skill_level if hasattr(opponent_agent, 'skill_level') else 0,
+            engine_pool=settings.engine_pool,
+        )
+    elif isinstance(opponent_agent, RandomAgent):
+        game_opponent_agent = RandomAgent()
+    elif isinstance(opponent_agent, OpenAIEndpointAgent):
+        # Another endpoint (tournament): its own per-game history, its endpoint's client and slots
+        game_opponent_agent = OpenAIEndpointAgent(
+            base_url=opponent_agent.base_url,
+            api_key=opponent_agent.api_key,
+            max_retries=opponent_agent.max_retries,
+            template_file=opponent_agent.template_file,
+            debug=opponent_agent.debug,
+            request_slots=opponent_agent.request_slots,
+            batcher=opponent_agent.batcher,
+            client=opponent_agent.client,
+            num_samples=opponent_agent.num_samples,
+            move_timeout=MOVE_TIME_LIMIT,
+        )
+    else:
+        game_opponent_agent = opponent_agent  # Fallback to shared instance
+    
+    pipeline = settings.analysis_pipeline
+    game_analysis = pipeline.start_game() if pipeline is not None else None
+    adjudicator = _start_adjudicator(settings, game_analysis)
+    
+    try:
+        game_result = play_game(game_player_agent, game_opponent_agent, task.player_color, task.game_num,
+                                settings.verbose,
+                                on_position=game_analysis.add_position if game_analysis else None,
+                                adjudicator=adjudicator)
+        return analyze_and_record_game(
+            task.game_num, task.num_games, task.opponent_name, task.player_color, game_result, task.timestamp,
+            acpl_depth=settings.acpl_depth, acpl_movetime_ms=settings.acpl_movetime_ms,
+            engine_pool=settings.engine_pool, game_analysis=game_analysis, eval_cache=settings.eval_cache,
+            log_store=settings.log_store, process_analyzer=settings.process_analyzer,
+            player_name=task.player,
+        )
+    finally:
+        # Clean up the game-specific agents
+        game_player_agent.close()
+        if hasattr(game_opponent_agent, 'close'):
+            game_opponent_agent.close()
+
+
+async def async_play_scheduled_game(task: GameTask, settings: GameSettings, scheduler: GameScheduler,
+                                    analysis_executor: Executor) -> GameStats:
+    """
+    Play a single game on the event loop and analyze it.
+    
+    Pooled Stockfish engines are blocking, so opponent moves and adjudication
+    searches run on `settings.engine_executor` and ACPL analysis on
+    `analysis_executor`; neither uses the loop's default executor.
+    
+    Args:
+        task: Game to play
+        settings: Run-wide configuration
+        scheduler: Scheduler whose LLM request slots the player agent uses
+        analysis_executor: Threads for ACPL analysis and game logging
+    
+    Returns:
+        GameStats for the game
+    """
+    game_player_agent = OpenAIEndpointAgent(
+        base_url=settings.base_url,
+        api_key=settings.api_key,
+        max_retries=settings.max_retries,
+        template_file=settings.template_file,
+        debug=settings.debug,
+        request_slots=scheduler.async_llm_slots,
+        batcher=settings.batcher,
+        client=settings.client,
+        async_client=settings.async_client,
+        num_samples=settings.num_samples,
+    )
+    
+    opponent_agent = task.opponent_agent
+    if isinstance(opponent_agent, StockfishAgent) and settings.engine_pool is not None:
+        # Pooled engines are blocking, so their moves run on settings.engine_executor
+        game_opponent_agent = StockfishAgent(
+            depth=opponent_agent.depth,
+            skill_level=opponent_agent.skill_level,
+            time_limit_ms=opponent_agent.time_limit_ms,
+            engine_pool=settings.engine_pool,
+        )
+    elif isinstance(opponent_agent, StockfishAgent):
+        game_opponent_agent = AsyncStockfishAgent(
+            depth=opponent_agent.depth,
+            skill_level=opponent_agent.skill_level,
+            time_limit_ms=opponent_agent.time_limit_ms,
+        )
+        await game_opponent_agent.start()
+    elif isinstance(opponent_agent, RandomAgent):
+        game_opponent_agent = RandomAgent()
+    else:
+        game_opponent_agent = opponent_agent  # Fallback to shared instance
+    
+    pipeline = settings.analysis_pipeline
+    game_analysis = pipeline.start_game() if pipeline is not None else None
+    try:
+        game_result = await async_play_game(
+            game_player_agent, game_opponent_agent, task.player_color, task.game_num, settings.verbose,
+            on_position=game_analysis.add_position if game_analysis else None,
+            adjudicator=_start_adjudicator(settings, game_analysis),
+            executor=settings.engine_executor,
+        )
+    finally:
+        if hasattr(game_opponent_agent, 'aclose'):
+            await game_opponent_agent.aclose()
+        elif hasattr(game_opponent_agent, 'close'):
+            game_opponent_agent.close()
+        await game_player_agent.aclose()
+    
+    return await asyncio.get_running_loop().run_in_executor(analysis_executor, partial(
+        analyze_and_record_game,
+        task.game_num, task.num_games, task.opponent_name, task.player_color, game_result, task.timestamp,
+        acpl_depth=settings.acpl_depth, acpl_movetime_ms=settings.acpl_movetime_ms,
+        engine_pool=settings.engine_pool, game_analysis=game_analysis, eval_cache=settings.eval_cache,
+        log_store=settings.log_store, process_analyzer=settings.process_analyzer,
+        player_name=task.player,
+    ))
+
+
 def evaluate_against_opponent(
     player_agent: OpenAIEndpointAgent,
     opponent_name: str,
@@ -612,6 +1803,11 @@ def evaluate_against_opponent(
     debug: bool = False,
     acpl_depth: int = 7,
     acpl_movetime_ms: int = 1000,
+    engine_pool: Optional[EnginePool] = None,
+    analysis_pipeline: Optional[AnalysisPipeline] = None,
+    eval_cache: Optional[EvalCache] = None,
+    scheduler: Optional[GameScheduler] = None,
+    log_store: Optional[GameLogStore] = None,
 ) -> EvaluationResults:
     """
     Evaluate player agent against a specific opponent.
@@ -627,204 +1823,603 @@ def evaluate_against_opponent(
         max_retries: Max retries for creating new player agents per game
         template_file: Template file for creating new player agents per game
         debug: Debug mode for creating new player agents per game
+        acpl_depth: Stockfish depth for ACPL analysis
+        acpl_movetime_ms: Time per ACPL analysis in milliseconds
+        engine_pool: Shared Stockfish pool for opponents and analysis (optional)
+        analysis_pipeline: Analyze positions during the game instead of after it
+        eval_cache: Position-evaluation cache consulted before pooled searches
+        scheduler: Scheduler to play the games on (default: 10 games at once)
+        log_store: Append game logs to this store instead of one file per game
     
     Returns:
         EvaluationResults object with statistics
     """
-    if num_games % 2 != 0:
-        raise ValueError("num_games must be even (for equal white/black distribution)")
+    settings = GameSettings(
+        base_url=base_url or player_agent.base_url,
+        api_key=api_key or player_agent.api_key,
+        max_retries=max_retries if max_retries is not None else player_agent.max_retries,
+        template_file=template_file,
+        debug=debug,
+        verbose=verbose,
+        acpl_depth=acpl_depth,
+        acpl_movetime_ms=acpl_movetime_ms,
+        engine_pool=engine_pool,
+        analysis_pipeline=analysis_pipeline,
+        eval_cache=eval_cache,
+        log_store=log_store,
+    )
+    scheduler = scheduler or GameScheduler(max_games=10)
+    
+    # Create timestamp for this evaluation session
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    tasks = schedule_opponent_games(opponent_name, opponent_agent, num_games, timestamp)
+    
+    completed = scheduler.run(tasks, lambda task: play_scheduled_game(task, settings, scheduler))
+    return summarize_games(opponent_name, num_games, [stats for _, stats in completed])
+
+
+def _settings_from_args(args, engine_pool: Optional[EnginePool],
+                        analysis_pipeline: Optional[AnalysisPipeline],
+                        eval_cache: Optional[EvalCache],
+                        batcher: Optional[MoveBatcher] = None,
+                        client: Optional[OpenAI] = None,
+                        log_store: Optional[GameLogStore] = None,
+                        process_analyzer: Optional[ProcessAnalyzer] = None,
+                        adjudication: Optional[Adjudication] = None) -> GameSettings:
+    """Build the run-wide GameSettings from parsed command-line arguments."""
+    return GameSettings(
+        base_url=args.endpoint,
+        api_key=args.api_key,
+        max_retries=args.max_retries,
+        template_file=args.template_file,
+        debug=args.debug,
+        verbose=args.verbose,
+        acpl_depth=args.acpl_depth,
+        acpl_movetime_ms=args.acpl_movetime_ms,
+        engine_pool=engine_pool,
+        analysis_pipeline=analysis_pipeline,
+        eval_cache=eval_cache,
+        batcher=batcher,
+        client=client,
+        num_samples=args.num_samples,
+        log_store=log_store,
+        process_analyzer=process_analyzer,
+        adjudication=adjudication,
+    )
+
+
+def game_stats_from_dict(data: dict) -> GameStats:
+    """Rebuild GameStats from its asdict() form (e.g. a run-journal entry)."""
+    data = dict(data)
+    data["move_metrics"] = [MoveMetrics(**m) for m in data.get("move_metrics", [])]
+    return GameStats(**data)
+
+
+def _plan_run(opponents: List[Tuple[str, ChessAgent]], args, journal: Optional[RunJournal],
+              stopping: Optional[SPRTStopping] = None) -> Tuple[List[GameTask], List[Tuple[GameTask, GameStats]]]:
+    """
+    Split the run's games into those still to play and those already journaled.
+    
+    Journaled games are fed to the SPRT first, so opponents it has already
+    decided get no new games.
+    
+    Returns:
+        (tasks to schedule, (task, stats) pairs restored from the journal)
+    """
+    # The run id doubles as the log timestamp, so resumed games share the prefix
+    timestamp = journal.run_id if journal is not None else datetime.now().strftime("%Y%m%d_%H%M%S")
+    tasks = []
+    resumed = []
+    for opponent_name, opponent_agent in opponents:
+        for task in schedule_opponent_games(opponent_name, opponent_agent, args.games_per_opponent, timestamp):
+            stats = journal.completed.get((opponent_name, task.player_color, task.game_num)) if journal else None
+            if stats is None:
+                tasks.append(task)
+            else:
+                resumed.append((task, game_stats_from_dict(stats)))
+    if stopping is not None:
+        for task, stats in sorted(resumed, key=lambda pair: pair[0].game_num):
+            stopping.add(task, stats)
+        tasks = [task for task in tasks if not stopping.decided(task.opponent_name)]
+    if resumed:
+        print(f"\nResuming run {journal.run_id}: {len(resumed)} games restored from the journal, "
+              f"{len(tasks)} left to play")
+    return tasks, resumed
+
+
+def _result_callback(journal: Optional[RunJournal],
+                     stopping: Optional[SPRTStopping]) -> Callable[[GameTask, GameStats], None]:
+    """Scheduler on_result callback: journal the game, then update the SPRT."""
+    def on_result(task: GameTask, stats: GameStats):
+        if journal is not None:
+            journal.record_game(task.opponent_name, task.player_color, task.game_num, asdict(stats))
+        if stopping is not None:
+            stopping.add(task, stats)
+    
+    return on_result
+
+
+def _group_results(opponents: List[Tuple[str, ChessAgent]], num_games: int,
+                   completed: List[Tuple[GameTask, GameStats]],
+                   stopping: Optional[SPRTStopping] = None) -> List[EvaluationResults]:
+    """Summarize completed games per opponent, in the order opponents were given."""
+    stats_by_opponent: Dict[str, List[GameStats]] = {name: [] for name, _ in opponents}
+    for task, stats in completed:
+        stats_by_opponent[task.opponent_name].append(stats)
+    results = []
+    for name, _ in opponents:
+        games = stats_by_opponent[name]
+        if stopping is not None and stopping.decided(name):
+            # Stopped early: report over the games actually played
+            result = summarize_games(name, len(games), games)
+        else:
+            result = summarize_games(name, num_games, games)
+        if stopping is not None:
+            result.sprt = stopping.test(name).summary()
+        results.append(result)
+    return results
+
+
+def evaluate_all(opponents: List[Tuple[str, ChessAgent]], args, scheduler: GameScheduler,
+                 engine_pool: Optional[EnginePool] = None,
+                 analysis_pipeline: Optional[AnalysisPipeline] = None,
+                 eval_cache: Optional[EvalCache] = None,
+                 batcher: Optional[MoveBatcher] = None,
+                 client: Optional[OpenAI] = None,
+                 journal: Optional[RunJournal] = None,
+                 stopping: Optional[SPRTStopping] = None,
+                 log_store: Optional[GameLogStore] = None,
+                 process_analyzer: Optional[ProcessAnalyzer] = None,
+                 adjudication: Optional[Adjudication] = None) -> List[EvaluationResults]:
+    """
+    Evaluate against all opponents with every game on one scheduler.
+    
+    Args:
+        opponents: (name, opponent template agent) pairs
+        args: Parsed command-line arguments
+        scheduler: Scheduler bounding games and LLM requests in flight
+        engine_pool: Shared Stockfish pool (optional)
+        analysis_pipeline: Pipelined ACPL analysis (optional)
+        eval_cache: Position-evaluation cache (optional)
+        batcher: Cross-game request batcher (optional)
+        client: Run-wide OpenAI client shared by all games (optional)
+        journal: Run journal; completed games are recorded in it and games
+            already in it are not played again (optional)
+        stopping: SPRT early stopping per opponent (optional)
+        log_store: Append game logs to this store instead of one file per game (optional)
+        process_analyzer: Whole-game ACPL analysis in worker processes (optional)
+        adjudication: End decided games early (optional)
+    
+    Returns:
+        EvaluationResults for each opponent
+    """
+    settings = _settings_from_args(args, engine_pool, analysis_pipeline, eval_cache, batcher, client, log_store,
+                                   process_analyzer, adjudication)
+    tasks, resumed = _plan_run(opponents, args, journal, stopping)
+    
+    try:
+        completed = scheduler.run(tasks, lambda task: play_scheduled_game(task, settings, scheduler),
+                                  on_result=_result_callback(journal, stopping))
+    finally:
+        # The template agents only carry configuration; games use their own engines
+        for _, opponent_agent in opponents:
+            if hasattr(opponent_agent, 'close'):
+                opponent_agent.close()
+    return _group_results(opponents, args.games_per_opponent, resumed + completed, stopping)
+
+
+async def async_evaluate_all(opponents: List[Tuple[str, ChessAgent]], args, scheduler: GameScheduler,
+                             engine_pool: Optional[EnginePool] = None,
+                             analysis_pipeline: Optional[AnalysisPipeline] = None,
+                             eval_cache: Optional[EvalCache] = None,
+                             batcher: Optional[MoveBatcher] = None,
+                             client: Optional[OpenAI] = None,
+                             journal: Optional[RunJournal] = None,
+                             stopping: Optional[SPRTStopping] = None,
+                             log_store: Optional[GameLogStore] = None,
+                             process_analyzer: Optional[ProcessAnalyzer] = None,
+                             adjudication: Optional[Adjudication] = None) -> List[EvaluationResults]:
+    """
+    Evaluate against all opponents with every game on the running event loop.
+    
+    The scheduler bounds games and LLM requests in flight across all
+    opponents. With an engine pool, opponent moves and adjudication searches
+    run on a thread pool with one thread per pool engine, and ACPL analyses
+    on a separate one capped at the CPU count, so hundreds of games on the
+    loop do not queue behind the loop's small default executor.
+    
+    Args:
+        opponents: (name, opponent template agent) pairs
+        args: Parsed command-line arguments
+        scheduler: Scheduler bounding games and LLM requests in flight
+        engine_pool: Shared Stockfish pool (optional)
+        analysis_pipeline: Pipelined ACPL analysis (optional)
+        eval_cache: Position-evaluation cache (optional)
+        batcher: Cross-game request batcher (optional)
+        client: Run-wide OpenAI client shared by all games (optional)
+        journal: Run journal; completed games are recorded in it and games
+            already in it are not played again (optional)
+        stopping: SPRT early stopping per opponent (optional)
+        log_store: Append game logs to this store instead of one file per game (optional)
+        process_analyzer: Whole-game ACPL analysis in worker processes (optional)
+        adjudication: End decided games early (optional)
+    
+    Returns:
+        EvaluationResults for each opponent
+    """
+    settings = _settings_from_args(args, engine_pool, analysis_pipeline, eval_cache, batcher, client, log_store,
+                                   process_analyzer, adjudication)
+    if engine_pool is not None:
+        settings.engine_executor = ThreadPoolExecutor(max_workers=engine_pool.size, thread_name_prefix="engine")
+    analysis_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="analysis")
+    tasks, resumed = _plan_run(opponents, args, journal, stopping)
+    
+    # Created here so its connection pool lives on this event loop
+    settings.async_client = create_async_client(args.endpoint, args.api_key, max_connections=args.max_connections,
+                                                http2=args.http2)
+    try:
+        completed = await scheduler.arun(
+            tasks, lambda task: async_play_scheduled_game(task, settings, scheduler, analysis_executor),
+            on_result=_result_callback(journal, stopping))
+    finally:
+        await settings.async_client.close()
+        analysis_executor.shutdown(wait=True)
+        if settings.engine_executor is not None:
+            settings.engine_executor.shutdown(wait=True)
+        for _, opponent_agent in opponents:
+            if hasattr(opponent_agent, 'close'):
+                opponent_agent.close()
+    return _group_results(opponents, args.games_per_opponent, resumed + completed, stopping)
+
+
+def evaluate_suite(positions: List[dict], args, engine_pool: EnginePool,
+                   eval_cache: Optional[EvalCache] = None,
+                   batcher: Optional[MoveBatcher] = None,
+                   client: Optional[OpenAI] = None) -> List[PositionResult]:
+    """
+    Ask the endpoint for one move in every suite position and score the moves.
+    
+    Every position is independent, so up to --max-games requests are in flight
+    at once. Stockfish reference lines are computed on the engine pool while the
+    endpoint is answering.
+    
+    Args:
+        positions: Suite positions from load_suite
+        args: Parsed command-line arguments
+        engine_pool: Shared Stockfish pool for the reference analysis
+        eval_cache: Cache of reference lines and evaluations (optional)
+        batcher: Cross-request batcher (optional)
+        client: Run-wide OpenAI client (optional)
+    
+    Returns:
+        PositionResult for each position, in suite order
+    """
+    references = SuiteReferences(engine_pool, depth=args.acpl_depth, movetime_ms=args.acpl_movetime_ms,
+                                 cache=eval_cache)
+    request_slots = threading.BoundedSemaphore(args.max_llm_requests) if args.max_llm_requests else None
+    progress_lock = threading.Lock()
+    done = [0]
+    
+    with ThreadPoolExecutor(max_workers=engine_pool.size, thread_name_prefix="suite-ref") as reference_executor:
+        lines = [reference_executor.submit(references.lines, chess.Board(position["fen"]))
+                 for position in positions]
+        
+        def solve(index: int) -> PositionResult:
+            position = positions[index]
+            board = chess.Board(position["fen"])
+            agent = OpenAIEndpointAgent(
+                base_url=args.endpoint,
+                api_key=args.api_key,
+                max_retries=args.max_retries,
+                template_file=args.template_file,
+                debug=args.debug,
+                request_slots=request_slots,
+                batcher=batcher,
+                client=client,
+                num_samples=args.num_samples,
+            )
+            try:
+                side_to_move = "White" if board.turn == chess.WHITE else "Black"
+                move, _ = agent.choose_move(board, list(board.legal_moves), [], side_to_move)
+            finally:
+                agent.close()
+            metrics = agent.move_metrics[-1]
+            result = PositionResult(
+                fen=position["fen"],
+                phase=position["phase"],
+                move=move.uci() if move is not None else None,
+                legal_first_try=move is not None and metrics.retries == 0,
+                attempts=metrics.retries + 1,
+                repair=metrics.repair,
+                latency_s=metrics.total_s,
+            )
+            references.score(result, lines[index].result())
+            with progress_lock:
+                done[0] += 1
+                if args.verbose or done[0] % max(1, len(positions) // 10) == 0:
+                    print(f"  {done[0]}/{len(positions)} positions")
+            return result
+        
+        with ThreadPoolExecutor(max_workers=args.max_games, thread_name_prefix="suite") as executor:
+            return list(executor.map(solve, range(len(positions))))
+
+
+def save_suite_log(suite_path: str, results: List[PositionResult], summary: Dict[str, dict],
+                   timestamp: str) -> str:
+    """
+    Save suite results to a JSON file in the logs/ directory.
+    
+    Args:
+        suite_path: Path of the position suite
+        results: Per-position results
+        summary: Aggregates from summarize_suite
+        timestamp: Timestamp string for the log filename
+    
+    Returns:
+        Path of the written file
+    """
+    logs_dir = os.path.join(os.path.dirname(__file__), "logs")
+    os.makedirs(logs_dir, exist_ok=True)
+    filepath = os.path.join(logs_dir, f"suite_{timestamp}.json")
+    with open(filepath, 'w') as f:
+        json.dump({
+            "timestamp": timestamp,
+            "suite": suite_path,
+            "summary": summary,
+            "positions": [asdict(r) for r in results],
+        }, f, indent=2)
+    return filepath
+
+
+def print_suite_results(summary: Dict[str, dict], elapsed: float):
+    """Print position-suite results, overall and per game phase."""
+    print("\n" + "="*70)
+    print(" "*20 + "POSITION SUITE RESULTS")
+    print("="*70)
+    
+    for name, stats in sorted(summary.items(), key=lambda item: item[0] != "all"):
+        print(f"{'Overall' if name == 'all' else name.capitalize()}:")
+        print(f"  Positions:       {stats['positions']}")
+        print(f"  Legal (1st try): {stats['legal_first_try']*100:.1f}%")
+        print(f"  Legal (retries): {stats['legal']*100:.1f}%")
+        print(f"  Repaired:        {stats['repaired']*100:.1f}% (fixed locally, see move_repair)")
+        print(f"  Centipawn loss:  mean {stats['mean_cp_loss']:.1f}, median {stats['median_cp_loss']:.1f} "
+              f"({stats['scored']} moves scored)")
+        print(f"  Top-1 agreement: {stats['top1']*100:.1f}%")
+        print(f"  Top-3 agreement: {stats['top3']*100:.1f}%")
+    
+    positions = summary["all"]["positions"] if "all" in summary else 0
+    print(f"\n  {positions} positions in {elapsed:.1f}s "
+          f"({positions / elapsed if elapsed > 0 else 0:.1f} positions/s)")
+    print(f"{'='*70}\n")
+
+
+def run_position_suite(args, engine_pool: EnginePool, eval_cache: Optional[EvalCache] = None):
+    """Run --suite: score the endpoint's moves on a fixed position suite instead of playing games."""
+    try:
+        positions = load_suite(args.suite)
+    except (OSError, ValueError) as e:
+        print(f"\nError: cannot read position suite: {e}")
+        sys.exit(1)
+    print(f"\nPosition suite: {len(positions)} positions from {args.suite}")
+    
+    client = create_client(args.endpoint, args.api_key, max_connections=args.max_connections, http2=args.http2)
+    batcher = None
+    if args.batch_window_ms > 0:
+        batcher = MoveBatcher(args.endpoint, api_key=args.api_key, window_ms=args.batch_window_ms,
+                              max_batch_size=args.max_batch_size, client=client)
+    
+    start = time.time()
+    try:
+        results = evaluate_suite(positions, args, engine_pool, eval_cache, batcher, client)
+    finally:
+        if batcher is not None:
+            batcher.close()
+            print(batcher.summary())
+        client.close()
+        print(f"Engine pool: {engine_pool.spawns} Stockfish processes served {engine_pool.leases} leases")
+        engine_pool.close()
+        if eval_cache is not None:
+            print(eval_cache.summary())
+    elapsed = time.time() - start
+    
+    summary = summarize_suite(results)
+    filepath = save_suite_log(args.suite, results, summary, datetime.now().strftime("%Y%m%d_%H%M%S"))
+    print(f"Suite results saved to {filepath}")
+    print_suite_results(summary, elapsed)
+
+
+def schedule_tournament(endpoints: List[Tuple[str, OpenAIEndpointAgent]], opponents: List[Tuple[str, ChessAgent]],
+                        num_games: int, timestamp: str) -> List[GameTask]:
+    """
+    Create every game of a round-robin between endpoints and opponents.
+    
+    Each endpoint plays `num_games` against every later endpoint and against
+    every opponent, half as white and half as black. Pairings are interleaved
+    so games against every endpoint start right away.
     
-    print(f"\n{'='*70}")
-    print(f"EVALUATING AGAINST: {opponent_name}")
-    print(f"{'='*70}")
-    print(f"Playing {num_games} games ({num_games//2} as white, {num_games//2} as black)")
+    Args:
+        endpoints: (label, template agent) per endpoint
+        opponents: (name, opponent template agent) pairs
+        num_games: Games per pairing (must be even)
+        timestamp: Tournament timestamp (for log filenames)
     
-    # Create timestamp for this evaluation session
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    Returns:
+        List of GameTask, with `player` set to the endpoint label
+    """
+    pairings = []
+    for i, (label, _) in enumerate(endpoints):
+        pairings.extend((label, other_label, other_agent) for other_label, other_agent in endpoints[i + 1:])
+        pairings.extend((label, name, agent) for name, agent in opponents)
     
     games_per_color = num_games // 2
+    rounds: List[List[GameTask]] = []
+    for label, opponent_name, opponent_agent in pairings:
+        tasks = []
+        for i in range(games_per_color):
+            tasks.append(GameTask(opponent_name, opponent_agent, "white", i + 1, num_games, timestamp, player=label))
+            tasks.append(GameTask(opponent_name, opponent_agent, "black", games_per_color + i + 1, num_games,
+                                  timestamp, player=label))
+        rounds.append(tasks)
+    print(f"\nTournament: {len(pairings)} pairings x {num_games} games "
+          f"({len(endpoints)} endpoints + {len(opponents)} engine opponents)")
+    return [task for game in range(num_games) for tasks in rounds for task in tasks[game:game + 1]]
+
+
+def evaluate_tournament(endpoints: List[Tuple[str, str]], opponents: List[Tuple[str, ChessAgent]], args,
+                        scheduler: GameScheduler, engine_pool: Optional[EnginePool] = None,
+                        analysis_pipeline: Optional[AnalysisPipeline] = None,
+                        eval_cache: Optional[EvalCache] = None,
+                        log_store: Optional[GameLogStore] = None,
+                        process_analyzer: Optional[ProcessAnalyzer] = None,
+                        timestamp: Optional[str] = None,
+                        adjudication: Optional[Adjudication] = None) -> Tuple[List[EvaluationResults], Crosstable]:
+    """
+    Play a round-robin between several endpoints and the opponents on one scheduler.
     
-    def play_and_analyze_game(game_num: int, player_color: str):
-        """Play a single game and analyze it."""
-        # Create a fresh player agent for this game
-        game_player_agent = OpenAIEndpointAgent(
-            base_url=base_url,
-            api_key=api_key,
-            max_retries=max_retries,
-            template_file=template_file,
-            debug=debug
-        )
-        
-        # Create a fresh opponent agent for this game (especially important for Stockfish)
-        if isinstance(opponent_agent, StockfishAgent):
-            game_opponent_agent = StockfishAgent(
-                depth=opponent_agent.depth if hasattr(opponent_agent, 'depth') else 1,
-                skill_level=opponent_agent.skill_level if hasattr(opponent_agent, 'skill_level') else 0
-            )
-        elif isinstance(opponent_agent, RandomAgent):
-            game_opponent_agent = RandomAgent()
-        else:
-            game_opponent_agent = opponent_agent  # Fallback to shared instance
-        
-        try:
-            game_result = play_game(game_player_agent, game_opponent_agent, player_color, game_num, verbose)
-            
-            # Analyze ACPL - create a new analyzer for each game since it closes after analyze_game
-            white_acpl = 0.0
-            black_acpl = 0.0
-            if len(game_result["move_history"]) > 0:
-                try:
-                    # Use a strong Stockfish instance for ACPL analysis
-                    analyzer = _StockfishAnalyzer(depth=acpl_depth, movetime_ms=acpl_movetime_ms)
-                    acpl_result = analyzer.analyze_game(game_result["move_history"])
-                    white_acpl = acpl_result["white_acpl"]
-                    black_acpl = acpl_result["black_acpl"]
-                except Exception as e:
-                    print(f"Warning: ACPL analysis failed for game {game_num}: {e}")
-            
-            stats = GameStats(
-                result=game_result["result"],
-                moves_played=game_result["moves_played"],
-                white_time=game_result["white_time"],
-                black_time=game_result["black_time"],
-                white_acpl=white_acpl,
-                black_acpl=black_acpl,
-                player_color=player_color
-            )
-            
-            # Save game log
-            log_path = save_game_log(
-                game_num=game_num,
-                opponent_name=opponent_name,
-                player_color=player_color,
-                game_result=game_result,
-                white_acpl=white_acpl,
-                black_acpl=black_acpl,
-                timestamp=timestamp
-            )
-            
-            player_acpl = white_acpl if player_color == "white" else black_acpl
-            player_time = game_result['white_time'] if player_color == "white" else game_result['black_time']
-            
-            print(f"✓ Game {game_num}/{num_games} ({player_color}): {game_result['result']} "
-                  f"in {game_result['moves_played']} moves "
-                  f"(Player ACPL: {player_acpl:.1f}, Time: {player_time:.2f}s)")
-            
-            return stats
-        finally:
-            # Clean up the game-specific opponent agent
-            if hasattr(game_opponent_agent, 'close'):
-                game_opponent_agent.close()
+    Every endpoint gets its own connection pool, request cap
+    (--max-llm-requests) and batcher, so a slow endpoint does not hold up the
+    others; Stockfish engines, ACPL analysis and the evaluation cache are
+    shared by all games.
     
-    # Play all games in parallel
-    game_stats = []
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        # Submit all games
-        futures = []
-        
-        # Games as white
-        for i in range(games_per_color):
-            game_num = i + 1
-            future = executor.submit(play_and_analyze_game, game_num, "white")
-            futures.append(future)
-        
-        # Games as black
-        for i in range(games_per_color):
-            game_num = games_per_color + i + 1
-            future = executor.submit(play_and_analyze_game, game_num, "black")
-            futures.append(future)
-        
-        # Collect results
-        for future in as_completed(futures):
-            try:
-                stats = future.result()
-                game_stats.append(stats)
-            except Exception as e:
-                print(f"Error in game execution: {e}")
-                import traceback
-                traceback.print_exc()
+    Args:
+        endpoints: (label, base URL) per endpoint
+        opponents: (name, opponent template agent) pairs
+        args: Parsed command-line arguments
+        scheduler: Scheduler bounding games in flight
+        engine_pool: Shared Stockfish pool (optional)
+        analysis_pipeline: Pipelined ACPL analysis (optional)
+        eval_cache: Position-evaluation cache (optional)
+        log_store: Append game logs to this store instead of one file per game (optional)
+        process_analyzer: Whole-game ACPL analysis in worker processes (optional)
+        timestamp: Tournament timestamp (log run ID; default: now)
+        adjudication: End decided games early (optional)
     
-    # Calculate statistics
-    wins = 0
-    draws = 0
-    losses = 0
-    total_acpl = 0.0
-    total_time = 0.0
-    total_moves = 0
+    Returns:
+        (EvaluationResults per pairing, crosstable of all games)
+    """
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    base_settings = _settings_from_args(args, engine_pool, analysis_pipeline, eval_cache, log_store=log_store,
+                                        process_analyzer=process_analyzer, adjudication=adjudication)
+    settings: Dict[str, GameSettings] = {}
+    agents: List[Tuple[str, OpenAIEndpointAgent]] = []
+    for label, url in endpoints:
+        client = create_client(url, args.api_key, max_connections=args.max_connections, http2=args.http2)
+        batcher = None
+        if args.batch_window_ms > 0:
+            batcher = MoveBatcher(url, api_key=args.api_key, window_ms=args.batch_window_ms,
+                                  max_batch_size=args.max_batch_size, client=client)
+        slots = threading.BoundedSemaphore(args.max_llm_requests or args.max_games)
+        settings[label] = replace(base_settings, base_url=url, client=client, batcher=batcher, request_slots=slots)
+        # Template for games where this endpoint is the opponent
+        agents.append((label, OpenAIEndpointAgent(
+            base_url=url, api_key=args.api_key, max_retries=args.max_retries, template_file=args.template_file,
+            debug=args.debug, request_slots=slots, batcher=batcher, client=client, num_samples=args.num_samples,
+        )))
     
-    for stats in game_stats:
-        result = stats.result
-        
-        # Determine outcome from player's perspective
-        if stats.player_color == "white":
-            if "White wins" in result:
-                wins += 1
-            elif "Black wins" in result:
-                losses += 1
-            else:
-                draws += 1
-            total_acpl += stats.white_acpl
-            total_time += stats.white_time * stats.moves_played / 2  # Approximate
-        else:
-            if "Black wins" in result:
-                wins += 1
-            elif "White wins" in result:
-                losses += 1
-            else:
-                draws += 1
-            total_acpl += stats.black_acpl
-            total_time += stats.black_time * stats.moves_played / 2  # Approximate
-        
-        total_moves += stats.moves_played
+    tasks = schedule_tournament(agents, opponents, args.games_per_opponent, timestamp)
+    try:
+        completed = scheduler.run(tasks, lambda task: play_scheduled_game(task, settings[task.player], scheduler))
+    finally:
+        for label, agent in agents:
+            if agent.batcher is not None:
+                agent.batcher.close()
+                print(f"{label}: {agent.batcher.summary()}")
+            agent.client.close()
+        for _, opponent_agent in opponents:
+            if hasattr(opponent_agent, 'close'):
+                opponent_agent.close()
     
-    avg_acpl = total_acpl / len(game_stats) if game_stats else 0.0
-    avg_time = total_time / total_moves if total_moves > 0 else 0.0
+    table = Crosstable()
+    games: Dict[Tuple[str, str], List[GameStats]] = {}
+    for task, stats in completed:
+        score = player_score(stats)
+        if task.player_color == "white":
+            table.add(task.player, task.opponent_name, score)
+        else:
+            table.add(task.opponent_name, task.player, 1.0 - score)
+        games.setdefault((task.player, task.opponent_name), []).append(stats)
     
-    return EvaluationResults(
-        opponent_name=opponent_name,
-        total_games=num_games,
-        wins=wins,
-        draws=draws,
-        losses=losses,
-        avg_acpl=avg_acpl,
-        avg_time_per_move=avg_time,
-        games=game_stats
-    )
+    results = []
+    for (label, opponent_name), pairing_games in games.items():
+        result = summarize_games(opponent_name, args.games_per_opponent, pairing_games)
+        result.player_name = label
+        results.append(result)
+    return results, table
 
 
-def print_results(results: List[EvaluationResults]):
-    """Print evaluation results in a nice format."""
-    print("\n" + "="*70)
-    print(" "*20 + "EVALUATION RESULTS")
-    print("="*70)
+def save_tournament_log(endpoints: List[Tuple[str, str]], results: List[EvaluationResults], table: Crosstable,
+                        anchor: Optional[str], timestamp: str) -> str:
+    """
+    Save the tournament's pairings, crosstable and ratings to logs/tournament_<timestamp>.json.
     
-    for result in results:
-        print(f"Player vs {result.opponent_name}:")
-        print(f"  Games Played:    {result.total_games}")
-        print(f"  Wins:            {result.wins} ({result.wins/result.total_games*100:.1f}%)")
-        print(f"  Draws:           {result.draws} ({result.draws/result.total_games*100:.1f}%)")
-        print(f"  Losses:          {result.losses} ({result.losses/result.total_games*100:.1f}%)")
-        print(f"  Average ACPL:    {result.avg_acpl:.2f}")
-        print(f"  Avg Time/Move:   {result.avg_time_per_move:.3f}s")
+    Returns:
+        Path of the written file
+    """
+    logs_dir = os.path.join(os.path.dirname(__file__), "logs")
+    os.makedirs(logs_dir, exist_ok=True)
+    fit = bayeselo(table, anchor=anchor)
+    data = {
+        "timestamp": timestamp,
+        "endpoints": dict(endpoints),
+        "pairings": [
+            {"player": r.player_name, "opponent": r.opponent_name, "wins": r.wins, "draws": r.draws,
+             "losses": r.losses, "player_acpl": r.avg_acpl,
+             "elo": pairwise_elo(r.wins, r.draws, r.losses)}
+            for r in results
+        ],
+        "crosstable": [{"white": white, "black": black, "white_wins": counts[0], "draws": counts[1],
+                        "black_wins": counts[2]} for (white, black), counts in table.games.items()],
+        "bayeselo": {"anchor": anchor, "advantage": fit["advantage"], "draw_elo": fit["draw_elo"],
+                     "ratings": fit["ratings"]},
+    }
+    filepath = os.path.join(logs_dir, f"tournament_{timestamp}.json")
+    with open(filepath, "w") as f:
+        json.dump(data, f, indent=2)
+    return filepath
+
+
+def run_tournament(endpoints: List[Tuple[str, str]], opponents: List[Tuple[str, ChessAgent]], args,
+                   engine_pool: Optional[EnginePool] = None,
+                   analysis_pipeline: Optional[AnalysisPipeline] = None,
+                   eval_cache: Optional[EvalCache] = None,
+                   process_analyzer: Optional[ProcessAnalyzer] = None,
+                   adjudication: Optional[Adjudication] = None):
+    """Run a tournament between several --endpoint values and the opponents, then rate everyone."""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    logs_dir = os.path.join(os.path.dirname(__file__), "logs")
+    log_store = GameLogStore(logs_dir) if args.log_format == "jsonl" else None
+    scheduler = GameScheduler(max_games=args.max_games, max_llm_requests=args.max_llm_requests)
+    # Ratings are relative to the first Stockfish opponent when there is one
+    anchor = opponents[0][0] if opponents else endpoints[0][0]
     
-    # Overall statistics
-    total_games = sum(r.total_games for r in results)
-    total_wins = sum(r.wins for r in results)
-    total_draws = sum(r.draws for r in results)
-    total_losses = sum(r.losses for r in results)
-    overall_acpl = sum(r.avg_acpl * r.total_games for r in results) / total_games if total_games > 0 else 0
-    overall_time = sum(r.avg_time_per_move * r.total_games for r in results) / total_games if total_games > 0 else 0
+    start = time.time()
+    try:
+        results, table = evaluate_tournament(endpoints, opponents, args, scheduler, engine_pool, analysis_pipeline,
+                                             eval_cache, log_store, process_analyzer, timestamp, adjudication)
+    finally:
+        if adjudication is not None:
+            adjudication.close()
+        if analysis_pipeline is not None:
+            analysis_pipeline.close()
+        if process_analyzer is not None:
+            process_analyzer.close()
+        if engine_pool is not None:
+            print(f"Engine pool: {engine_pool.spawns} Stockfish processes served {engine_pool.leases} leases")
+            engine_pool.close()
+        if eval_cache is not None:
+            print(eval_cache.summary())
+    elapsed = time.time() - start
     
-    print(f"\n{'='*70}")
-    print(" "*25 + "OVERALL")
-    print(f"{'='*70}")
-    print(f"  Total Games:     {total_games}")
-    print(f"  Total Wins:      {total_wins} ({total_wins/total_games*100:.1f}%)")
-    print(f"  Total Draws:     {total_draws} ({total_draws/total_games*100:.1f}%)")
-    print(f"  Total Losses:    {total_losses} ({total_losses/total_games*100:.1f}%)")
-    print(f"  Overall ACPL:    {overall_acpl:.2f}")
-    print(f"  Overall Time:    {overall_time:.3f}s per move")
-    print(f"{'='*70}\n")
+    if log_store is not None:
+        print(f"Game logs: {os.path.join(logs_dir, timestamp + '.games.jsonl')}")
+    filepath = save_tournament_log(endpoints, results, table, anchor, timestamp)
+    print(f"Tournament results saved to {filepath}")
+    games = sum(len(r.games) for r in results)
+    print(f"{games} games in {elapsed:.1f}s ({games / elapsed if elapsed > 0 else 0:.2f} games/s)")
+    if results:
+        print_results(results)
+    print_tournament(table, [label for label, _ in endpoints], anchor=anchor)
 
 
 def main():
@@ -835,8 +2430,11 @@ def main():
     parser.add_argument(
         "--endpoint",
         type=str,
-        default="http://localhost:5000/v1",
-        help="Base URL of the OpenAI-compatible API endpoint"
+        action="append",
+        default=None,
+        help="Base URL of the OpenAI-compatible API endpoint (default: http://localhost:5000/v1). "
+             "Give it several times (optionally as LABEL=URL) to play a round-robin tournament "
+             "between the endpoints and the Stockfish opponents and rate them"
     )
     parser.add_argument(
         "--api-key",
@@ -896,31 +2494,274 @@ def main():
         default=1000,
         help="Time per ACPL analysis in milliseconds (default: 1000)",
     )
+    parser.add_argument(
+        "--async",
+        dest="async_mode",
+        action="store_true",
+        help="Play all games on one asyncio event loop (AsyncOpenAI; pooled Stockfish searches run "
+             "on one thread per pool engine, async Stockfish with --engine-pool-size 0)",
+    )
+    parser.add_argument(
+        "--max-games",
+        "--concurrency",
+        dest="max_games",
+        type=int,
+        default=64,
+        help="Maximum games in flight at once, across all opponents (default: 64)",
+    )
+    parser.add_argument(
+        "--max-llm-requests",
+        type=int,
+        default=None,
+        help="Maximum chat-completion requests in flight at once (default: --max-games)",
+    )
+    parser.add_argument(
+        "--sprt",
+        type=float,
+        nargs=2,
+        default=None,
+        metavar=("ELO0", "ELO1"),
+        help="Stop playing an opponent once an SPRT of H0: Elo <= ELO0 vs H1: Elo >= ELO1 "
+             "(player vs opponent) decides; queued games are cancelled",
+    )
+    parser.add_argument(
+        "--sprt-alpha",
+        type=float,
+        default=0.05,
+        help="SPRT false-positive rate (accepting H1 when H0 holds; default: 0.05)",
+    )
+    parser.add_argument(
+        "--sprt-beta",
+        type=float,
+        default=0.05,
+        help="SPRT false-negative rate (accepting H0 when H1 holds; default: 0.05)",
+    )
+    parser.add_argument(
+        "--resume",
+        type=str,
+        default=None,
+        metavar="RUN_ID",
+        help="Resume an interrupted run: play only the games missing from runs/<RUN_ID>.jsonl "
+             "and report results over all of them",
+    )
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=None,
+        help="Keep-alive HTTP connections shared by all games (default: --max-llm-requests)",
+    )
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        help="Use HTTP/2 to the endpoint (needs the 'h2' package and an HTTP/2-capable backend)",
+    )
+    parser.add_argument(
+        "--num-samples",
+        type=int,
+        default=1,
+        help="Completions per move request (OpenAI `n`, one shared prefill); the most frequent legal "
+             "move is played and the other samples replace retries (default: 1; use a sampling temperature)",
+    )
+    parser.add_argument(
+        "--batch-window-ms",
+        type=float,
+        default=0,
+        help="Collect move requests from all games for this many milliseconds and send them "
+             "as one batched request (e.g. 5-20; default: 0, one request per move)",
+    )
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=64,
+        help="Maximum move requests per batch with --batch-window-ms (default: 64); keep it at or below "
+             "the server's --max-queue (256 for the servers in player_agents/), larger batches are refused",
+    )
+    parser.add_argument(
+        "--engine-pool-size",
+        "--max-engine-searches",
+        dest="engine_pool_size",
+        type=int,
+        default=os.cpu_count() or 4,
+        help="Long-lived Stockfish processes shared by opponents and ACPL analysis, i.e. the "
+             "maximum engine searches in flight (default: CPU count; 0 spawns fresh engines per game)",
+    )
+    parser.add_argument(
+        "--engine-threads",
+        type=int,
+        default=1,
+        help="Stockfish Threads option for pooled engines (default: 1)",
+    )
+    parser.add_argument(
+        "--engine-hash",
+        type=int,
+        default=16,
+        help="Stockfish Hash option in MB for pooled engines (default: 16)",
+    )
+    parser.add_argument(
+        "--acpl-pipeline",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Analyze each position on idle pool engines while the game is played "
+             "instead of after it ends (requires the engine pool; default: enabled)",
+    )
+    parser.add_argument(
+        "--acpl-processes",
+        type=int,
+        default=0,
+        help="Analyze finished games in this many worker processes, each with its own Stockfish, "
+             "instead of on threads (replaces the ACPL pipeline; default: 0, threads)",
+    )
+    parser.add_argument(
+        "--eval-cache",
+        type=str,
+        default=DEFAULT_CACHE_PATH,
+        help="SQLite file caching ACPL position evaluations across games and runs "
+             "(used with the engine pool; default: eval_cache.sqlite3 next to this script)",
+    )
+    parser.add_argument(
+        "--adjudicate-resign",
+        type=int,
+        default=None,
+        metavar="CP",
+        help="End a game as won once the ACPL engine's eval stays at or beyond +-CP centipawns "
+             "for --resign-plies plies (e.g. 800; needs the engine pool; default: off)",
+    )
+    parser.add_argument(
+        "--resign-plies",
+        type=int,
+        default=8,
+        help="Consecutive plies for --adjudicate-resign (default: 8)",
+    )
+    parser.add_argument(
+        "--adjudicate-draw",
+        type=int,
+        default=None,
+        metavar="CP",
+        help="End a game as drawn once |eval| stays within CP centipawns for --draw-plies plies "
+             "after move --draw-after-move (e.g. 10; needs the engine pool; default: off)",
+    )
+    parser.add_argument(
+        "--draw-plies",
+        type=int,
+        default=8,
+        help="Consecutive plies for --adjudicate-draw (default: 8)",
+    )
+    parser.add_argument(
+        "--draw-after-move",
+        type=int,
+        default=40,
+        help="First full move from which --adjudicate-draw applies (default: 40)",
+    )
+    parser.add_argument(
+        "--tablebase",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Adjudicate positions with at most --tablebase-pieces pieces by these Syzygy tablebases",
+    )
+    parser.add_argument(
+        "--tablebase-pieces",
+        type=int,
+        default=5,
+        help="Maximum pieces for tablebase adjudication (default: 5)",
+    )
+    parser.add_argument(
+        "--log-format",
+        choices=["jsonl", "files"],
+        default="jsonl",
+        help="Game logs as one line per game in logs/<run-id>.games.jsonl, indexed in "
+             "logs/index.sqlite3 (default), or as one indented JSON file per game",
+    )
+    parser.add_argument(
+        "--suite",
+        type=str,
+        default=None,
+        metavar="POSITIONS_JSONL",
+        help="Instead of playing games, ask for one move in every position of this suite "
+             "(generate_positions.py format) and report centipawn loss, top-1/top-3 agreement "
+             "with Stockfish and legality rate",
+    )
+    parser.add_argument(
+        "--no-eval-cache",
+        action="store_true",
+        help="Always search positions instead of consulting the evaluation cache",
+    )
     
     args = parser.parse_args()
+    args.max_connections = args.max_connections or args.max_llm_requests or args.max_games
+    try:
+        endpoints = parse_endpoints(args.endpoint or ["http://localhost:5000/v1"])
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    args.endpoint = endpoints[0][1]
     
     # Validate arguments
     if args.games_per_opponent % 2 != 0:
         print("Error: --games-per-opponent must be even")
         sys.exit(1)
+    if args.sprt and args.sprt[1] <= args.sprt[0]:
+        print("Error: --sprt needs ELO0 < ELO1")
+        sys.exit(1)
+    if args.num_samples < 1:
+        print("Error: --num-samples must be at least 1")
+        sys.exit(1)
+    if args.suite and args.engine_pool_size <= 0:
+        print("Error: --suite needs the engine pool (--engine-pool-size > 0)")
+        sys.exit(1)
+    if (args.adjudicate_resign is not None or args.adjudicate_draw is not None) and args.engine_pool_size <= 0:
+        print("Error: --adjudicate-resign/--adjudicate-draw need the engine pool (--engine-pool-size > 0)")
+        sys.exit(1)
+    if len(endpoints) > 1 and (args.async_mode or args.sprt or args.resume or args.suite):
+        print("Error: a tournament (several --endpoint values) cannot be combined with "
+              "--async, --sprt, --resume or --suite")
+        sys.exit(1)
     
     print("="*70)
     print(" "*20 + "CHESS AGENT EVALUATION")
     print("="*70)
-    print(f"Endpoint:            {args.endpoint}")
+    if len(endpoints) > 1:
+        print(f"Tournament:          {', '.join(f'{label} ({url})' for label, url in endpoints)}")
+    else:
+        print(f"Endpoint:            {args.endpoint}")
     print(f"Games per opponent:  {args.games_per_opponent}")
     print(f"Max retries:         {args.max_retries}")
+    print(f"Samples per request: {args.num_samples}")
     print(f"ACPL analysis:       Enabled")
     print(f"Stockfish depth:     {args.stockfish_depth}")
     print(f"Stockfish skill:     {args.stockfish_skill}")
     print(f"ACPL Stockfish depth:{args.acpl_depth}")
     print(f"ACPL movetime (ms):  {args.acpl_movetime_ms}")
+    print(f"Engine pool:         {f'{args.engine_pool_size} engines' if args.engine_pool_size > 0 else 'Disabled'}")
+    print(f"ACPL pipeline:       {'Enabled' if args.acpl_pipeline and args.engine_pool_size > 0 and args.acpl_processes <= 0 else 'Disabled'}")
+    print(f"ACPL processes:      {args.acpl_processes if args.acpl_processes > 0 else 'Disabled (threads)'}")
+    print(f"Eval cache:          {'Disabled' if args.no_eval_cache or args.engine_pool_size <= 0 else args.eval_cache}")
     print(f"Template file:       {args.template_file if args.template_file else 'Default (built-in)'}")
     print(f"Debug mode:          {'Enabled' if args.debug else 'Disabled'}")
+    print(f"Async mode:          {'Enabled' if args.async_mode else 'Disabled'}")
+    print(f"SPRT:                {f'H0 Elo <= {args.sprt[0]:g}, H1 Elo >= {args.sprt[1]:g} (alpha {args.sprt_alpha:g}, beta {args.sprt_beta:g})' if args.sprt else 'Disabled'}")
+    print(f"Max games in flight: {args.max_games}")
+    print(f"Max LLM requests:    {args.max_llm_requests or args.max_games}")
+    print(f"HTTP connections:    {args.max_connections} keep-alive{' (HTTP/2)' if args.http2 else ''}")
+    print(f"Move batching:       {f'{args.batch_window_ms:g} ms window, up to {args.max_batch_size}' if args.batch_window_ms > 0 else 'Disabled'}")
+    print(f"Position suite:      {args.suite or 'Disabled (playing games)'}")
+    
+    adjudication = None
+    if args.adjudicate_resign is not None or args.adjudicate_draw is not None or args.tablebase:
+        try:
+            adjudication = Adjudication(
+                resign_cp=args.adjudicate_resign, resign_plies=args.resign_plies,
+                draw_cp=args.adjudicate_draw, draw_plies=args.draw_plies, draw_after_move=args.draw_after_move,
+                tablebase_dir=args.tablebase, tablebase_pieces=args.tablebase_pieces,
+            )
+        except OSError as e:
+            print(f"Error: cannot open tablebase: {e}")
+            sys.exit(1)
+    print(f"Adjudication:        {adjudication.describe() if adjudication else 'Disabled'}")
     
     # Show logs directory
     logs_dir = os.path.join(os.path.dirname(__file__), "logs")
-    print(f"Game logs directory: {logs_dir}")
+    print(f"Game logs directory: {logs_dir} ({args.log_format})")
     
     # Create opponents
     opponents = []
@@ -933,70 +2774,135 @@ def main():
     # except Exception as e:
     #     print(f"✗ Failed to create Random Agent: {e}")
     
+    # Shared Stockfish pool for opponents and ACPL analysis
+    engine_pool = None
+    if args.engine_pool_size > 0:
+        engine_pool = EnginePool(
+            size=args.engine_pool_size,
+            base_options={"Threads": args.engine_threads, "Hash": args.engine_hash},
+        )
+    
+    # Persistent position-evaluation cache (only the pooled analyzers consult it)
+    eval_cache = None
+    if engine_pool is not None and not args.no_eval_cache:
+        eval_cache = EvalCache(args.eval_cache)
+    
+    if args.suite:
+        run_position_suite(args, engine_pool, eval_cache)
+        return
+    
+    # Whole-game ACPL in worker processes, each with its own engines (replaces the pipeline)
+    process_analyzer = None
+    if args.acpl_processes > 0:
+        process_analyzer = ProcessAnalyzer(
+            args.acpl_processes, depth=args.acpl_depth, movetime_ms=args.acpl_movetime_ms,
+            cache_path=None if args.no_eval_cache else args.eval_cache,
+            base_options={"Threads": args.engine_threads, "Hash": args.engine_hash},
+        )
+    
+    analysis_pipeline = None
+    if engine_pool is not None and args.acpl_pipeline and process_analyzer is None:
+        analysis_pipeline = AnalysisPipeline(engine_pool, depth=args.acpl_depth, movetime_ms=args.acpl_movetime_ms,
+                                             cache=eval_cache)
+    
     # Stockfish agent
     try:
-        stockfish_agent = StockfishAgent(depth=args.stockfish_depth, skill_level=args.stockfish_skill, time_limit_ms=100)
+        if engine_pool is not None:
+            # Spawn the first pooled engine now to fail early if Stockfish is missing
+            with engine_pool.lease():
+                pass
+        stockfish_agent = StockfishAgent(depth=args.stockfish_depth, skill_level=args.stockfish_skill, time_limit_ms=100,
+                                         engine_pool=engine_pool)
         opponents.append((f"Stockfish (depth {args.stockfish_depth}, skill {args.stockfish_skill})", stockfish_agent))
         print(f"✓ Created Stockfish opponent (depth {args.stockfish_depth}, skill level {args.stockfish_skill})")
     except Exception as e:
         print(f"✗ Failed to create Stockfish agent: {e}")
         print("   Make sure Stockfish is installed on your system")
     
+    if len(endpoints) > 1:
+        run_tournament(endpoints, opponents, args, engine_pool, analysis_pipeline, eval_cache, process_analyzer,
+                       adjudication)
+        return
+    
     if not opponents:
         print("\nError: No opponents available. Exiting.")
         sys.exit(1)
     
-    # Run evaluation against each opponent using ThreadPoolExecutor
-    def evaluate_opponent_task(opponent_name, opponent_agent):
-        """Task wrapper for parallel evaluation."""
-        # Create a dummy player agent just for config reference
-        dummy_player_agent = OpenAIEndpointAgent(
-            base_url=args.endpoint,
-            api_key=args.api_key,
-            max_retries=args.max_retries,
-            template_file=args.template_file,
-            debug=args.debug
-        )
-        
-        try:
-            result = evaluate_against_opponent(
-                player_agent=dummy_player_agent,
-                opponent_name=opponent_name,
-                opponent_agent=opponent_agent,
-                num_games=args.games_per_opponent,
-                verbose=args.verbose,
-                base_url=args.endpoint,
-                api_key=args.api_key,
-                max_retries=args.max_retries,
-                template_file=args.template_file,
-                debug=args.debug,
-                acpl_depth=args.acpl_depth,
-                acpl_movetime_ms=args.acpl_movetime_ms,
-            )
-            return result
-        except Exception as e:
-            print(f"\nError evaluating against {opponent_name}: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
-        finally:
-            # Clean up Stockfish agents (the original one, game-specific ones are cleaned up in evaluate_against_opponent)
-            if hasattr(opponent_agent, 'close'):
-                opponent_agent.close()
+    # Journal of completed games, so an interrupted run can be resumed
+    run_config = {
+        "endpoint": args.endpoint,
+        "games_per_opponent": args.games_per_opponent,
+        "template_file": args.template_file,
+        "max_retries": args.max_retries,
+        "num_samples": args.num_samples,
+        "acpl_depth": args.acpl_depth,
+        "acpl_movetime_ms": args.acpl_movetime_ms,
+        "opponents": [name for name, _ in opponents],
+        "adjudication": adjudication.describe() if adjudication else None,
+    }
+    try:
+        if args.resume:
+            journal = RunJournal.load(args.resume)
+            for name, (journaled, given) in journal.config_differences(run_config).items():
+                print(f"Warning: {name} was {journaled!r} in run {args.resume}, now {given!r}")
+        else:
+            journal = RunJournal.create(run_config)
+    except (OSError, ValueError) as e:
+        print(f"\nError: {e}")
+        sys.exit(1)
+    print(f"\nRun ID: {journal.run_id} (resume with --resume {journal.run_id})")
     
-    results = []
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        # Submit all evaluation tasks
-        future_to_opponent = {
-            executor.submit(evaluate_opponent_task, opponent_name, opponent_agent): opponent_name
-            for opponent_name, opponent_agent in opponents
-        }
-        
-        # Collect results as they complete
-        for future in as_completed(future_to_opponent):
-            result = future.result()
-            if result is not None:
-                results.append(result)
+    # Game logs: one compact line per game in the run's JSONL log, or one file per game
+    log_store = GameLogStore(logs_dir) if args.log_format == "jsonl" else None
+    
+    # One scheduler for every (opponent, color, game) task of the run
+    scheduler = GameScheduler(max_games=args.max_games, max_llm_requests=args.max_llm_requests)
+    
+    stopping = None
+    if args.sprt:
+        stopping = SPRTStopping(scheduler, args.sprt[0], args.sprt[1], alpha=args.sprt_alpha, beta=args.sprt_beta)
+    
+    # One connection pool for every request of the run
+    client = create_client(args.endpoint, args.api_key, max_connections=args.max_connections, http2=args.http2)
+    
+    batcher = None
+    if args.batch_window_ms > 0:
+        batcher = MoveBatcher(args.endpoint, api_key=args.api_key, window_ms=args.batch_window_ms,
+                              max_batch_size=args.max_batch_size, client=client)
+    
+    try:
+        if args.async_mode:
+            # One event loop for every game against every opponent
+            results = asyncio.run(async_evaluate_all(opponents, args, scheduler, engine_pool, analysis_pipeline,
+                                                     eval_cache, batcher, client, journal, stopping, log_store,
+                                                     process_analyzer, adjudication))
+        else:
+            results = evaluate_all(opponents, args, scheduler, engine_pool, analysis_pipeline, eval_cache, batcher,
+                                   client, journal, stopping, log_store, process_analyzer, adjudication)
+    except Exception as e:
+        print(f"\nError during evaluation: {e}")
+        import traceback
+        traceback.print_exc()
+        results = []
+    
+    if batcher is not None:
+        batcher.close()
+        print(batcher.summary())
+    client.close()
+    if log_store is not None:
+        print(f"Game logs: {os.path.join(logs_dir, journal.run_id + '.games.jsonl')} "
+              f"(export per-game files with: python game_log_store.py export {journal.run_id})")
+    if analysis_pipeline is not None:
+        analysis_pipeline.close()
+    if process_analyzer is not None:
+        process_analyzer.close()
+    if adjudication is not None:
+        adjudication.close()
+    if engine_pool is not None:
+        print(f"Engine pool: {engine_pool.spawns} Stockfish processes served {engine_pool.leases} leases")
+        engine_pool.close()
+    if eval_cache is not None:
+        print(eval_cache.summary())
     
     # Print final results
     if results:
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Cross-game micro-batching of move requests.
+
+With many games in flight the harness would otherwise send one single-prompt
+chat completion per move, and a local transformers server runs `generate` once
+per request. The batcher collects the requests of all live games for a short
+window (a few milliseconds), sends them as one request to the batch endpoint of
+the local agent servers and fans the replies back out to the waiting games:
+
+    POST {base_url}/chat/completions/batch
+    {"requests": [<chat.completions body>, ...]}
+    -> {"responses": [<chat.completion or {"error": ...}>, ...]}
+
+Servers without that endpoint (e.g. vLLM, which batches continuously on its
+own) answer 404; the batcher then pipelines the window's requests to the normal
+chat-completions endpoint concurrently instead.
+
+    batcher = MoveBatcher(base_url, window_ms=10)
+    response = batcher.complete([{"role": "user", "content": prompt}], max_tokens=500)
+    response = await batcher.acomplete(messages, max_tokens=500)  # from a coroutine
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from openai import NotFoundError, OpenAI
+from openai.types.chat import ChatCompletion
+
+
+class MoveBatcher:
+    """Collects chat-completion requests from all games into batched requests."""
+
+    def __init__(self, base_url: str, api_key: str = "dummy", model: str = "aicrowd-chess-model",
+                 window_ms: float = 10.0, max_batch_size: int = 64, max_in_flight: int = 4,
+                 timeout: float = 600.0, client: Optional[OpenAI] = None):
+        """
+        Start the batcher thread.
+
+        Args:
+            base_url: Base URL of the OpenAI-compatible API endpoint
+            api_key: API key for the endpoint
+            model: Model name sent with every request
+            window_ms: How long to wait for more requests after the first one
+            max_batch_size: Maximum requests per batch (a full batch is sent at once)
+            max_in_flight: Maximum batches awaiting a reply at once
+            timeout: HTTP timeout in seconds for one batch
+            client: Run-wide OpenAI client to send through (default: a new one,
+                closed with the batcher)
+        """
+        self.model = model
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        # Batches go through the same client (and connection pool) as single requests
+        self._owns_client = client is None
+        self.client = (client or OpenAI(base_url=base_url, api_key=api_key)).with_options(timeout=timeout)
+        # None until the first batch tells us whether the server has the endpoint
+        self.batch_supported: Optional[bool] = None
+        self._queue: "queue.Queue[Optional[Tuple[dict, Future]]]" = queue.Queue()
+        self._senders = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="batch")
+        self._pipeline: Optional[ThreadPoolExecutor] = None
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self._thread = threading.Thread(target=self._collect, name="move-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, messages: List[dict], **params) -> "Future[ChatCompletion]":
+        """
+        Queue one chat completion for the next batch.
+
+        Args:
+            messages: Chat messages of the request
+            **params: Other chat-completions parameters (e.g. max_tokens)
+
+        Returns:
+            Future resolving to the ChatCompletion
+        """
+        future: Future = Future()
+        self._queue.put(({"model": self.model, "messages": messages, **params}, future))
+        return future
+
+    def complete(self, messages: List[dict], timeout: Optional[float] = None, **params) -> ChatCompletion:
+        """Blocking chat completion through the batcher, waiting at most `timeout` seconds."""
+        return self.submit(messages, **params).result(timeout)
+
+    async def acomplete(self, messages: List[dict], **params) -> ChatCompletion:
+        """Chat completion through the batcher, awaitable from the event loop."""
+        return await asyncio.wrap_future(self.submit(messages, **params))
+
+    def _collect(self):
+        """Batcher thread: group queued requests by time window and size."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    # Send what we have, then stop
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            self._senders.submit(self._send, batch)
+
+    def _send(self, batch: List[Tuple[dict, Future]]):
+        """Send one batch and resolve its futures."""
+        with self._stats_lock:
+            self.batches += 1
+            self.requests += len(batch)
+
+        if self.batch_supported is not False:
+            try:
+                reply = self.client.post("/chat/completions/batch", cast_to=object,
+                                         body={"requests": [body for body, _ in batch]})
+                self.batch_supported = True
+                responses = reply["responses"]
+                if len(responses) != len(batch):
+                    raise ValueError(f"batch of {len(batch)} answered with {len(responses)} responses")
+                for (_, future), response in zip(batch, responses):
+                    if "error" in response:
+                        future.set_exception(RuntimeError(response["error"]))
+                    else:
+                        future.set_result(ChatCompletion.model_validate(response))
+                return
+            except NotFoundError:
+                if self.batch_supported is None:
+                    print("Note: endpoint has no /chat/completions/batch; pipelining requests instead")
+                self.batch_supported = False
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+        # No batch endpoint: issue the window's requests concurrently
+        if self._pipeline is None:
+            self._pipeline = ThreadPoolExecutor(max_workers=self.max_batch_size, thread_name_prefix="pipeline")
+        for body, future in batch:
+            self._pipeline.submit(self._send_one, body, future)
+
+    def _send_one(self, body: dict, future: Future):
+        try:
+            future.set_result(self.client.chat.completions.create(**body))
+        except Exception as e:
+            future.set_exception(e)
+
+    def summary(self) -> str:
+        """One-line batching report for the end of a run."""
+        mean = self.requests / self.batches if self.batches else 0.0
+        mode = "pipelined" if self.batch_supported is False else "batched"
+        return f"Move batcher: {self.requests} requests in {self.batches} windows ({mean:.1f} per window, {mode})"
+
+    def close(self):
+        """Send any queued requests, wait for replies and stop the threads."""
+        self._queue.put(None)
+        self._thread.join()
+        self._senders.shutdown(wait=True)
+        if self._pipeline is not None:
+            self._pipeline.shutdown(wait=True)
+        if self._owns_client:
+            self.client.close()
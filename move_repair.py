@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Local repair of near-miss move replies.
+
+The agent expects `<uci_move>e2e4</uci_move>`; anything that is not exactly a
+legal UCI move used to be treated as illegal and cost another full request.
+Many misses are unambiguous without asking the model again. The repairs below
+are tried in order and the first one that yields a legal move wins:
+
+  normalize   case, whitespace and separators: " E2-E4 " -> e2e4, "e7e8=Q" -> e7e8q
+  promotion   pawn move to the last rank without a piece: e7e8 -> e7e8q
+  san         SAN instead of UCI: "Nf3" -> g1f3, "O-O" -> e1g1
+  nearest     one character away from exactly one legal move: "g1f4" -> g1f3
+              when g1f3 is the only legal move that close
+  think       no <uci_move> tag at all: the last legal move written in <think>
+
+    move, repair = repair_move(move_text, content, board, legal_moves)
+    # repair is None for an exact reply, else the name of the repair that fired
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+import chess
+
+# Repair names in the order they are tried
+REPAIRS = ("normalize", "promotion", "san", "nearest", "think")
+
+_SEPARATORS = re.compile(r"[\s\-xX:=+#!?'\"`()\[\]{}.,;]")
+_UCI_MENTION = re.compile(r"\b([a-h][1-8][a-h][1-8][qrbn]?)\b", re.IGNORECASE)
+_SAN_MENTION = re.compile(r"(?<![\w-])(O-O(?:-O)?|[KQRBN][a-h]?[1-8]?x?[a-h][1-8])(?![\w-])")
+_THINK = re.compile(r"<think>(.*?)(?:</think>|$)", re.IGNORECASE | re.DOTALL)
+
+
+def _legal_uci(text: str, legal_moves: List[chess.Move]) -> Optional[chess.Move]:
+    try:
+        move = chess.Move.from_uci(text)
+    except ValueError:
+        return None
+    return move if move in legal_moves else None
+
+
+def _legal_san(text: str, board: Optional[chess.Board],
+               legal_moves: List[chess.Move]) -> Optional[chess.Move]:
+    if board is None:
+        return None
+    try:
+        move = board.parse_san(text.strip().replace("0", "O"))
+    except ValueError:
+        return None
+    return move if move in legal_moves else None
+
+
+def _nearest(text: str, legal_moves: List[chess.Move]) -> Optional[chess.Move]:
+    """The only legal move whose UCI differs from `text` in one character."""
+    close = [move for move in legal_moves
+             if len(move.uci()) == len(text) and sum(a != b for a, b in zip(move.uci(), text)) == 1]
+    return close[0] if len(close) == 1 else None
+
+
+def _from_think(response: str, board: Optional[chess.Board],
+                legal_moves: List[chess.Move]) -> Optional[chess.Move]:
+    """Last legal move (UCI, or SAN naming a piece) mentioned in the <think> section."""
+    match = _THINK.search(response)
+    if not match:
+        return None
+    text = match.group(1)
+    found: List[Tuple[int, chess.Move]] = []
+    for mention in _UCI_MENTION.finditer(text):
+        move = _legal_uci(mention.group(1).lower(), legal_moves)
+        if move is not None:
+            found.append((mention.start(), move))
+    for mention in _SAN_MENTION.finditer(text):
+        move = _legal_san(mention.group(1), board, legal_moves)
+        if move is not None:
+            found.append((mention.start(), move))
+    return max(found, key=lambda item: item[0])[1] if found else None
+
+
+def repair_move(move_text: Optional[str], response: str, board: Optional[chess.Board],
+                legal_moves: List[chess.Move]) -> Tuple[Optional[chess.Move], Optional[str]]:
+    """
+    Turn a move reply into a legal move, repairing it if needed.
+
+    Args:
+        move_text: Contents of the <uci_move> tag, or None if the reply has none
+        response: Full reply text (searched by the "think" repair)
+        board: Position the move is for (needed for SAN; optional)
+        legal_moves: Legal moves in the position
+
+    Returns:
+        (move, repair): the legal move or None, and the name of the repair that
+        produced it (None when the reply was already a legal UCI move)
+    """
+    if move_text is None or not move_text.strip():
+        move = _from_think(response, board, legal_moves)
+        return (move, "think") if move is not None else (None, None)
+
+    move = _legal_uci(move_text, legal_moves)
+    if move is not None:
+        return move, None
+
+    normalized = _SEPARATORS.sub("", move_text).lower()
+    move = _legal_uci(normalized, legal_moves)
+    if move is not None:
+        return move, "normalize"
+
+    if len(normalized) == 4:
+        move = _legal_uci(normalized + "q", legal_moves)
+        if move is not None:
+            return move, "promotion"
+
+    move = _legal_san(move_text, board, legal_moves)
+    if move is None and move_text.strip()[:1] in ("n", "r", "q", "k"):
+        # Lowercase piece letter ("nf3"); not "b", which would read as a pawn on the b-file
+        move = _legal_san(move_text.strip().capitalize(), board, legal_moves)
+    if move is not None:
+        return move, "san"
+
+    if len(normalized) in (4, 5):
+        move = _nearest(normalized, legal_moves)
+        if move is not None:
+            return move, "nearest"
+
+    return None, None
@@ -2,11 +2,10 @@
 import argparse
 import torch
 import chess
-from flask import Flask, request, jsonify
 from transformers import AutoModelForCausalLM, AutoTokenizer
 import sys
 
-app = Flask(__name__)
+from serving_core import ServingCore, add_serving_arguments, each
 
 # Global variables for model and tokenizer
 model = None
@@ -29,11 +28,10 @@ def load_model(model_path):
         print(f"Error loading model: {e}")
         sys.exit(1)
 
-@app.route('/v1/chat/completions', methods=['POST'])
-def chat_completions():
+def complete_chat(data):
+    """Answer one chat-completions request body; returns (response, HTTP status)."""
     try:
-        data = request.json
-        messages = data.get('messages', [])
+        messages = (data or {}).get('messages', [])
         
         # Construct prompt from messages
         # The env sends: system (optional), user (FEN+moves)
@@ -87,21 +85,21 @@ def chat_completions():
             }
         }
         
-        return jsonify(response)
+        return response, 200
     
     except Exception as e:
         print(f"Error during generation: {e}")
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/health', methods=['GET'])
-def health():
-    return jsonify({"status": "healthy"})
+        return {"error": str(e)}, 500
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument("--model_path", type=str, default="qwen-chess-0.5b-merged", help="Path to the merged model")
     parser.add_argument("--port", type=int, default=5001, help="Port to run server on")
+    add_serving_arguments(parser)
     args = parser.parse_args()
     
     load_model(args.model_path)
-    app.run(host='0.0.0.0', port=args.port, debug=False)
+    # One worker owns the model, so generations never run concurrently
+    core = ServingCore(workers=1, max_queue=args.max_queue, request_timeout=args.request_timeout)
+    core.add_chat_routes(each(complete_chat))
+    core.run('0.0.0.0', args.port)
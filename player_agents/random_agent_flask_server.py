@@ -1,19 +1,16 @@
 import random
 import argparse
 import sys
-from flask import Flask, request, jsonify
 
-app = Flask(__name__)
+from serving_core import ServingCore, add_serving_arguments, each
 
-@app.route('/v1/chat/completions', methods=['POST'])
-def chat_completions():
-    """OpenAI API compatible endpoint for chess move generation"""
+def complete_chat(data):
+    """Answer one chat-completions request body; returns (response, HTTP status)."""
     try:
-        data = request.json
-        messages = data.get('messages', [])
+        messages = (data or {}).get('messages', [])
         
         if not messages:
-            return jsonify({"error": "No messages provided"}), 400
+            return {"error": "No messages provided"}, 400
         
         # Get the last user message
         user_message = None
@@ -23,7 +20,7 @@ def chat_completions():
                 break
         
         if not user_message:
-            return jsonify({"error": "No user message found"}), 400
+            return {"error": "No user message found"}, 400
         
         print(f"DEBUG: Received message: {user_message[:100]}...", file=sys.stderr)
 
@@ -38,10 +35,10 @@ def chat_completions():
                 legal_moves = [m.strip() for m in moves_part.split() if m.strip()]
         
         if not legal_moves:
-            return jsonify({"error": "No legal moves found in message"}), 400
+            return {"error": "No legal moves found in message"}, 400
         
-        # Select a random legal move
-        random_move = random.choice(legal_moves)
+        # Select a random legal move (one per requested sample)
+        random_moves = [random.choice(legal_moves) for _ in range(max(1, int(data.get('n') or 1)))]
         
         # Format response in OpenAI API format
         response = {
@@ -50,13 +47,13 @@ def chat_completions():
             "created": 1234567890,
             "model": "random-chess-agent",
             "choices": [{
-                "index": 0,
+                "index": index,
                 "message": {
                     "role": "assistant",
                     "content": f"<think>Selecting a random legal move from the available options</think><uci_move>{random_move}</uci_move>"
                 },
                 "finish_reason": "stop"
-            }],
+            } for index, random_move in enumerate(random_moves)],
             "usage": {
                 "prompt_tokens": 0,
                 "completion_tokens": 0,
@@ -64,21 +61,21 @@ def chat_completions():
             }
         }
         
-        return jsonify(response)
+        return response, 200
     
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/health', methods=['GET'])
-def health():
-    """Health check endpoint"""
-    return jsonify({"status": "healthy"})
+        return {"error": str(e)}, 500
 
 if __name__ == '__main__':
-    parser = argparse.ArgumentParser(description='Random Chess Agent Flask Server')
+    parser = argparse.ArgumentParser(description='Random Chess Agent Server')
     parser.add_argument('--host', type=str, default='0.0.0.0', help='Host to bind to')
     parser.add_argument('--port', type=int, default=5000, help='Port to bind to')
+    add_serving_arguments(parser, workers=4)
     args = parser.parse_args()
     
+    # Stateless, so several requests can be answered at once
+    core = ServingCore(workers=args.workers, max_queue=args.max_queue, request_timeout=args.request_timeout)
+    core.add_chat_routes(each(complete_chat))
+    
     print(f"Starting Random Chess Agent server on {args.host}:{args.port}")
-    app.run(host=args.host, port=args.port, debug=False)
\ No newline at end of file
+    core.run(args.host, args.port)
\ No newline at end of file
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Async serving core shared by the agent servers in this directory.
+
+The servers used to run on Flask's development server: one thread per request,
+no limit on concurrent generations and no way to shed load. Here every server
+is an ASGI application with one bounded request queue in front of its backend
+(model, Stockfish or random mover):
+
+  queue       requests wait in a queue of at most `max_queue` entries; when
+              it is full the request is answered 429 at once (with
+              Retry-After), instead of piling up behind the backend; a batch
+              request with more than `max_queue` bodies is answered 413
+  workers     `workers` worker tasks take requests off the queue, up to
+              `max_batch_size` at a time (waiting at most `max_wait_ms` for a
+              batch to fill), and run the blocking backend on a thread pool
+              of the same size; a model backend uses one worker, so it never
+              runs concurrently with itself
+  deadlines   every request has a deadline (`request_timeout`, or the
+              client's X-Request-Timeout header in seconds); one that has
+              not been answered by then gets 503 and is dropped from the
+              queue if it has not started yet
+  disconnect  a request whose client has gone away is dropped from the
+              queue as well, and a result already being computed is discarded
+
+Backends are plain blocking functions taking a list of JSON request bodies and
+returning one (response body, HTTP status) per body:
+
+    core = ServingCore(workers=1, max_batch_size=16, max_wait_ms=10)
+    core.add_chat_routes(complete_chats)   # /v1/chat/completions and /batch
+    core.health = lambda: ({"status": "healthy"}, 200)
+    core.run("0.0.0.0", 5000)
+
+`run` serves the app with uvicorn (listed in requirements.txt).
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Backend: list of request bodies -> one (response body, status) per body
+Backend = Callable[[List[dict]], List[Tuple[dict, int]]]
+
+DEADLINE_HEADER = b"x-request-timeout"
+
+
+def each(complete_one: Callable[[dict], Tuple[dict, int]]) -> Backend:
+    """Backend answering the bodies of a batch one at a time."""
+    return lambda payloads: [complete_one(payload) for payload in payloads]
+
+
+class _Job:
+    """One queued request body and the future its handler is waiting on."""
+    __slots__ = ("backend", "payload", "future")
+
+    def __init__(self, backend: Backend, payload: dict, future: asyncio.Future):
+        self.backend = backend
+        self.payload = payload
+        self.future = future
+
+
+class ServingCore:
+    """ASGI application with a bounded queue, batching workers and deadlines."""
+
+    def __init__(self, workers: int = 1, max_batch_size: int = 1, max_wait_ms: float = 0.0,
+                 max_queue: int = 256, request_timeout: float = 60.0):
+        """
+        Initialize the core.
+
+        Args:
+            workers: Backend calls running at once (1 for a model)
+            max_batch_size: Most request bodies handed to one backend call
+            max_wait_ms: How long the first request of a batch waits for others
+            max_queue: Requests waiting at most; more are answered 429
+            request_timeout: Default seconds until a request is answered 503
+        """
+        self.workers = max(1, workers)
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_s = max(0.0, max_wait_ms) / 1000.0
+        self.max_queue = max(1, max_queue)
+        self.request_timeout = request_timeout
+        # (body, status) for GET /health; the core adds its counters under "serving"
+        self.health: Callable[[], Tuple[dict, int]] = lambda: ({"status": "healthy"}, 200)
+        self.routes: Dict[str, Tuple[Backend, bool]] = {}  # path -> (backend, batch route)
+        self.requests = 0
+        self.batches = 0
+        self.rejected = 0
+        self.expired = 0
+        self.cancelled = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="backend")
+
+    def add_route(self, path: str, backend: Backend):
+        """Serve POST `path` (one JSON body) from `backend`."""
+        self.routes[path] = (backend, False)
+
+    def add_chat_routes(self, backend: Backend):
+        """Serve /v1/chat/completions and its batch route ({"requests": [...]} -> {"responses": [...]})."""
+        self.add_route("/v1/chat/completions", backend)
+        self.routes["/v1/chat/completions/batch"] = (backend, True)
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "rejected": self.rejected,
+            "expired": self.expired,
+            "cancelled": self.cancelled,
+        }
+
+    # -- queue and workers -------------------------------------------------
+
+    def _start(self):
+        """Create the queue and worker tasks on the serving event loop (first request)."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            for _ in range(self.workers):
+                asyncio.ensure_future(self._worker())
+
+    def _submit(self, backend: Backend, payloads: List[dict]) -> Optional[List[_Job]]:
+        """Queue the bodies as jobs, or return None if the queue has no room for all of them."""
+        if self.max_queue - self._queue.qsize() < len(payloads):
+            self.rejected += len(payloads)
+            return None
+        loop = asyncio.get_running_loop()
+        jobs = [_Job(backend, payload, loop.create_future()) for payload in payloads]
+        for job in jobs:
+            self._queue.put_nowait(job)
+        return jobs
+
+    async def _collect(self) -> List[_Job]:
+        """Wait for a live job, then gather more until the batch is full or the wait is over."""
+        batch: List[_Job] = []
+        while not batch:
+            job = await self._queue.get()
+            if not job.future.done():  # done: cancelled by its deadline or a disconnect
+                batch.append(job)
+        deadline = asyncio.get_running_loop().time() + self.max_wait_s
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - asyncio.get_running_loop().time()
+            try:
+                if remaining > 0:
+                    job = await asyncio.wait_for(self._queue.get(), remaining)
+                else:
+                    job = self._queue.get_nowait()
+            except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                break
+            if not job.future.done():
+                batch.append(job)
+        return batch
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            groups: Dict[Backend, List[_Job]] = {}
+            for job in batch:
+                groups.setdefault(job.backend, []).append(job)
+            for backend, jobs in groups.items():
+                try:
+                    results = await loop.run_in_executor(self._executor, backend, [job.payload for job in jobs])
+                except Exception as e:
+                    print(f"Error serving batch: {e}")
+                    results = [({"error": str(e)}, 500)] * len(jobs)
+                self.batches += 1
+                self.requests += len(jobs)
+                for job, result in zip(jobs, results):
+                    if not job.future.done():
+                        job.future.set_result(result)
+
+    async def _wait(self, jobs: List[_Job], timeout: float, receive) -> Optional[List[Tuple[dict, int]]]:
+        """
+        Wait for the jobs' results, the request deadline or the client leaving.
+
+        Returns:
+            The results, [] if the deadline passed, None if the client disconnected
+        """
+        results = asyncio.gather(*(job.future for job in jobs))
+        disconnect = asyncio.ensure_future(_disconnected(receive))
+        done, _ = await asyncio.wait({results, disconnect}, timeout=timeout,
+                                     return_when=asyncio.FIRST_COMPLETED)
+        disconnect.cancel()
+        if results in done:
+            return results.result()
+        # Queued jobs are skipped by the workers; running ones have their result discarded
+        results.cancel()
+        if disconnect in done:
+            self.cancelled += len(jobs)
+            return None
+        self.expired += len(jobs)
+        return []
+
+    # -- ASGI --------------------------------------------------------------
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await _lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        self._start()
+        body = await _read_body(receive)
+
+        if scope["path"] == "/health" and scope["method"] == "GET":
+            response, status = self.health()
+            await _send_json(send, {**response, "serving": self.stats()}, status)
+            return
+        if scope["path"] not in self.routes:
+            await _send_json(send, {"error": "Not found"}, 404)
+            return
+        if scope["method"] != "POST":
+            await _send_json(send, {"error": "Method not allowed"}, 405)
+            return
+
+        backend, batch_route = self.routes[scope["path"]]
+        try:
+            data = json.loads(body) if body else {}
+        except ValueError:
+            await _send_json(send, {"error": "Invalid JSON body"}, 400)
+            return
+        if batch_route:
+            payloads = (data or {}).get("requests") if isinstance(data, dict) else None
+            if not isinstance(payloads, list):
+                await _send_json(send, {"error": "'requests' must be a list"}, 400)
+                return
+        else:
+            payloads = [data if isinstance(data, dict) else {}]
+
+        if len(payloads) > self.max_queue:
+            # Would never fit, however long the client waits: not worth a retry
+            await _send_json(send, {"error": f"Batch of {len(payloads)} requests exceeds the server's "
+                                             f"queue of {self.max_queue} (--max-queue)"}, 413)
+            return
+        jobs = self._submit(backend, payloads)
+        if jobs is None:
+            await _send_json(send, {"error": "Server overloaded, request queue is full"}, 429,
+                             [(b"retry-after", b"1")])
+            return
+        results = await self._wait(jobs, _request_timeout(scope, self.request_timeout), receive)
+        if results is None:
+            return  # the client is gone, nobody to answer
+        if not results:
+            await _send_json(send, {"error": "Request deadline exceeded"}, 503, [(b"retry-after", b"1")])
+        elif batch_route:
+            await _send_json(send, {"responses": [response for response, _ in results]}, 200)
+        else:
+            await _send_json(send, *results[0])
+
+    def run(self, host: str, port: int):
+        """Serve the app with uvicorn."""
+        import uvicorn
+
+        print(f"Serving on {host}:{port} ({self.workers} worker(s), batches of up to {self.max_batch_size}, "
+              f"queue {self.max_queue}, timeout {self.request_timeout:g}s)")
+        uvicorn.run(self, host=host, port=port, log_level="warning")
+
+
+def add_serving_arguments(parser, workers: Optional[int] = None):
+    """Add the queue and deadline flags shared by the servers (and --workers if the backend can run concurrently)."""
+    if workers is not None:
+        parser.add_argument("--workers", type=int, default=workers,
+                            help=f"Backend calls running at once (default: {workers})")
+    parser.add_argument("--max-queue", type=int, default=256,
+                        help="Requests waiting at most; more are answered 429 (default: 256)")
+    parser.add_argument("--request-timeout", type=float, default=60.0,
+                        help="Seconds until an unanswered request gets 503 (default: 60)")
+
+
+def _request_timeout(scope, default: float) -> float:
+    for name, value in scope.get("headers", []):
+        if name.lower() == DEADLINE_HEADER:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                break
+    return default
+
+
+async def _read_body(receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            return body
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            return body
+
+
+async def _disconnected(receive):
+    """Return once the client has closed the connection."""
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def _send_json(send, body: dict, status: int = 200, headers=()):
+    content = json.dumps(body).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"),
+                    (b"content-length", str(len(content)).encode()), *headers],
+    })
+    await send({"type": "http.response.body", "body": content})
+
@@ -1,9 +1,8 @@
 import random
 import argparse
-from flask import Flask, request, jsonify
 from stockfish import Stockfish
 
-app = Flask(__name__)
+from serving_core import ServingCore, add_serving_arguments, each
 
 # Initialize Stockfish (you may need to specify the path to stockfish binary)
 # Common paths: /usr/games/stockfish, /usr/local/bin/stockfish, or just 'stockfish' if in PATH
@@ -14,18 +13,16 @@ except Exception as e:
     print("You may need to specify the correct path to the Stockfish binary.")
     stockfish = None
 
-@app.route('/v1/chat/completions', methods=['POST'])
-def chat_completions():
-    """OpenAI API compatible endpoint for chess move generation using Stockfish"""
+def complete_chat(data):
+    """Answer one chat-completions request body; returns (response, HTTP status)."""
     try:
         if stockfish is None:
-            return jsonify({"error": "Stockfish engine not initialized"}), 500
+            return {"error": "Stockfish engine not initialized"}, 500
             
-        data = request.json
-        messages = data.get('messages', [])
+        messages = (data or {}).get('messages', [])
         
         if not messages:
-            return jsonify({"error": "No messages provided"}), 400
+            return {"error": "No messages provided"}, 400
         
         # Get the last user message
         user_message = None
@@ -35,7 +32,7 @@ def chat_completions():
                 break
         
         if not user_message:
-            return jsonify({"error": "No user message found"}), 400
+            return {"error": "No user message found"}, 400
         
         # Parse the message to extract FEN position and legal moves
         fen_position = None
@@ -56,10 +53,10 @@ def chat_completions():
                 legal_moves = [m.strip() for m in moves_part.split() if m.strip()]
         
         if not fen_position:
-            return jsonify({"error": "No FEN position found in message"}), 400
+            return {"error": "No FEN position found in message"}, 400
         
         if not legal_moves:
-            return jsonify({"error": "No legal moves found in message"}), 400
+            return {"error": "No legal moves found in message"}, 400
         
         # Set the position in Stockfish
         stockfish.set_fen_position(fen_position)
@@ -93,23 +90,23 @@ def chat_completions():
             }
         }
         
-        return jsonify(response)
+        return response, 200
     
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return {"error": str(e)}, 500
 
-@app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
     if stockfish is None:
-        return jsonify({"status": "unhealthy", "error": "Stockfish not initialized"}), 500
-    return jsonify({"status": "healthy"})
+        return {"status": "unhealthy", "error": "Stockfish not initialized"}, 500
+    return {"status": "healthy"}, 200
 
 if __name__ == '__main__':
-    parser = argparse.ArgumentParser(description='Stockfish Chess Agent Flask Server')
+    parser = argparse.ArgumentParser(description='Stockfish Chess Agent Server')
     parser.add_argument('--host', type=str, default='0.0.0.0', help='Host to bind to')
     parser.add_argument('--port', type=int, default=5000, help='Port to bind to')
     parser.add_argument('--stockfish-path', type=str, default='stockfish', help='Path to Stockfish binary')
+    add_serving_arguments(parser)
     args = parser.parse_args()
     
     # Reinitialize Stockfish with custom path if provided
@@ -120,6 +117,11 @@ if __name__ == '__main__':
         except Exception as e:
             print(f"Error initializing Stockfish with path {args.stockfish_path}: {e}")
     
+    # One Stockfish process: requests are answered one at a time
+    core = ServingCore(workers=1, max_queue=args.max_queue, request_timeout=args.request_timeout)
+    core.add_chat_routes(each(complete_chat))
+    core.health = health
+    
     print(f"Starting Stockfish Chess Agent server (Level 0, Depth 1) on {args.host}:{args.port}")
-    app.run(host=args.host, port=args.port, debug=False)
+    core.run(args.host, args.port)
 
@@ -1,19 +1,26 @@
 
 import argparse
+import copy
 import os
 import sys
 import re
 
 import chess
 import torch
-from flask import Flask, jsonify, request
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from transformers import AutoModelForCausalLM, AutoTokenizer, DynamicCache, LogitsProcessor, LogitsProcessorList
 
-app = Flask(__name__)
+from serving_core import ServingCore, add_serving_arguments
 
 # Global variables
 model = None
 tokenizer = None
+prefix_cache = None  # PrefixCache, enabled with --prefix-cache
+score_by_default = False  # answer chat completions by scoring moves (--score-moves)
+constrain_by_default = False  # restrict the <uci_move> span to legal moves (--constrain-moves)
+
+# Candidates per forward pass when scoring moves (logits are rows x tokens x vocabulary)
+SCORE_CHUNK = 64
+FEN_PATTERN = re.compile(r"([rnbqkpRNBQKP1-8/]+ [wb] [-KQkq]+ [-a-h1-8]+ \d+ \d+)")
 
 PIECE_VALUES = {
     chess.PAWN: 1.0,
@@ -127,6 +134,17 @@ def maybe_augment_messages_with_heuristics(messages):
     augmented[-1]["content"] = content + f"\n\nHeuristics (Boychesser-inspired): {heuristics}"
     return augmented
 
+def board_from_messages(messages):
+    """Position of the FEN in the last message, or None."""
+    content = messages[-1].get("content") if messages else None
+    match = FEN_PATTERN.search(content) if isinstance(content, str) else None
+    if not match:
+        return None
+    try:
+        return chess.Board(match.group(1))
+    except ValueError:
+        return None
+
 def load_model(model_name):
     global model, tokenizer
     print(f"Loading model: {model_name}")
@@ -136,6 +154,11 @@ def load_model(model_name):
             dtype = torch.bfloat16
 
         tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=True)
+        if tokenizer.pad_token_id is None:
+            # Needed to pad batched prompts
+            tokenizer.pad_token = tokenizer.eos_token
+        # Left padding keeps every prompt's last token next to its first generated one
+        tokenizer.padding_side = "left"
         model = AutoModelForCausalLM.from_pretrained(
             model_name,
             torch_dtype=dtype,
@@ -148,66 +171,571 @@ def load_model(model_name):
         print(f"CRITICAL ERROR loading model: {e}")
         sys.exit(1)
 
-@app.route('/v1/chat/completions', methods=['POST'])
-def chat_completions():
-    try:
-        data = request.get_json(force=True, silent=True) or {}
-        messages = data.get('messages') or []
-        if not messages:
-            return jsonify({"error": "'messages' field is required"}), 400
-        
-        augmented_messages = maybe_augment_messages_with_heuristics(messages)
-        text = tokenizer.apply_chat_template(augmented_messages, tokenize=False, add_generation_prompt=True)
-        inputs = tokenizer(text, return_tensors="pt").to(model.device)
+def completion_response(contents, prompt_tokens, completion_tokens, cached_tokens=0):
+    """OpenAI chat.completion body with one choice per generated reply."""
+    return {
+        "id": "chatcmpl-transformers",
+        "object": "chat.completion",
+        "created": 1234567890,
+        "model": "chess-agent",
+        "choices": [{
+            "index": index,
+            "message": {
+                "role": "assistant",
+                "content": content
+            },
+            "finish_reason": "stop"
+        } for index, content in enumerate(contents)],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens}
+        }
+    }
+
+
+def common_prefix_length(a, b):
+    """Number of leading tokens two token id lists share."""
+    length = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        length += 1
+    return length
+
+
+def prefill_prefix(token_ids):
+    """KV cache of a token prefix, from one forward pass."""
+    cache = DynamicCache()
+    with torch.no_grad():
+        model(input_ids=torch.tensor([token_ids], device=model.device), past_key_values=cache, use_cache=True)
+    return cache
+
+
+class PrefixCache:
+    """
+    KV state of static prompt prefixes, prefilled once and reused by every request.
+
+    Prompts rendered from one template open with the same tokens: the chat
+    template header and the instruction text up to the first variable. The
+    cache learns these prefixes from the traffic: when two requests in a row
+    share at least `min_tokens` leading tokens that no entry covers, their
+    common prefix is prefilled once and stored. A later prompt starting with
+    (at least half of) an entry's tokens skips that part of its prefill and
+    generates from a copy of the entry's KV state; the entry is cut back to the
+    part actually shared, so a prefix that picked up a board rank two positions
+    happened to share converges to the template's static prefix.
+    """
+
+    def __init__(self, min_tokens=16, max_entries=4):
+        self.min_tokens = min_tokens
+        self.max_entries = max_entries
+        self.entries = []  # [token ids, DynamicCache], most recently used last
+        self._pending = None  # token ids of the last prompt no entry matched
+        self.hits = 0
+        self.prompt_tokens = 0
+        self.tokens_saved = 0
+
+    def _match(self, ids):
+        """Best entry for a prompt and how many of its tokens apply, or (None, 0)."""
+        best, best_length = None, 0
+        for entry in self.entries:
+            # At least one prompt token has to be left for generate to prefill
+            length = min(common_prefix_length(entry[0], ids), len(ids) - 1)
+            if length >= max(self.min_tokens, len(entry[0]) / 2) and length > best_length:
+                best, best_length = entry, length
+        return best, best_length
+
+    def _learn(self, ids):
+        """Store the prefix this prompt shares with the previous unmatched one."""
+        if self._pending is not None:
+            length = min(common_prefix_length(self._pending, ids), len(ids) - 1)
+            if length >= self.min_tokens:
+                self._pending = None
+                self.entries.append([ids[:length], prefill_prefix(ids[:length])])
+                if len(self.entries) > self.max_entries:
+                    self.entries.pop(0)
+                return
+        self._pending = ids
+
+    def plan(self, token_lists):
+        """
+        Split a batch of tokenized prompts by the prefix entry they reuse.
+
+        Returns:
+            [(row indices, prefix length, prefix KV cache or None)]
+        """
+        groups = {}
+        for row, ids in enumerate(token_lists):
+            entry, length = self._match(ids)
+            if entry is None:
+                self._learn(ids)
+                entry, length = self._match(ids)
+            key = id(entry) if entry is not None else None
+            groups.setdefault(key, (entry, []))[1].append((row, length))
+
+        plan = []
+        for entry, matches in groups.values():
+            rows = [row for row, _ in matches]
+            self.prompt_tokens += sum(len(token_lists[row]) for row in rows)
+            if entry is None:
+                plan.append((rows, 0, None))
+                continue
+            length = min(length for _, length in matches)
+            if length < len(entry[0]):
+                entry[0] = entry[0][:length]
+                entry[1].crop(length)
+            if entry in self.entries:
+                self.entries.remove(entry)
+                self.entries.append(entry)
+            self.hits += len(rows)
+            self.tokens_saved += length * len(rows)
+            plan.append((rows, length, entry[1]))
+        return plan
+
+    def stats(self):
+        return {
+            "prefix_lengths": [len(entry[0]) for entry in self.entries],
+            "hits": self.hits,
+            "prompt_tokens": self.prompt_tokens,
+            "prefill_tokens_saved": self.tokens_saved,
+        }
+
+
+def pad_prompts(token_lists, prefix_length=0):
+    """
+    Batch tensors for tokenized prompts sharing their first `prefix_length` tokens.
+
+    The shared prefix stays at the start of every row and the padding goes
+    between it and each prompt's own tokens, so one prefix KV cache lines up
+    with all rows; the attention mask hides the padding (generate derives
+    position ids from it). With no prefix this is plain left padding.
+
+    Returns:
+        (input_ids, attention_mask) on the model's device
+    """
+    width = max(len(ids) for ids in token_lists)
+    input_ids, attention_mask = [], []
+    for ids in token_lists:
+        padding = width - len(ids)
+        input_ids.append(ids[:prefix_length] + [tokenizer.pad_token_id] * padding + ids[prefix_length:])
+        attention_mask.append([1] * prefix_length + [0] * padding + [1] * (len(ids) - prefix_length))
+    return (torch.tensor(input_ids, device=model.device),
+            torch.tensor(attention_mask, device=model.device))
+
+
+class LegalMoveTrie:
+    """
+    Token trie of `move</uci_move>` for each legal move of a position.
+
+    Sequences are tokenized in context, as `<uci_move>move</uci_move>` with
+    the tag's tokens removed, since the reply spells them that way. When the
+    tag ends on a token boundary the rest of the sequence hangs off `root`.
+    Byte-level BPE tokenizers usually merge the tag's `>` with the move's
+    first letter instead; the rest then hangs off `merged[token]`, keyed by
+    that tag-completing token, and `root` holds the move tokenized on its own
+    for replies that still end the tag on its own token.
+    """
+
+    END = -1  # key marking a complete sequence
+    OPEN_TAG = "<uci_move>"
+
+    def __init__(self, moves):
+        self.root = {}
+        self.merged = {}
+        moves = list(moves)
+        in_context = tokenizer([f"{self.OPEN_TAG}{move}</uci_move>" for move in moves],
+                               add_special_tokens=False)["input_ids"]
+        for move, tokens in zip(moves, in_context):
+            # First token whose text completes the opening tag
+            tag_end = next(i for i in range(len(tokens)) if self.OPEN_TAG in tokenizer.decode(tokens[:i + 1]))
+            if tokenizer.decode(tokens[:tag_end + 1]).endswith(self.OPEN_TAG):
+                self._add(self.root, tokens[tag_end + 1:])
+            else:
+                self._add(self.merged.setdefault(tokens[tag_end], {}), tokens[tag_end + 1:])
+                self._add(self.root, tokenizer(f"{move}</uci_move>", add_special_tokens=False)["input_ids"])
+
+    def _add(self, node, tokens):
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[self.END] = {}
+
+    @classmethod
+    def allowed(cls, node):
+        """
+        Tokens that may follow the path leading to `node`.
+
+        A complete sequence (move and closing tag) only allows end of sequence.
+        """
+        tokens = [token for token in node if token != cls.END]
+        if cls.END in node:
+            tokens.append(tokenizer.eos_token_id)
+        return tokens
+
+
+# Text of single token ids, decoded once per id
+token_texts = {}
+
+# Constrained-decoding counters reported by /health: rows whose <uci_move> span
+# was constrained, rows left unconstrained because the opening tag merged into
+# a token the trie does not start with, and rows forced to end because they
+# left their trie
+constraint_stats = {"constrained_rows": 0, "merged_tag": 0, "left_trie": 0}
+
+
+def token_text(token_id):
+    text = token_texts.get(token_id)
+    if text is None:
+        text = token_texts[token_id] = tokenizer.decode([token_id])
+    return text
+
+
+class LegalMoveProcessor(LogitsProcessor):
+    """
+    Restrict each row's `<uci_move>` span to its position's legal moves.
+
+    A row generates freely (its reasoning) until it has emitted `<uci_move>`.
+    From then on only tokens continuing a sequence of its LegalMoveTrie are
+    allowed, which spells a legal move and then `</uci_move>`, and once the
+    closing tag is complete the row is forced to end. The reply therefore
+    always closes on a legal move.
+
+    Each step only looks at the token just generated: a free row extends the
+    tail of its text with that token's (cached) text, a constrained row moves
+    one node down its trie. A row whose opening tag came out merged into a
+    token the trie has no entry for is left unconstrained, and a row that
+    left its trie is forced to end; both are counted in `constraint_stats`.
+    """
+
+    OPEN_TAG = LegalMoveTrie.OPEN_TAG
+    TAIL = 32  # characters of each free row's text kept to spot the tag
+
+    def __init__(self, tries, samples, prompt_width):
+        """
+        Args:
+            tries: LegalMoveTrie (or None: unconstrained) per prompt
+            samples: Rows per prompt (row r belongs to prompt r // samples)
+            prompt_width: Padded prompt length; generated tokens start here
+        """
+        self.tries = tries
+        self.samples = samples
+        self.prompt_width = prompt_width
+        self.tails = {}  # free row -> end of its generated text
+        self.nodes = {}  # constrained row -> trie node of its span so far
+        self.ended = set()  # rows forced to end of sequence
+        self.released = set()  # rows left unconstrained
+
+    def _step(self, row, trie, token):
+        """Advance a row's state by the token it just generated."""
+        if row in self.ended or row in self.released:
+            return
+        node = self.nodes.get(row)
+        if node is not None:
+            node = node.get(token)
+            if node is not None:
+                self.nodes[row] = node
+            elif token != tokenizer.eos_token_id:
+                constraint_stats["left_trie"] += 1
+                self.ended.add(row)
+            return
+        tail = (self.tails.get(row, "") + token_text(token))[-self.TAIL:]
+        self.tails[row] = tail
+        if self.OPEN_TAG not in tail:
+            return
+        node = trie.root if tail.endswith(self.OPEN_TAG) else trie.merged.get(token)
+        if node is not None:
+            constraint_stats["constrained_rows"] += 1
+            self.nodes[row] = node
+        else:
+            constraint_stats["merged_tag"] += 1
+            self.released.add(row)
+
+    def __call__(self, input_ids, scores):
+        # One device-to-host copy per step: the token each row just generated
+        last = input_ids[:, -1].tolist() if input_ids.shape[1] > self.prompt_width else None
+        for row in range(input_ids.shape[0]):
+            trie = self.tries[row // self.samples]
+            if trie is None:
+                continue
+            if last is not None:
+                self._step(row, trie, last[row])
+            if row in self.ended:
+                allowed = [tokenizer.eos_token_id]
+            elif row in self.nodes:
+                allowed = trie.allowed(self.nodes[row])
+            else:
+                continue
+            mask = torch.full_like(scores[row], float("-inf"))
+            mask[allowed] = 0
+            scores[row] += mask
+        return scores
+
+
+def completion_length(generated_tokens):
+    """
+    Tokens a row generated, up to and including its first end of sequence.
+
+    Finished rows are padded with pad_token_id, which is the EOS token for
+    these models, so counting non-padding tokens would drop the EOS itself.
+    """
+    ends = (generated_tokens == tokenizer.eos_token_id).nonzero()
+    return int(ends[0]) + 1 if len(ends) else len(generated_tokens)
+
+
+def generate_batch(texts, max_tokens, temperature, n=1, legal_moves=None):
+    """
+    Run one left-padded `model.generate` over several chat prompts.
+
+    With n > 1 every prompt is sampled n times via `num_return_sequences`, so
+    the prompt is prefilled once for all of its samples. Greedy decoding
+    (temperature 0) would give n identical replies, so it runs once and the
+    reply is repeated. With the prefix cache enabled, prompts are generated
+    in one batch per cached prefix, starting from a copy of its KV state.
+    With `legal_moves` (a list of UCI moves, or None, per prompt) the
+    `<uci_move>` span is constrained to those moves (LegalMoveProcessor).
+
+    Returns:
+        ([content, ...], prompt_tokens, completion_tokens, cached_tokens) for each prompt
+    """
+    do_sample = temperature > 0
+    samples = n if do_sample else 1
+    token_lists = tokenizer(texts)["input_ids"]
+    if prefix_cache is not None:
+        groups = prefix_cache.plan(token_lists)
+    else:
+        groups = [(list(range(len(texts))), 0, None)]
+
+    results = [None] * len(texts)
+    for rows, prefix_length, cache in groups:
+        input_ids, attention_mask = pad_prompts([token_lists[row] for row in rows], prefix_length)
+        options = {"num_return_sequences": samples}
+        if cache is not None:
+            # generate does not expand a cache it is given, so repeat the rows here
+            input_ids = input_ids.repeat_interleave(samples, dim=0)
+            attention_mask = attention_mask.repeat_interleave(samples, dim=0)
+            past_key_values = copy.deepcopy(cache)
+            past_key_values.batch_repeat_interleave(input_ids.shape[0])
+            options = {"past_key_values": past_key_values}
+        if legal_moves is not None:
+            tries = [LegalMoveTrie(legal_moves[row]) if legal_moves[row] else None for row in rows]
+            options["logits_processor"] = LogitsProcessorList(
+                [LegalMoveProcessor(tries, samples, input_ids.shape[1])])
 
-        max_tokens = int(data.get('max_tokens', 150))
-        temperature = float(data.get('temperature', 0.1))
-        do_sample = temperature > 0
-        
         with torch.no_grad():
             outputs = model.generate(
-                **inputs, 
+                input_ids=input_ids,
+                attention_mask=attention_mask,
                 max_new_tokens=max_tokens,
                 temperature=temperature,
                 do_sample=do_sample,
-                pad_token_id=tokenizer.eos_token_id,
+                pad_token_id=tokenizer.pad_token_id,
                 eos_token_id=tokenizer.eos_token_id,
+                **options,
             )
-            
-        # Only decode generated tokens to avoid echoing the prompt
-        generated_tokens = outputs[0][inputs.input_ids.shape[1]:]
-        content = tokenizer.decode(generated_tokens, skip_special_tokens=True).strip()
-            
-        response = {
-            "id": "chatcmpl-transformers",
-            "object": "chat.completion",
-            "created": 1234567890,
-            "model": "chess-agent",
-            "choices": [{
-                "index": 0,
-                "message": {
-                    "role": "assistant",
-                    "content": content
-                },
-                "finish_reason": "stop"
-            }],
-            "usage": {
-                "prompt_tokens": inputs.input_ids.shape[1],
-                "completion_tokens": outputs.shape[1] - inputs.input_ids.shape[1],
-                "total_tokens": outputs.shape[1]
-            }
-        }
-        return jsonify(response)
-    
+
+        # Only decode generated tokens to avoid echoing the prompt; the samples of
+        # the i-th row are rows i*samples .. i*samples + samples - 1
+        generated = outputs[:, input_ids.shape[1]:]
+        for position, row in enumerate(rows):
+            contents = []
+            completion_tokens = 0
+            for generated_tokens in generated[position * samples:(position + 1) * samples]:
+                completion_tokens += completion_length(generated_tokens)
+                contents.append(tokenizer.decode(generated_tokens, skip_special_tokens=True).strip())
+            if samples < n:
+                contents = contents * n
+                completion_tokens *= n
+            results[row] = (contents, len(token_lists[row]), completion_tokens, prefix_length)
+    return results
+
+
+def complete_chats(payloads):
+    """
+    Answer a list of chat-completions request bodies.
+
+    Requests sharing generation parameters are generated together in one batch.
+
+    Returns:
+        (chat.completion body or {"error": ...}, HTTP status) per payload, in order
+    """
+    responses = [None] * len(payloads)
+    groups = {}
+    for index, data in enumerate(payloads):
+        messages = (data or {}).get('messages') or []
+        if not messages:
+            responses[index] = {"error": "'messages' field is required"}, 400
+            continue
+        if data.get('score_moves', score_by_default):
+            # Answer with the best-scoring legal move instead of generating
+            result, status = score_request(data)
+            if status != 200:
+                responses[index] = result, status
+            else:
+                content = f"<think>{result['rationale']}</think><uci_move>{result['move']}</uci_move>"
+                usage = result["usage"]
+                responses[index] = completion_response([content] * max(1, int(data.get('n') or 1)),
+                                                       usage["prompt_tokens"], 0,
+                                                       usage["prompt_tokens_details"]["cached_tokens"]), 200
+            continue
+        try:
+            augmented_messages = maybe_augment_messages_with_heuristics(messages)
+            text = tokenizer.apply_chat_template(augmented_messages, tokenize=False, add_generation_prompt=True)
+            constrain = bool(data.get('constrain_moves', constrain_by_default))
+            params = (int(data.get('max_tokens', 150)), float(data.get('temperature', 0.1)),
+                      max(1, int(data.get('n') or 1)), constrain)
+        except Exception as e:
+            responses[index] = {"error": str(e)}, 500
+            continue
+        moves = None
+        if constrain:
+            board = board_from_messages(messages)
+            moves = [move.uci() for move in board.legal_moves] if board is not None else None
+        groups.setdefault(params, []).append((index, text, moves))
+
+    for (max_tokens, temperature, n, constrain), items in groups.items():
+        try:
+            generated = generate_batch([text for _, text, _ in items], max_tokens, temperature, n,
+                                       legal_moves=[moves for _, _, moves in items] if constrain else None)
+        except Exception as e:
+            print(f"Error generating response: {e}")
+            for index, _, _ in items:
+                responses[index] = {"error": str(e)}, 500
+            continue
+        for (index, _, _), (contents, prompt_tokens, completion_tokens, cached_tokens) in zip(items, generated):
+            responses[index] = completion_response(contents, prompt_tokens, completion_tokens, cached_tokens), 200
+    return responses
+
+
+def score_moves(text, moves):
+    """
+    Log-likelihood of answering with each move, teacher-forced after the prompt.
+
+    The prompt is prefilled once (starting from the prefix cache when enabled).
+    Every candidate `<uci_move>move</uci_move>` is then one row of a batched
+    forward pass over a copy of the prompt's KV cache, so the cost is one
+    prefill plus a few tokens per legal move, with no sampling. Leading tokens
+    all candidates share (the opening tag) go into the prompt instead, as they
+    score the same for every move.
+
+    Returns:
+        ([log-likelihood per move], prompt_tokens, cached_tokens)
+    """
+    prompt_ids = tokenizer(text)["input_ids"]
+    continuations = [tokenizer(f"<uci_move>{move}</uci_move>", add_special_tokens=False)["input_ids"]
+                     for move in moves]
+    shared = min(min(common_prefix_length(continuations[0], ids) for ids in continuations),
+                 min(len(ids) for ids in continuations) - 1)
+    context = prompt_ids + continuations[0][:shared]
+    continuations = [ids[shared:] for ids in continuations]
+
+    cached_tokens, past = 0, DynamicCache()
+    if prefix_cache is not None:
+        (_, cached_tokens, cache), = prefix_cache.plan([prompt_ids])
+        if cache is not None:
+            past = copy.deepcopy(cache)
+
+    scores = []
+    with torch.no_grad():
+        logits = model(input_ids=torch.tensor([context[cached_tokens:]], device=model.device),
+                       past_key_values=past, use_cache=True).logits
+        first = torch.log_softmax(logits[0, -1].float(), dim=-1)
+        for start in range(0, len(continuations), SCORE_CHUNK):
+            chunk = continuations[start:start + SCORE_CHUNK]
+            width = max(len(ids) for ids in chunk)
+            input_ids = torch.tensor([ids + [tokenizer.pad_token_id] * (width - len(ids)) for ids in chunk],
+                                     device=model.device)
+            mask = torch.tensor([[1] * len(ids) + [0] * (width - len(ids)) for ids in chunk], device=model.device)
+            attention_mask = torch.cat([torch.ones(len(chunk), len(context), dtype=mask.dtype, device=model.device),
+                                        mask], dim=1)
+            rows = copy.deepcopy(past)
+            rows.batch_repeat_interleave(len(chunk))
+            logits = model(input_ids=input_ids, attention_mask=attention_mask,
+                           past_key_values=rows, use_cache=True).logits
+            # Token j of a candidate is predicted at position j-1, its first token by the prompt
+            logprobs = torch.log_softmax(logits[:, :-1].float(), dim=-1)
+            token_scores = logprobs.gather(-1, input_ids[:, 1:].unsqueeze(-1)).squeeze(-1) * mask[:, 1:]
+            scores += (first[input_ids[:, 0]] + token_scores.sum(-1)).tolist()
+    return scores, len(prompt_ids), cached_tokens
+
+
+def move_rationale(moves, probabilities, board=None):
+    """One-sentence summary of the scoring, naming the best move and the runners-up."""
+    order = sorted(range(len(moves)), key=lambda i: -probabilities[i])
+
+    def name(i):
+        try:
+            move = chess.Move.from_uci(moves[i])
+        except ValueError:
+            return moves[i]
+        if board is None or move not in board.legal_moves:
+            return moves[i]
+        return f"{board.san(move)} ({moves[i]})"
+
+    text = f"{name(order[0])} is the most likely of {len(moves)} legal moves ({probabilities[order[0]]:.0%})"
+    if len(order) > 1:
+        text += "; next: " + ", ".join(f"{name(i)} {probabilities[i]:.0%}" for i in order[1:3])
+    return text + "."
+
+
+def score_request(data):
+    """
+    Pick a move for one request body by scoring the legal moves.
+
+    The candidates are the body's `moves` list if given, else the legal moves
+    of the FEN in the last message.
+
+    Returns:
+        (result dict with move, rationale, scores and usage, HTTP status)
+    """
+    messages = (data or {}).get('messages') or []
+    if not messages:
+        return {"error": "'messages' field is required"}, 400
+    board = board_from_messages(messages)
+    moves = data.get('moves')
+    if not moves and board is not None:
+        moves = [move.uci() for move in board.legal_moves]
+    if not moves or not all(isinstance(move, str) for move in moves):
+        return {"error": "No legal moves: give 'moves' or a FEN in the last message"}, 400
+    try:
+        augmented_messages = maybe_augment_messages_with_heuristics(messages)
+        text = tokenizer.apply_chat_template(augmented_messages, tokenize=False, add_generation_prompt=True)
+        scores, prompt_tokens, cached_tokens = score_moves(text, moves)
     except Exception as e:
-        print(f"Error generating response: {e}")
-        return jsonify({"error": str(e)}), 500
+        print(f"Error scoring moves: {e}")
+        return {"error": str(e)}, 500
+
+    # Renormalized over the candidates
+    probabilities = torch.softmax(torch.tensor(scores), dim=0).tolist()
+    ranked = sorted(zip(moves, scores, probabilities), key=lambda item: -item[1])
+    return {
+        "object": "move.scores",
+        "model": "chess-agent",
+        "move": ranked[0][0],
+        "rationale": move_rationale(moves, probabilities, board),
+        "scores": [{"move": move, "logprob": score, "probability": probability}
+                   for move, score, probability in ranked],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+            "scored_moves": len(moves),
+        },
+    }, 200
+
+
+def serve_score_moves(payloads):
+    """/v1/score_moves backend for the serving core."""
+    return [score_request(data) for data in payloads]
+
 
-@app.route('/health', methods=['GET'])
 def health():
     if model is None:
-        return jsonify({"status": "loading"}), 503
-    return jsonify({"status": "healthy"})
+        return {"status": "loading"}, 503
+    body = {"status": "healthy"}
+    if prefix_cache is not None:
+        body["prefix_cache"] = prefix_cache.stats()
+    body["constrained_decoding"] = dict(constraint_stats)
+    return body, 200
 
 if __name__ == '__main__':
     # AIcrowd usually sets environment variables or we pass them via args
@@ -215,7 +743,32 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument("--model", type=str, default="bot-rakshit/qwen-chess-0.5b-sft-v1")
     parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--max-batch-size", type=int, default=16,
+                        help="Most requests generated together in one batch (1 disables batching)")
+    parser.add_argument("--max-wait-ms", type=float, default=10.0,
+                        help="How long the first request of a batch waits for others to join")
+    parser.add_argument("--prefix-cache", action="store_true",
+                        help="Prefill the prompts' common prefix once and reuse its KV cache")
+    parser.add_argument("--prefix-min-tokens", type=int, default=16,
+                        help="Shortest shared prefix worth caching")
+    parser.add_argument("--constrain-moves", action="store_true",
+                        help="Only let the model write a legal move inside <uci_move> "
+                             "(per request: \"constrain_moves\": true)")
+    parser.add_argument("--score-moves", action="store_true",
+                        help="Answer chat completions by scoring every legal move instead of generating "
+                             "(per request: \"score_moves\": true)")
+    add_serving_arguments(parser)
     args = parser.parse_args()
     
     load_model(args.model)
-    app.run(host='0.0.0.0', port=args.port, debug=False)
+    if args.prefix_cache:
+        prefix_cache = PrefixCache(min_tokens=args.prefix_min_tokens)
+    score_by_default = args.score_moves
+    constrain_by_default = args.constrain_moves
+    # One worker owns the model: concurrent requests are queued and generated in batches
+    core = ServingCore(workers=1, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms,
+                       max_queue=args.max_queue, request_timeout=args.request_timeout)
+    core.add_chat_routes(complete_chats)
+    core.add_route("/v1/score_moves", serve_score_moves)
+    core.health = health
+    core.run('0.0.0.0', args.port)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Move-quality evaluation on a fixed suite of positions.
+
+Full games are a slow way to measure move quality: up to 200 plies, played one
+after another, with the opponent's moves in between. A position suite instead
+asks the model for one move in each of a fixed set of positions, all of them
+independently and in parallel, and scores every move against Stockfish's top
+lines for that position.
+
+The suite is a JSONL file in the format written by
+train_scripts/generate_positions.py:
+
+    {"fen": "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3", "phase": "opening"}
+
+Reference lines (Stockfish's REFERENCE_LINES best moves, via multipv) are kept in
+the evaluation cache, so re-running a suite against a new checkpoint only
+queries the endpoint. Each move is scored by
+
+  centipawn loss   best line's score minus the played move's score, from the
+                   mover's point of view (moves outside the reference lines are
+                   scored by evaluating the position after them)
+  top-1 / top-3    whether the move is Stockfish's best / among its best three
+  legality         whether the first reply gave a legal move (possibly after a
+                   local repair, which is counted separately)
+"""
+
+import json
+import statistics
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import chess
+import chess.engine
+
+from engine_pool import EnginePool, terminal_score
+from eval_cache import MATE_SCORE, EvalCache, limits_key
+
+# Number of Stockfish lines stored per position (top-1 and top-3 agreement)
+REFERENCE_LINES = 3
+
+
+def load_suite(path: str) -> List[dict]:
+    """
+    Read a position suite.
+
+    Args:
+        path: JSONL file with one {"fen": ..., "phase": ...} object per line
+
+    Returns:
+        List of position dictionaries ("phase" defaults to "unknown"); positions
+        without a legal move (mate, stalemate) are skipped
+    """
+    positions = []
+    with open(path) as f:
+        for line_num, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "fen" not in record:
+                raise ValueError(f"{path}:{line_num}: missing 'fen'")
+            # Fail on a malformed FEN before any request is sent
+            board = chess.Board(record["fen"])
+            if board.is_game_over():
+                continue
+            positions.append({"fen": record["fen"], "phase": record.get("phase", "unknown")})
+    return positions
+
+
+@dataclass
+class PositionResult:
+    """Outcome of one suite position."""
+    fen: str
+    phase: str
+    move: Optional[str]  # UCI move finally played, None if no legal move was given
+    legal_first_try: bool
+    attempts: int
+    repair: Optional[str] = None  # move_repair repair that produced the move, if any
+    best_move: Optional[str] = None
+    cp_loss: Optional[int] = None
+    top1: bool = False
+    top3: bool = False
+    latency_s: float = 0.0
+
+
+class SuiteReferences:
+    """Cached Stockfish multipv references for suite positions, on pool engines."""
+
+    def __init__(self, pool: EnginePool, depth: int = 7, movetime_ms: int = 1000,
+                 cache: Optional[EvalCache] = None):
+        self.pool = pool
+        self.limit = chess.engine.Limit(depth=depth, time=movetime_ms / 1000.0)
+        self.cache = cache
+        self.cache_limits = limits_key(depth, movetime_ms)
+        self.lines_limits = f"{self.cache_limits},multipv={REFERENCE_LINES}"
+
+    def lines(self, board: chess.Board) -> List[Tuple[str, int]]:
+        """
+        Stockfish's best moves in a position.
+
+        Args:
+            board: Position to analyze
+
+        Returns:
+            [(uci move, centipawns for the side to move), ...] best first
+        """
+        if self.cache is not None:
+            lines = self.cache.get_lines(board, self.lines_limits)
+            if lines is not None:
+                return lines
+        with self.pool.lease(options={"Skill Level": 20}, limit=self.limit, background=True) as lease:
+            infos = lease.analyse(board, multipv=REFERENCE_LINES)
+        lines = [(info["pv"][0].uci(), info["score"].relative.score(mate_score=MATE_SCORE))
+                 for info in infos if info.get("pv")]
+        if self.cache is not None:
+            self.cache.put_lines(board, self.lines_limits, lines)
+        return lines
+
+    def move_score(self, board: chess.Board, move: chess.Move, lines: List[Tuple[str, int]]) -> int:
+        """
+        Score of playing `move`, in centipawns for the side to move.
+
+        Moves among the reference lines take the line's score; others are
+        scored by evaluating the position after the move.
+        """
+        for uci, score in lines:
+            if uci == move.uci():
+                return score
+        after = board.copy(stack=False)
+        after.push(move)
+        outcome = after.outcome()
+        if outcome is not None:
+            white_score = terminal_score(outcome)
+        else:
+            white_score = self.cache.get(after, self.cache_limits) if self.cache is not None else None
+            if white_score is None:
+                with self.pool.lease(options={"Skill Level": 20}, limit=self.limit, background=True) as lease:
+                    info = lease.analyse(after)
+                white_score = info["score"].white().score(mate_score=MATE_SCORE)
+                if self.cache is not None:
+                    self.cache.put(after, self.cache_limits, white_score)
+        return white_score if board.turn == chess.WHITE else -white_score
+
+    def score(self, result: PositionResult, lines: List[Tuple[str, int]]):
+        """Fill in best move, centipawn loss and agreement of a result."""
+        if not lines:
+            return
+        result.best_move = lines[0][0]
+        if result.move is None:
+            return
+        board = chess.Board(result.fen)
+        played = self.move_score(board, chess.Move.from_uci(result.move), lines)
+        result.cp_loss = max(0, lines[0][1] - played)
+        top_moves = [uci for uci, _ in lines]
+        result.top1 = result.move == top_moves[0]
+        result.top3 = result.move in top_moves[:3]
+
+
+def summarize_suite(results: List[PositionResult]) -> Dict[str, dict]:
+    """
+    Aggregate suite results overall and per game phase.
+
+    Args:
+        results: One PositionResult per suite position
+
+    Returns:
+        {"all": {...}, "<phase>": {...}} with positions, legality rates, mean and
+        median centipawn loss and top-1/top-3 agreement (over scored moves)
+    """
+    groups: Dict[str, List[PositionResult]] = defaultdict(list)
+    for result in results:
+        groups["all"].append(result)
+        groups[result.phase].append(result)
+
+    summary = {}
+    for name, group in groups.items():
+        scored = [r for r in group if r.cp_loss is not None]
+        losses = [r.cp_loss for r in scored]
+        summary[name] = {
+            "positions": len(group),
+            "legal_first_try": sum(r.legal_first_try for r in group) / len(group),
+            "legal": sum(r.move is not None for r in group) / len(group),
+            "repaired": sum(r.repair is not None for r in group) / len(group),
+            "scored": len(scored),
+            "mean_cp_loss": statistics.mean(losses) if losses else 0.0,
+            "median_cp_loss": statistics.median(losses) if losses else 0.0,
+            "top1": sum(r.top1 for r in scored) / len(scored) if scored else 0.0,
+            "top3": sum(r.top3 for r in scored) / len(scored) if scored else 0.0,
+        }
+    return summary
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Append-only journal of the games completed in an evaluation run.
+
+Every finished game (with its ACPL analysis) is appended to
+`runs/<run-id>.jsonl` as soon as it completes and flushed to disk, so a run that
+dies at game 180 of 200 keeps its first 179 results. `--resume <run-id>` loads
+the journal, schedules only the missing (opponent, color, game) slots and
+rebuilds the results from journal plus new games.
+
+    {"type": "run", "run_id": "20250101_120000", "config": {...}}
+    {"type": "game", "opponent": "...", "color": "white", "game_num": 3, "stats": {...}}
+    ...
+
+A line cut short by a crash is ignored when the journal is loaded.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+DEFAULT_RUNS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "runs")
+
+# (opponent name, player color, game number)
+GameKey = Tuple[str, str, int]
+
+
+class RunJournal:
+    """Durable record of completed games for one run."""
+
+    def __init__(self, path: str, run_id: str, config: dict,
+                 completed: Optional[Dict[GameKey, dict]] = None):
+        self.path = path
+        self.run_id = run_id
+        self.config = config
+        self.completed: Dict[GameKey, dict] = completed or {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, config: dict, run_id: Optional[str] = None,
+               directory: str = DEFAULT_RUNS_DIR) -> "RunJournal":
+        """
+        Start the journal of a new run.
+
+        Args:
+            config: Run settings worth checking on resume (endpoint, games, ...)
+            run_id: Run identifier (default: current timestamp)
+            directory: Directory holding the journals
+
+        Returns:
+            RunJournal with no completed games
+        """
+        run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{run_id}.jsonl")
+        if os.path.exists(path):
+            raise FileExistsError(f"run journal {path} already exists (use --resume {run_id})")
+        journal = cls(path, run_id, config)
+        journal._append({"type": "run", "run_id": run_id, "created": datetime.now().isoformat(),
+                         "config": config})
+        return journal
+
+    @classmethod
+    def load(cls, run_id: str, directory: str = DEFAULT_RUNS_DIR) -> "RunJournal":
+        """
+        Open the journal of an earlier run to resume it.
+
+        Args:
+            run_id: Run identifier printed when the run started
+            directory: Directory holding the journals
+
+        Returns:
+            RunJournal with the games completed so far
+        """
+        path = os.path.join(directory, f"{run_id}.jsonl")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"no run journal at {path}")
+        config: dict = {}
+        completed: Dict[GameKey, dict] = {}
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Partial line from a crash mid-write
+                    continue
+                if record.get("type") == "run":
+                    config = record.get("config", {})
+                elif record.get("type") == "game":
+                    key = (record["opponent"], record["color"], record["game_num"])
+                    completed[key] = record["stats"]
+        return cls(path, run_id, config, completed)
+
+    def _append(self, record: dict):
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            # Start on a fresh line if a crash left the last one unterminated
+            with open(self.path, "a+b") as f:
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        f.write(b"\n")
+                f.write(line.encode())
+                f.flush()
+                os.fsync(f.fileno())
+
+    def record_game(self, opponent: str, color: str, game_num: int, stats: dict):
+        """
+        Durably record a completed (and analyzed) game.
+
+        Args:
+            opponent: Opponent name
+            color: Player color ("white" or "black")
+            game_num: Game number against this opponent
+            stats: JSON-serializable game statistics
+        """
+        self._append({"type": "game", "opponent": opponent, "color": color,
+                      "game_num": game_num, "stats": stats})
+        with self._lock:
+            self.completed[(opponent, color, game_num)] = stats
+
+    def config_differences(self, config: dict) -> Dict[str, Tuple[object, object]]:
+        """Settings that differ from the journaled run: name -> (journaled, given)."""
+        return {name: (self.config.get(name), value) for name, value in config.items()
+                if name in self.config and self.config[name] != value}
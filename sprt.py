@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Sequential probability ratio test (SPRT) on game results.
+
+Tests H0: Elo <= elo0 against H1: Elo >= elo1 for the player's Elo difference
+to an opponent, updating after every game. The log-likelihood ratio uses the
+usual normal approximation over win/draw/loss results (as in fishtest's GSPRT):
+
+    LLR = N * (s1 - s0) * (2 * mean - s0 - s1) / (2 * variance)
+
+where s0/s1 are the expected scores at elo0/elo1 and mean/variance are those of
+the observed game scores (with half a pseudo-game per outcome). The test stops
+once LLR leaves
+
+    [log(beta / (1 - alpha)), log((1 - beta) / alpha)]
+
+accepting H0 below the lower bound and H1 above the upper one. With
+alpha = beta = 0.05 the bounds are about -2.94 and +2.94.
+
+    test = SPRT(elo0=0, elo1=50)
+    for score in (1, 0.5, 1, ...):
+        test.add(score)
+        if test.decision:
+            break
+"""
+
+import math
+from typing import Optional
+
+
+def expected_score(elo: float) -> float:
+    """Expected score at an Elo difference of `elo` (logistic model)."""
+    return 1.0 / (1.0 + 10.0 ** (-elo / 400.0))
+
+
+class SPRT:
+    """Running SPRT over game scores (1 win, 0.5 draw, 0 loss)."""
+
+    def __init__(self, elo0: float, elo1: float, alpha: float = 0.05, beta: float = 0.05):
+        """
+        Initialize the test.
+
+        Args:
+            elo0: Elo difference under H0
+            elo1: Elo difference under H1 (greater than elo0)
+            alpha: Probability of accepting H1 when H0 is true
+            beta: Probability of accepting H0 when H1 is true
+        """
+        if elo1 <= elo0:
+            raise ValueError("SPRT needs elo1 > elo0")
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        self.decision: Optional[str] = None  # "H0" or "H1" once the test has stopped
+        self.decided_at: Optional[int] = None  # games counted when it stopped
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    def add(self, score: float) -> Optional[str]:
+        """
+        Count one game and re-test.
+
+        Args:
+            score: 1.0 for a win, 0.5 for a draw, 0.0 for a loss
+
+        Returns:
+            "H0" or "H1" if the test has stopped, else None
+        """
+        if score >= 1.0:
+            self.wins += 1
+        elif score <= 0.0:
+            self.losses += 1
+        else:
+            self.draws += 1
+        if self.decision is None:
+            llr = self.llr()
+            if llr >= self.upper:
+                self.decision = "H1"
+            elif llr <= self.lower:
+                self.decision = "H0"
+            if self.decision is not None:
+                self.decided_at = self.games
+        return self.decision
+
+    def llr(self) -> float:
+        """Log-likelihood ratio of H1 against H0 for the games so far."""
+        if self.games == 0:
+            return 0.0
+        # Half a pseudo-game per outcome keeps the variance positive when every
+        # result so far is the same (e.g. 30 wins out of 30)
+        wins, draws, losses = self.wins + 0.5, self.draws + 0.5, self.losses + 0.5
+        n = wins + draws + losses
+        mean = (wins + 0.5 * draws) / n
+        variance = (wins * (1.0 - mean) ** 2 + draws * (0.5 - mean) ** 2 + losses * mean ** 2) / n
+        s0 = expected_score(self.elo0)
+        s1 = expected_score(self.elo1)
+        return n * (s1 - s0) * (2 * mean - s0 - s1) / (2 * variance)
+
+    def summary(self) -> str:
+        """One-line state of the test for reports."""
+        hypothesis = {"H0": f"H0 (Elo <= {self.elo0:g})", "H1": f"H1 (Elo >= {self.elo1:g})"}
+        state = (f"accepted {hypothesis[self.decision]} after {self.decided_at} games"
+                 if self.decision else "no decision")
+        return (f"SPRT [{self.elo0:g}, {self.elo1:g}]: {state}; LLR {self.llr():.2f} "
+                f"in [{self.lower:.2f}, {self.upper:.2f}], "
+                f"+{self.wins} ={self.draws} -{self.losses}")
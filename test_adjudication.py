@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Tests for the adjudication rules in adjudication.py"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import chess
+
+from adjudication import Adjudication, Adjudicator, is_adjudicated
+from engine_pool import GameAnalysis
+
+
+def board_at_ply(ply):
+    """A board whose move stack holds `ply` plies (knights shuffling back and forth)."""
+    board = chess.Board()
+    shuffle = ["g1f3", "g8f6", "f3g1", "f6g8"]
+    for i in range(ply):
+        board.push_uci(shuffle[i % 4])
+    return board
+
+
+def adjudicator(evals, **rules):
+    return Adjudication(**rules).start_game(lambda board: evals)
+
+
+def test_window_latest_complete_run():
+    evals = {p: 0 for p in range(10)}
+    assert Adjudicator._window(evals, 4, 9) == (6, [0, 0, 0, 0])
+
+
+def test_window_ends_before_missing_plies():
+    # Pipelined evals finish out of order: plies 8 and 9 are not in yet
+    evals = {p: p for p in range(8)}
+    assert Adjudicator._window(evals, 4, 9) == (4, [4, 5, 6, 7])
+
+
+def test_window_none_when_too_few_or_too_far_back():
+    assert Adjudicator._window({0: 0, 1: 0}, 4, 9) is None
+    # Only windows ending within 2 * plies of the current ply are looked at
+    evals = {p: 0 for p in range(4)}
+    assert Adjudicator._window(evals, 4, 20) is None
+
+
+def test_resign_for_either_side():
+    white = adjudicator({p: 900 for p in range(8)}, resign_cp=800, resign_plies=8)
+    result = white.check(board_at_ply(8))
+    assert result == "White wins (adjudicated: eval above +800 for 8 plies)"
+    assert is_adjudicated(result)
+
+    black = adjudicator({p: -900 for p in range(8)}, resign_cp=800, resign_plies=8)
+    assert black.check(board_at_ply(8)).startswith("Black wins (adjudicated:")
+
+
+def test_resign_needs_every_ply_beyond_the_threshold():
+    evals = {p: 900 for p in range(8)}
+    evals[5] = 700
+    assert adjudicator(evals, resign_cp=800, resign_plies=8).check(board_at_ply(8)) is None
+
+
+def test_draw_only_after_draw_after_move():
+    rules = dict(draw_cp=10, draw_plies=8, draw_after_move=40)
+    quiet = {p: 5 for p in range(120)}
+    # Window (plies 72..79) starts before move 40 (ply 80)
+    assert adjudicator(quiet, **rules).check(board_at_ply(80)) is None
+    # Window (plies 80..87) lies entirely after it
+    result = adjudicator(quiet, **rules).check(board_at_ply(88))
+    assert result == "Draw (adjudicated: |eval| within 10 for 8 plies)"
+
+
+def test_draw_needs_every_ply_within_the_threshold():
+    evals = {p: 5 for p in range(100)}
+    evals[95] = 40
+    assert adjudicator(evals, draw_cp=10, draw_plies=8, draw_after_move=40).check(board_at_ply(97)) is None
+
+
+def test_no_rules_no_evals():
+    rules = Adjudication()
+    assert not rules.needs_evals
+    game = rules.start_game(lambda board: {p: 5000 for p in range(100)})
+    assert game.evals is None
+    assert game.check(board_at_ply(50)) is None
+    assert rules.describe() == "Disabled"
+
+
+def test_is_adjudicated():
+    assert not is_adjudicated("White wins (checkmate)")
+    assert is_adjudicated("Draw (adjudicated: tablebase)")
+
+
+def test_pipeline_evals_do_not_wait_for_running_analyses():
+    release = threading.Event()
+
+    def evaluate(board, game):
+        ply = board.ply()  # queued without its move stack
+        if ply == 3:
+            release.wait()
+        return 100 * ply
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        analysis = GameAnalysis(SimpleNamespace(executor=executor, evaluate=evaluate))
+        for ply in range(5):
+            analysis.add_position(board_at_ply(ply))
+        for ply in (0, 1, 2, 4):
+            analysis._futures[ply].result()
+
+        # Ply 3 is still being analysed: left out instead of blocking the game
+        assert analysis.evals_before(board_at_ply(5)) == {0: 0, 1: 100, 2: 200, 4: 400}
+        release.set()
+        analysis._futures[3].result()
+        assert analysis.evals_before(board_at_ply(5))[3] == 300
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Tests for the position-evaluation cache in eval_cache.py"""
+import threading
+
+import chess
+
+from eval_cache import EvalCache, limits_key, position_key
+
+
+def test_limits_key():
+    assert limits_key(depth=7, movetime_ms=1000) == "depth=7,movetime_ms=1000"
+    assert limits_key(depth=10) == "depth=10"
+    assert limits_key() == ""
+
+
+def test_position_key_ignores_move_clocks():
+    board = chess.Board()
+    for uci in ("g1f3", "g8f6", "f3g1", "f6g8"):
+        board.push_uci(uci)
+    # Same position as the start, different halfmove and fullmove counters
+    assert position_key(board) == position_key(chess.Board())
+    assert position_key(board) == chess.Board().epd()
+
+
+def test_keyed_on_position_and_limits(tmp_path):
+    cache = EvalCache(str(tmp_path / "cache.sqlite3"))
+    start = chess.Board()
+    after_e4 = chess.Board()
+    after_e4.push_uci("e2e4")
+
+    cache.put(start, limits_key(depth=7, movetime_ms=1000), 25)
+    assert cache.get(start, limits_key(depth=7, movetime_ms=1000)) == 25
+    # Other limits or another position are misses
+    assert cache.get(start, limits_key(depth=10)) is None
+    assert cache.get(after_e4, limits_key(depth=7, movetime_ms=1000)) is None
+    assert (cache.hits, cache.misses, cache.writes) == (1, 2, 1)
+
+    cache.put(start, limits_key(depth=7, movetime_ms=1000), 30)
+    assert cache.get(start, limits_key(depth=7, movetime_ms=1000)) == 30
+
+
+def test_persists_across_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = EvalCache(path)
+    cache.put(chess.Board(), "depth=7", -10000)
+    cache.put_lines(chess.Board(), "depth=7,multipv=3", [("e2e4", 30), ("d2d4", 25)])
+    cache.close()
+
+    reopened = EvalCache(path)
+    assert reopened.get(chess.Board(), "depth=7") == -10000
+    assert reopened.get_lines(chess.Board(), "depth=7,multipv=3") == [("e2e4", 30), ("d2d4", 25)]
+    assert reopened.get_lines(chess.Board(), "depth=7,multipv=1") is None
+
+
+def test_threads_use_their_own_connections(tmp_path):
+    cache = EvalCache(str(tmp_path / "cache.sqlite3"))
+    board = chess.Board()
+
+    def work(score):
+        cache.put(board, f"depth={score}", score)
+        assert cache.get(board, f"depth={score}") == score
+
+    threads = [threading.Thread(target=work, args=(score,)) for score in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [cache.get(board, f"depth={score}") for score in range(8)] == list(range(8))
+    assert cache.writes == 8
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Tests for the append-only game log store in game_log_store.py"""
+import json
+import os
+
+from game_log_store import GameLogStore
+
+
+def record(opponent, color, result, moves, timestamp):
+    return {
+        "timestamp": timestamp,
+        "opponent": opponent,
+        "player_color": color,
+        "result": result,
+        "moves_played": moves,
+        "player_acpl": 42.5,
+        "opponent_acpl": 10.0,
+        "move_history": ["e2e4"] * moves,
+    }
+
+
+def test_append_and_load_by_offset(tmp_path):
+    store = GameLogStore(str(tmp_path))
+    games = [record("Random", "white", "White wins", 3, "20250101_000001"),
+             record("Random", "black", "Dräw — unicode", 5, "20250101_000002"),
+             record("Stockfish", "white", "Black wins", 7, "20250101_000003")]
+    for i, game in enumerate(games):
+        store.append("run1", f"game_{i}", game)
+
+    # Every record comes back from its own byte range, not just the first line
+    for i, game in enumerate(games):
+        assert store.load_game(f"game_{i}") == game
+    with open(os.path.join(str(tmp_path), "run1.games.jsonl"), "rb") as f:
+        assert len(f.read().splitlines()) == 3
+    assert store.load_game("unknown") is None
+
+
+def test_list_and_filter(tmp_path):
+    store = GameLogStore(str(tmp_path))
+    store.append("run1", "a", record("Random", "white", "White wins (checkmate)", 3, "20250101_000001"))
+    store.append("run1", "b", record("Random", "black", "Draw (stalemate)", 5, "20250101_000002"))
+    store.append("run2", "c", record("Stockfish", "white", "Black wins (checkmate)", 7, "20250101_000003"))
+
+    assert [game["id"] for game in store.list_games()] == ["c", "b", "a"]
+    assert [game["id"] for game in store.list_games(run_id="run1")] == ["b", "a"]
+    assert [game["id"] for game in store.list_games(opponent="Random", player_color="white")] == ["a"]
+    assert [game["id"] for game in store.list_games(result="checkmate")] == ["c", "a"]
+    assert [game["id"] for game in store.list_games(limit=1)] == ["c"]
+    summary = store.list_games(run_id="run2")[0]
+    assert summary["moves_played"] == 7 and summary["player_acpl"] == 42.5
+    assert "move_history" not in summary
+
+
+def test_index_per_file_logs_once(tmp_path):
+    game = record("Random", "white", "White wins", 3, "20250101_000001")
+    with open(os.path.join(str(tmp_path), "game_old.json"), "w") as f:
+        json.dump(game, f, indent=2)
+    store = GameLogStore(str(tmp_path))
+
+    assert store.index_files() == 1
+    assert store.index_files() == 0
+    assert store.load_game("game_old.json") == game
+
+
+def test_export_files(tmp_path):
+    store = GameLogStore(str(tmp_path))
+    game = record("Random", "white", "White wins", 3, "20250101_000001")
+    store.append("run1", "game_a", game)
+
+    paths = store.export_files("run1", str(tmp_path / "out"))
+    assert [os.path.basename(path) for path in paths] == ["game_a.json"]
+    with open(paths[0]) as f:
+        assert json.load(f) == game
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Tests for the run-wide game scheduler in game_scheduler.py"""
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from game_scheduler import GameScheduler, GameTask
+
+
+def task(opponent, color, game_num):
+    return GameTask(opponent, None, color, game_num, 4, "20250101_000000")
+
+
+def test_expected_plies_starts_at_max_moves():
+    scheduler = GameScheduler(max_moves=200)
+    short = task("Random", "white", 1)
+    assert scheduler.expected_plies(short) == 200
+    scheduler.record(short, 40)
+    scheduler.record(short, 60)
+    # One pseudo-game at max_moves
+    assert scheduler.expected_plies(short) == (40 + 60 + 200) / 3
+    assert scheduler.expected_plies(task("Random", "black", 2)) == 200
+
+
+def test_longest_expected_game_first():
+    scheduler = GameScheduler(max_games=1, max_moves=200)
+    scheduler.record(task("Random", "white", 0), 20)
+    order = []
+    scheduler.run([task("Random", "white", 1), task("Stockfish", "white", 2), task("Random", "white", 3)],
+                  lambda t: order.append(t.game_num) or SimpleNamespace(moves_played=20))
+    assert order == [2, 1, 3]
+
+
+def test_max_games_bounds_concurrency():
+    scheduler = GameScheduler(max_games=3)
+    running, peak = 0, 0
+    lock = threading.Lock()
+
+    def play(t):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        return SimpleNamespace(moves_played=10)
+
+    results = scheduler.run([task("Random", "white", i) for i in range(12)], play)
+    assert len(results) == 12
+    assert peak <= 3
+
+
+def test_failed_games_are_skipped_and_results_reported():
+    scheduler = GameScheduler(max_games=2)
+    seen = []
+
+    def play(t):
+        if t.game_num == 2:
+            raise RuntimeError("endpoint down")
+        return SimpleNamespace(moves_played=10)
+
+    results = scheduler.run([task("Random", "white", i) for i in range(1, 4)], play,
+                            on_result=lambda t, stats: seen.append(t.game_num))
+    assert sorted(t.game_num for t, _ in results) == [1, 3]
+    assert sorted(seen) == [1, 3]
+
+
+def test_cancel_drops_pending_tasks():
+    scheduler = GameScheduler(max_games=1)
+    played = []
+
+    def play(t):
+        played.append(t.game_num)
+        # Stop after the first game, as SPRT does once decided
+        scheduler.cancel(lambda pending: pending.opponent_name == "Random")
+        return SimpleNamespace(moves_played=10)
+
+    scheduler.run([task("Random", "white", i) for i in range(5)], play)
+    assert len(played) == 1
+
+
+def test_arun():
+    scheduler = GameScheduler(max_games=4)
+
+    async def play(t):
+        await asyncio.sleep(0)
+        return SimpleNamespace(moves_played=t.game_num)
+
+    results = asyncio.run(scheduler.arun([task("Random", "white", i) for i in range(6)], play))
+    assert sorted(t.game_num for t, _ in results) == list(range(6))
+    assert scheduler.async_llm_slots is not None
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Tests for the local move repairs in move_repair.py"""
+import chess
+
+from move_repair import REPAIRS, repair_move
+
+
+def repair(move_text, board, response=""):
+    return repair_move(move_text, response, board, list(board.legal_moves))
+
+
+def test_exact_move_needs_no_repair():
+    board = chess.Board()
+    assert repair("e2e4", board) == (chess.Move.from_uci("e2e4"), None)
+
+
+def test_normalize():
+    board = chess.Board()
+    assert repair(" E2-E4 ", board) == (chess.Move.from_uci("e2e4"), "normalize")
+    promotion = chess.Board("8/4P3/8/8/8/8/k7/6K1 w - - 0 1")
+    assert repair("e7e8=Q", promotion) == (chess.Move.from_uci("e7e8q"), "normalize")
+
+
+def test_promotion_defaults_to_queen():
+    board = chess.Board("8/4P3/8/8/8/8/k7/6K1 w - - 0 1")
+    assert repair("e7e8", board) == (chess.Move.from_uci("e7e8q"), "promotion")
+
+
+def test_san():
+    board = chess.Board()
+    assert repair("Nf3", board) == (chess.Move.from_uci("g1f3"), "san")
+    assert repair("nf3", board) == (chess.Move.from_uci("g1f3"), "san")
+    castling = chess.Board("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+    assert repair("O-O", castling) == (chess.Move.from_uci("e1g1"), "san")
+    assert repair("0-0-0", castling) == (chess.Move.from_uci("e1c1"), "san")
+
+
+def test_san_needs_the_board():
+    board = chess.Board()
+    assert repair_move("Nf3", "", None, list(board.legal_moves)) == (None, None)
+
+
+def test_nearest_only_when_unambiguous():
+    board = chess.Board()
+    # g1f3 is the only legal move one character away from g1f4
+    assert repair("g1f4", board) == (chess.Move.from_uci("g1f3"), "nearest")
+    # e2e5 is one character away from both e2e3 and e2e4
+    assert repair("e2e5", board) == (None, None)
+
+
+def test_think_without_tag_takes_last_legal_mention():
+    board = chess.Board()
+    response = "<think>e2e4 is fine, but Nf3 keeps options open; not e2e5.</think>"
+    assert repair(None, board, response) == (chess.Move.from_uci("g1f3"), "think")
+    assert repair("  ", board, response) == (chess.Move.from_uci("g1f3"), "think")
+
+
+def test_think_without_legal_mention():
+    board = chess.Board()
+    assert repair(None, board, "<think>no idea</think>") == (None, None)
+    assert repair(None, board, "no think section at all") == (None, None)
+
+
+def test_unrepairable_move():
+    assert repair("zz99", chess.Board()) == (None, None)
+
+
+def test_repair_names():
+    assert REPAIRS == ("normalize", "promotion", "san", "nearest", "think")
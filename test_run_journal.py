@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Tests for the crash-safe run journal in run_journal.py"""
+import json
+
+import pytest
+
+from run_journal import RunJournal
+
+
+def test_create_record_and_load(tmp_path):
+    journal = RunJournal.create({"endpoint": "http://localhost:5000/v1", "games": 4},
+                                run_id="run1", directory=str(tmp_path))
+    journal.record_game("Random", "white", 1, {"result": "White wins"})
+    journal.record_game("Random", "black", 2, {"result": "Draw"})
+
+    loaded = RunJournal.load("run1", directory=str(tmp_path))
+    assert loaded.config == {"endpoint": "http://localhost:5000/v1", "games": 4}
+    assert loaded.completed == {
+        ("Random", "white", 1): {"result": "White wins"},
+        ("Random", "black", 2): {"result": "Draw"},
+    }
+
+
+def test_create_refuses_existing_run(tmp_path):
+    RunJournal.create({}, run_id="run1", directory=str(tmp_path))
+    with pytest.raises(FileExistsError):
+        RunJournal.create({}, run_id="run1", directory=str(tmp_path))
+
+
+def test_load_missing_run(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        RunJournal.load("nope", directory=str(tmp_path))
+
+
+def test_load_skips_partial_last_line(tmp_path):
+    journal = RunJournal.create({}, run_id="run1", directory=str(tmp_path))
+    journal.record_game("Random", "white", 1, {"result": "White wins"})
+    # A crash in the middle of writing the next record
+    with open(journal.path, "a") as f:
+        f.write(json.dumps({"type": "game", "opponent": "Random", "color": "black",
+                            "game_num": 2, "stats": {}})[:30])
+
+    loaded = RunJournal.load("run1", directory=str(tmp_path))
+    assert list(loaded.completed) == [("Random", "white", 1)]
+
+
+def test_append_after_partial_line_starts_a_fresh_line(tmp_path):
+    journal = RunJournal.create({}, run_id="run1", directory=str(tmp_path))
+    with open(journal.path, "a") as f:
+        f.write('{"type": "game", "oppon')
+
+    resumed = RunJournal.load("run1", directory=str(tmp_path))
+    resumed.record_game("Random", "black", 2, {"result": "Draw"})
+
+    loaded = RunJournal.load("run1", directory=str(tmp_path))
+    assert loaded.completed == {("Random", "black", 2): {"result": "Draw"}}
+    with open(journal.path) as f:
+        assert f.read().endswith("\n")
+
+
+def test_config_differences(tmp_path):
+    journal = RunJournal.create({"games": 4, "depth": 1}, run_id="run1", directory=str(tmp_path))
+    assert journal.config_differences({"games": 4, "depth": 1}) == {}
+    # Settings the journal did not record are not compared
+    assert journal.config_differences({"games": 6, "depth": 1, "new": True}) == {"games": (4, 6)}
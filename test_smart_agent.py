@@ -4,19 +4,29 @@ import sys
 sys.path.insert(0, '/Users/rakshit/workspace/repos/chess/global-chess-challenge-2025-starter-kit')
 
 from smart_agent import SmartChessAgent
+from eval_cache import DEFAULT_CACHE_PATH, EvalCache, limits_key
 import chess
 import chess.engine
 
-def get_position_eval(board, engine, depth=10):
+def get_position_eval(board, engine, depth=10, cache=None):
     """Get position evaluation"""
+    limits = limits_key(depth=depth)
+    if cache is not None:
+        cached = cache.get(board, limits)
+        if cached is not None:
+            return cached
     try:
         info = engine.analyse(board, chess.engine.Limit(depth=depth))
         score = info["score"].white()
         if score.is_mate():
-            return 10000 if score.mate() > 0 else -10000
-        return score.score()
+            value = 10000 if score.mate() > 0 else -10000
+        else:
+            value = score.score()
     except:
         return 0
+    if cache is not None:
+        cache.put(board, limits, value)
+    return value
 
 def calculate_acpl(move_evals):
     """Calculate ACPL"""
@@ -37,7 +47,7 @@ def calculate_acpl(move_evals):
     
     return sum(losses) / len(losses) if losses else 0.0
 
-def play_game(agent, stockfish_path, stockfish_skill=1, analysis_depth=10):
+def play_game(agent, stockfish_path, stockfish_skill=1, analysis_depth=10, eval_cache=None):
     """Play one game"""
     board = chess.Board()
     engine = chess.engine.SimpleEngine.popen_uci(stockfish_path)
@@ -52,7 +62,7 @@ def play_game(agent, stockfish_path, stockfish_skill=1, analysis_depth=10):
     move_num = 1
     
     while not board.is_game_over() and len(moves_played) < 100:
-        eval_before = get_position_eval(board, engine, analysis_depth)
+        eval_before = get_position_eval(board, engine, analysis_depth, eval_cache)
         move_evals.append(eval_before)
         
         if board.turn == chess.WHITE:
@@ -79,7 +89,7 @@ def play_game(agent, stockfish_path, stockfish_skill=1, analysis_depth=10):
         
         moves_played.append(move_str if board.turn == chess.BLACK else move.uci())
     
-    final_eval = get_position_eval(board, engine, analysis_depth)
+    final_eval = get_position_eval(board, engine, analysis_depth, eval_cache)
     move_evals.append(final_eval)
     
     engine.quit()
@@ -104,6 +114,8 @@ if __name__ == "__main__":
     parser.add_argument("--model", type=str, default="qwen-chess-0.5b-108k-merged-new")
     parser.add_argument("--stockfish", type=str, default="/opt/homebrew/bin/stockfish")
     parser.add_argument("--num-games", type=int, default=3)
+    parser.add_argument("--eval-cache", type=str, default=DEFAULT_CACHE_PATH)
+    parser.add_argument("--no-eval-cache", action="store_true")
     args = parser.parse_args()
     
     print("Initializing Smart Agent with:")
@@ -114,6 +126,7 @@ if __name__ == "__main__":
     print()
     
     agent = SmartChessAgent(args.model, args.stockfish, use_search=True)
+    eval_cache = None if args.no_eval_cache else EvalCache(args.eval_cache)
     
     results = []
     total_acpl = 0
@@ -126,7 +139,7 @@ if __name__ == "__main__":
         print(f"GAME {game_num + 1}/{args.num_games}")
         print(f"{'='*60}")
         
-        result = play_game(agent, args.stockfish, stockfish_skill=1, analysis_depth=10)
+        result = play_game(agent, args.stockfish, stockfish_skill=1, analysis_depth=10, eval_cache=eval_cache)
         results.append(result)
         total_acpl += result["acpl"]
         
@@ -145,4 +158,6 @@ if __name__ == "__main__":
     print(f"Record: {wins}W-{losses}L-{draws}D")
     print(f"Win rate: {wins/args.num_games*100:.1f}%")
     print(f"Average ACPL: {total_acpl/args.num_games:.2f}")
+    if eval_cache is not None:
+        print(eval_cache.summary())
     print(f"{'='*60}")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Tests for the GSPRT early-stopping test in sprt.py"""
+import math
+
+import pytest
+
+from sprt import SPRT, expected_score
+
+
+def test_expected_score():
+    assert expected_score(0) == pytest.approx(0.5)
+    assert expected_score(400) == pytest.approx(10 / 11)
+    assert expected_score(-400) == pytest.approx(1 / 11)
+
+
+def test_bounds_from_alpha_beta():
+    test = SPRT(elo0=0, elo1=50)
+    assert test.lower == pytest.approx(math.log(0.05 / 0.95))
+    assert test.upper == pytest.approx(math.log(0.95 / 0.05))
+    assert test.upper == pytest.approx(2.944, abs=1e-3)
+
+    skewed = SPRT(elo0=0, elo1=50, alpha=0.01, beta=0.1)
+    assert skewed.lower == pytest.approx(math.log(0.1 / 0.99))
+    assert skewed.upper == pytest.approx(math.log(0.9 / 0.01))
+
+
+def test_needs_elo1_above_elo0():
+    with pytest.raises(ValueError):
+        SPRT(elo0=50, elo1=50)
+
+
+def test_llr_matches_normal_approximation():
+    test = SPRT(elo0=0, elo1=50)
+    for score in [1.0] * 6 + [0.5] * 3 + [0.0] * 2:
+        test.add(score)
+    assert (test.wins, test.draws, test.losses) == (6, 3, 2)
+
+    # Half a pseudo-game per outcome
+    wins, draws, losses = 6.5, 3.5, 2.5
+    n = wins + draws + losses
+    mean = (wins + 0.5 * draws) / n
+    variance = (wins * (1 - mean) ** 2 + draws * (0.5 - mean) ** 2 + losses * mean ** 2) / n
+    s0, s1 = expected_score(0), expected_score(50)
+    assert test.llr() == pytest.approx(n * (s1 - s0) * (2 * mean - s0 - s1) / (2 * variance))
+
+
+def test_llr_is_zero_without_games():
+    assert SPRT(elo0=0, elo1=50).llr() == 0.0
+
+
+def test_all_wins_accepts_h1_and_stays_decided():
+    test = SPRT(elo0=0, elo1=50)
+    decision = None
+    while decision is None:
+        decision = test.add(1.0)
+    assert decision == "H1"
+    assert test.llr() >= test.upper
+    decided_at = test.decided_at
+    assert decided_at == test.games
+
+    # Later games are counted but do not reopen the test
+    for _ in range(20):
+        assert test.add(0.0) == "H1"
+    assert test.decided_at == decided_at
+    assert test.losses == 20
+
+
+def test_all_losses_accepts_h0():
+    test = SPRT(elo0=0, elo1=50)
+    decision = None
+    while decision is None:
+        decision = test.add(0.0)
+    assert decision == "H0"
+    assert test.llr() <= test.lower
+
+
+def test_even_results_stay_undecided_early():
+    test = SPRT(elo0=0, elo1=50)
+    for score in (1.0, 0.0, 0.5, 1.0, 0.0, 0.5):
+        assert test.add(score) is None
+    assert "no decision" in test.summary()
+    assert "+2 =2 -2" in test.summary()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Tests for the tournament crosstable and ratings in tournament.py"""
+import math
+
+import pytest
+
+from tournament import Crosstable, bayeselo, elo_from_score, pairwise_elo, parse_endpoints
+
+
+def test_parse_endpoints():
+    assert parse_endpoints(["http://localhost:5000/v1", "b=http://localhost:5001/v1"]) == [
+        ("localhost:5000", "http://localhost:5000/v1"),
+        ("b", "http://localhost:5001/v1"),
+    ]
+    with pytest.raises(ValueError):
+        parse_endpoints(["a=http://x/v1", "a=http://y/v1"])
+
+
+def test_elo_from_score():
+    assert elo_from_score(0.5) == pytest.approx(0.0)
+    assert elo_from_score(10 / 11) == pytest.approx(400.0)
+    assert elo_from_score(1 / 11) == pytest.approx(-400.0)
+
+
+def test_pairwise_elo_even_score():
+    elo, lower, upper = pairwise_elo(5, 10, 5)
+    assert elo == pytest.approx(0.0)
+    assert lower == pytest.approx(-upper)
+    assert lower < 0 < upper
+
+
+def test_pairwise_elo_interval():
+    wins, draws, losses = 12, 4, 4
+    elo, lower, upper = pairwise_elo(wins, draws, losses)
+    games = wins + draws + losses
+    score = (wins + 0.5 * draws) / games
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    margin = 1.959964 * math.sqrt(variance / games)
+    assert elo == pytest.approx(elo_from_score(score))
+    assert lower == pytest.approx(elo_from_score(score - margin))
+    assert upper == pytest.approx(elo_from_score(score + margin))
+    assert lower < elo < upper
+
+
+def test_pairwise_elo_clipped():
+    assert pairwise_elo(0, 0, 0) == (0.0, -1200.0, 1200.0)
+    elo, _, upper = pairwise_elo(10, 0, 0)
+    assert elo == 1200.0 and upper == 1200.0
+
+
+def test_crosstable_pairs_over_both_colors():
+    table = Crosstable()
+    table.add("a", "b", 1.0)
+    table.add("b", "a", 1.0)
+    table.add("b", "a", 0.5)
+    table.add("a", "c", 0.0)
+    assert table.participants == ["a", "b", "c"]
+    assert table.pair("a", "b") == (1, 1, 1)
+    assert table.pair("b", "a") == (1, 1, 1)
+    assert table.pair("a", "c") == (0, 0, 1)
+    assert table.opponents("a") == ["b", "c"]
+    assert table.opponents("b") == ["a"]
+
+
+def test_bayeselo_orders_and_anchors():
+    table = Crosstable()
+    # strong beats anchor most of the time, anchor beats weak most of the time
+    for _ in range(8):
+        table.add("strong", "anchor", 1.0)
+        table.add("anchor", "strong", 0.0)
+        table.add("anchor", "weak", 1.0)
+        table.add("weak", "anchor", 0.0)
+    for white, black in (("strong", "anchor"), ("anchor", "strong"), ("anchor", "weak"), ("weak", "anchor")):
+        table.add(white, black, 0.5)
+
+    fit = bayeselo(table, anchor="anchor")
+    ratings = fit["ratings"]
+    assert ratings["anchor"] == (0.0, 0.0, 0.0)
+    assert ratings["strong"][0] > 0 > ratings["weak"][0]
+    for name in ("strong", "weak"):
+        elo, lower, upper = ratings[name]
+        assert lower < elo < upper
+    # Symmetric games: symmetric ratings and no white advantage
+    assert ratings["strong"][0] == pytest.approx(-ratings["weak"][0], rel=1e-3)
+    assert fit["advantage"] == pytest.approx(0.0, abs=1.0)
+
+
+def test_bayeselo_unknown_anchor_falls_back_to_first():
+    table = Crosstable()
+    table.add("a", "b", 1.0)
+    table.add("b", "a", 0.5)
+    ratings = bayeselo(table, anchor="nobody")["ratings"]
+    assert ratings["a"] == (0.0, 0.0, 0.0)
+    assert ratings["b"][0] < 0
+
+
+def test_bayeselo_empty_table():
+    assert bayeselo(Crosstable()) == {"ratings": {}, "advantage": 0.0, "draw_elo": 0.0}
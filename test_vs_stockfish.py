@@ -7,6 +7,8 @@ from transformers import AutoModelForCausalLM, AutoTokenizer
 import re
 import sys
 
+from eval_cache import DEFAULT_CACHE_PATH, EvalCache, limits_key
+
 class ChessAgent:
     def __init__(self, model_path):
         print(f"Loading model: {model_path}")
@@ -66,8 +68,13 @@ Format:
         print(f"Warning: Could not parse move from response, using first legal move")
         return legal_moves[0] if legal_moves else None
 
-def get_position_eval(board, engine, depth=10):
+def get_position_eval(board, engine, depth=10, cache=None):
     """Get position evaluation in centipawns from white's perspective"""
+    limits = limits_key(depth=depth)
+    if cache is not None:
+        cached = cache.get(board, limits)
+        if cached is not None:
+            return cached
     try:
         info = engine.analyse(board, chess.engine.Limit(depth=depth))
         score = info["score"].white()
@@ -75,11 +82,14 @@ def get_position_eval(board, engine, depth=10):
         if score.is_mate():
             # Mate in N moves
             mate_in = score.mate()
-            return 10000 if mate_in > 0 else -10000
+            value = 10000 if mate_in > 0 else -10000
         else:
-            return score.score()
+            value = score.score()
     except:
         return 0
+    if cache is not None:
+        cache.put(board, limits, value)
+    return value
 
 def calculate_acpl(move_evals):
     """Calculate Average Centipawn Loss"""
@@ -101,7 +111,7 @@ def calculate_acpl(move_evals):
     
     return sum(losses) / len(losses) if losses else 0.0
 
-def play_game(agent, stockfish_path, stockfish_skill=1, analysis_depth=10):
+def play_game(agent, stockfish_path, stockfish_skill=1, analysis_depth=10, eval_cache=None):
     """Play one game and return ACPL"""
     board = chess.Board()
     engine = chess.engine.SimpleEngine.popen_uci(stockfish_path)
@@ -119,7 +129,7 @@ def play_game(agent, stockfish_path, stockfish_skill=1, analysis_depth=10):
     
     while not board.is_game_over() and len(moves_played) < 100:
         # Get evaluation before move
-        eval_before = get_position_eval(board, engine, analysis_depth)
+        eval_before = get_position_eval(board, engine, analysis_depth, eval_cache)
         move_evals.append(eval_before)
         
         if board.turn == chess.WHITE:
@@ -151,7 +161,7 @@ def play_game(agent, stockfish_path, stockfish_skill=1, analysis_depth=10):
         moves_played.append(move_str if board.turn == chess.BLACK else move.uci())
     
     # Final evaluation
-    final_eval = get_position_eval(board, engine, analysis_depth)
+    final_eval = get_position_eval(board, engine, analysis_depth, eval_cache)
     move_evals.append(final_eval)
     
     engine.quit()
@@ -180,6 +190,8 @@ def main():
     parser.add_argument("--skill-level", type=int, default=1, help="Stockfish skill level (0-20)")
     parser.add_argument("--analysis-depth", type=int, default=10, help="Stockfish analysis depth")
     parser.add_argument("--num-games", type=int, default=10, help="Number of games to play")
+    parser.add_argument("--eval-cache", type=str, default=DEFAULT_CACHE_PATH, help="SQLite position-evaluation cache")
+    parser.add_argument("--no-eval-cache", action="store_true", help="Always search instead of using the cache")
     args = parser.parse_args()
     
     print(f"Testing: {args.model}")
@@ -189,6 +201,7 @@ def main():
     print()
     
     agent = ChessAgent(args.model)
+    eval_cache = None if args.no_eval_cache else EvalCache(args.eval_cache)
     
     results = []
     total_acpl = 0
@@ -201,7 +214,7 @@ def main():
         print(f"GAME {game_num + 1}/{args.num_games}")
         print(f"{'='*60}")
         
-        result = play_game(agent, args.stockfish, args.skill_level, args.analysis_depth)
+        result = play_game(agent, args.stockfish, args.skill_level, args.analysis_depth, eval_cache)
         results.append(result)
         total_acpl += result["acpl"]
         
@@ -220,6 +233,8 @@ def main():
     print(f"Wins: {wins}, Draws: {draws}, Losses: {losses}")
     print(f"Win rate: {wins/args.num_games*100:.1f}%")
     print(f"Average ACPL: {total_acpl/args.num_games:.2f}")
+    if eval_cache is not None:
+        print(eval_cache.summary())
     print(f"{'='*60}")
 
 if __name__ == "__main__":
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Round-robin tournaments between several endpoints and Stockfish opponents.
+
+Comparing checkpoints used to mean one local_evaluation.py run per endpoint,
+each with its own Stockfish processes, one after another. With several
+`--endpoint` values a single run instead plays every endpoint against every
+other endpoint and against the Stockfish opponents, with all pairings'
+games interleaved on one scheduler, one engine pool and one evaluation cache.
+
+Results are collected in a Crosstable and rated two ways:
+
+  pairwise Elo   Elo difference of each pairing from its score, with a 95%
+                 confidence interval from the win/draw/loss variance
+  BayesElo       one rating per participant fitted over all games with
+                 Rémi Coulom's bayeselo model (white advantage and draw Elo
+                 estimated from the games, two virtual draws per participant
+                 as prior), anchored at the first Stockfish opponent (or the
+                 first endpoint); 95% intervals from the posterior curvature
+
+    table = Crosstable()
+    table.add("ckpt-a", "Stockfish (depth 1, skill 0)", 1.0)  # white, black, white's score
+    ratings = bayeselo(table, anchor="Stockfish (depth 1, skill 0)")
+"""
+
+import math
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sprt import expected_score
+
+# 95% two-sided normal quantile
+Z95 = 1.959964
+# Virtual draws per participant (bayeselo's default prior)
+PRIOR_DRAWS = 2.0
+
+_C = math.log(10.0) / 400.0
+
+
+def parse_endpoints(values: List[str]) -> List[Tuple[str, str]]:
+    """
+    Parse `--endpoint` values into (label, base URL) pairs.
+
+    A value is either a URL or `label=URL`; unlabeled endpoints are named
+    after their host, port and path.
+
+    Args:
+        values: Raw --endpoint values in command-line order
+
+    Returns:
+        (label, base_url) pairs with unique labels
+    """
+    endpoints = []
+    seen = set()
+    for value in values:
+        label, sep, url = value.partition("=")
+        if not sep or "://" in label:
+            label, url = value.split("://", 1)[-1].rstrip("/"), value
+            if label.endswith("/v1"):
+                label = label[:-3]
+        if label in seen:
+            raise ValueError(f"endpoint label {label!r} is given twice")
+        seen.add(label)
+        endpoints.append((label, url))
+    return endpoints
+
+
+def elo_from_score(score: float) -> float:
+    """Elo difference at which `score` is the expected score."""
+    score = min(max(score, 1e-6), 1.0 - 1e-6)
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+
+def pairwise_elo(wins: int, draws: int, losses: int) -> Tuple[float, float, float]:
+    """
+    Elo difference and its 95% confidence interval from one pairing's results.
+
+    Args:
+        wins: Games won by the first participant
+        draws: Drawn games
+        losses: Games lost by the first participant
+
+    Returns:
+        (elo, lower, upper); infinite bounds are clipped to +-1200 Elo
+    """
+    games = wins + draws + losses
+    if games == 0:
+        return 0.0, -1200.0, 1200.0
+    score = (wins + 0.5 * draws) / games
+    variance = (wins * (1.0 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    margin = Z95 * math.sqrt(variance / games)
+    clip = lambda elo: min(max(elo, -1200.0), 1200.0)
+    return (clip(elo_from_score(score)), clip(elo_from_score(score - margin)),
+            clip(elo_from_score(score + margin)))
+
+
+class Crosstable:
+    """Win/draw/loss counts per (white, black) pair of participants."""
+
+    def __init__(self):
+        # (white, black) -> [white wins, draws, black wins]
+        self.games: Dict[Tuple[str, str], List[int]] = defaultdict(lambda: [0, 0, 0])
+        self.participants: List[str] = []
+
+    def add(self, white: str, black: str, white_score: float):
+        """
+        Count one game.
+
+        Args:
+            white: Participant playing white
+            black: Participant playing black
+            white_score: 1.0 white won, 0.5 draw, 0.0 black won
+        """
+        for name in (white, black):
+            if name not in self.participants:
+                self.participants.append(name)
+        counts = self.games[(white, black)]
+        counts[0 if white_score >= 1.0 else 2 if white_score <= 0.0 else 1] += 1
+
+    def pair(self, a: str, b: str) -> Tuple[int, int, int]:
+        """Wins, draws and losses of `a` against `b` over both colors."""
+        ab = self.games.get((a, b), [0, 0, 0])
+        ba = self.games.get((b, a), [0, 0, 0])
+        return ab[0] + ba[2], ab[1] + ba[1], ab[2] + ba[0]
+
+    def opponents(self, name: str) -> List[str]:
+        """Participants that played `name`, in order of first appearance."""
+        return [other for other in self.participants
+                if other != name and sum(self.pair(name, other)) > 0]
+
+
+def _outcome_terms(x: float, advantage: float, draw_elo: float) -> Tuple[Tuple[float, float, float], ...]:
+    """
+    (log-probability, d/dx, d2/dx2) of a white win, draw and black win.
+
+    x is white's rating minus black's; the derivatives are taken with respect to it.
+    """
+    u = x + advantage - draw_elo
+    v = -x - advantage - draw_elo
+    fu, fv = expected_score(u), expected_score(v)
+    du, dv = _C * fu * (1 - fu), _C * fv * (1 - fv)  # f'(u), f'(v)
+    ddu, ddv = _C * du * (1 - 2 * fu), _C * dv * (1 - 2 * fv)
+    draw = max(1.0 - fu - fv, 1e-300)
+    draw_d = -du + dv
+    draw_dd = -ddu - ddv
+    return (
+        (math.log(fu), _C * (1 - fu), -_C * du),
+        (math.log(draw), draw_d / draw, draw_dd / draw - (draw_d / draw) ** 2),
+        (math.log(fv), -_C * (1 - fv), -_C * dv),
+    )
+
+
+def _weighted_games(table: Crosstable, prior: float) -> Dict[Tuple[str, str], List[float]]:
+    """Crosstable counts plus the prior's virtual draws, split over colors and opponents."""
+    games = {pair: [float(c) for c in counts] for pair, counts in table.games.items()}
+    for name in table.participants:
+        opponents = table.opponents(name)
+        for other in opponents:
+            # Half of this participant's share of draws with each color
+            for pair in ((name, other), (other, name)):
+                games.setdefault(pair, [0.0, 0.0, 0.0])[1] += prior / len(opponents) / 4
+    return games
+
+
+def _log_likelihood(games, ratings: Dict[str, float], advantage: float, draw_elo: float) -> float:
+    total = 0.0
+    for (white, black), counts in games.items():
+        terms = _outcome_terms(ratings[white] - ratings[black], advantage, draw_elo)
+        total += sum(count * term[0] for count, term in zip(counts, terms) if count)
+    return total
+
+
+def _fit_ratings(games, names: List[str], anchor: str, advantage: float, draw_elo: float,
+                 ratings: Dict[str, float]) -> Tuple[Dict[str, float], List[List[float]]]:
+    """
+    Newton's method for the ratings at fixed advantage and draw Elo.
+
+    Returns:
+        (ratings, negative Hessian over the non-anchor participants)
+    """
+    free = [name for name in names if name != anchor]
+    index = {name: i for i, name in enumerate(free)}
+    ratings = dict(ratings)
+    hessian = [[0.0] * len(free) for _ in free]
+    for _ in range(50):
+        gradient = [0.0] * len(free)
+        hessian = [[0.0] * len(free) for _ in free]
+        for (white, black), counts in games.items():
+            terms = _outcome_terms(ratings[white] - ratings[black], advantage, draw_elo)
+            g = sum(count * term[1] for count, term in zip(counts, terms))
+            h = -sum(count * term[2] for count, term in zip(counts, terms))
+            i, j = index.get(white), index.get(black)
+            if i is not None:
+                gradient[i] += g
+                hessian[i][i] += h
+            if j is not None:
+                gradient[j] -= g
+                hessian[j][j] += h
+            if i is not None and j is not None:
+                hessian[i][j] -= h
+                hessian[j][i] -= h
+        step = _solve(hessian, gradient)
+        if step is None:
+            break
+        # Backtrack so every step increases the likelihood
+        before = _log_likelihood(games, ratings, advantage, draw_elo)
+        scale = 1.0
+        while scale > 1e-4:
+            trial = dict(ratings)
+            for name, i in index.items():
+                trial[name] += scale * step[i]
+            if _log_likelihood(games, trial, advantage, draw_elo) >= before - 1e-12:
+                break
+            scale /= 2
+        ratings = trial
+        if max((abs(s) * scale for s in step), default=0.0) < 1e-6:
+            break
+    return ratings, hessian
+
+
+def _solve(matrix: List[List[float]], vector: List[float]) -> Optional[List[float]]:
+    """Solve matrix @ x = vector by Gaussian elimination; None if singular."""
+    n = len(vector)
+    rows = [list(row) + [value] for row, value in zip(matrix, vector)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(rows[r][col]))
+        if abs(rows[pivot][col]) < 1e-12:
+            return None
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(n):
+            if r != col:
+                factor = rows[r][col] / rows[col][col]
+                rows[r] = [a - factor * b for a, b in zip(rows[r], rows[col])]
+    return [rows[i][n] / rows[i][i] for i in range(n)]
+
+
+def _golden_max(func, low: float, high: float, iterations: int = 30) -> float:
+    """Argmax of a unimodal function on [low, high]."""
+    ratio = (math.sqrt(5) - 1) / 2
+    a, b = low, high
+    c, d = b - ratio * (b - a), a + ratio * (b - a)
+    fc, fd = func(c), func(d)
+    for _ in range(iterations):
+        if fc >= fd:
+            b, d, fd = d, c, fc
+            c = b - ratio * (b - a)
+            fc = func(c)
+        else:
+            a, c, fc = c, d, fd
+            d = a + ratio * (b - a)
+            fd = func(d)
+    return (a + b) / 2
+
+
+def bayeselo(table: Crosstable, anchor: Optional[str] = None,
+             prior: float = PRIOR_DRAWS) -> Dict[str, object]:
+    """
+    Fit bayeselo ratings to a crosstable.
+
+    Args:
+        table: Games between the participants
+        anchor: Participant rated 0 (default: the first participant)
+        prior: Virtual draws per participant, spread over its opponents
+
+    Returns:
+        {"ratings": {name: (elo, lower, upper)}, "advantage": white advantage,
+        "draw_elo": draw Elo}; participants not connected to the anchor by
+        games get infinite intervals
+    """
+    names = list(table.participants)
+    if not names:
+        return {"ratings": {}, "advantage": 0.0, "draw_elo": 0.0}
+    anchor = anchor if anchor in names else names[0]
+    games = _weighted_games(table, prior)
+    ratings = {name: 0.0 for name in names}
+    advantage, draw_elo = 0.0, 100.0
+
+    def fitted(adv: float, draw: float) -> float:
+        return _log_likelihood(games, _fit_ratings(games, names, anchor, adv, draw, ratings)[0], adv, draw)
+
+    # Alternate between the ratings and the two model parameters
+    for _ in range(4):
+        ratings, _ = _fit_ratings(games, names, anchor, advantage, draw_elo, ratings)
+        advantage = _golden_max(lambda adv: fitted(adv, draw_elo), -200.0, 200.0)
+        draw_elo = _golden_max(lambda draw: fitted(advantage, draw), 1.0, 600.0)
+    ratings, hessian = _fit_ratings(games, names, anchor, advantage, draw_elo, ratings)
+
+    free = [name for name in names if name != anchor]
+    result = {anchor: (0.0, 0.0, 0.0)}
+    for i, name in enumerate(free):
+        unit = [1.0 if j == i else 0.0 for j in range(len(free))]
+        column = _solve(hessian, unit)
+        variance = column[i] if column is not None and column[i] > 0 else math.inf
+        margin = Z95 * math.sqrt(variance)
+        result[name] = (ratings[name], ratings[name] - margin, ratings[name] + margin)
+    return {"ratings": result, "advantage": advantage, "draw_elo": draw_elo}
+
+
+def print_tournament(table: Crosstable, endpoints: List[str], anchor: Optional[str] = None):
+    """
+    Print the crosstable, pairwise Elo differences and bayeselo ratings.
+
+    Args:
+        table: Tournament games
+        endpoints: Endpoint labels (pairwise Elo is reported from their side)
+        anchor: Participant rated 0 in the bayeselo table
+    """
+    print("\n" + "="*70)
+    print(" "*22 + "TOURNAMENT RESULTS")
+    print("="*70)
+    print("Pairings (first participant's view, Elo with 95% interval):")
+    for i, name in enumerate(endpoints):
+        for other in table.participants:
+            if other == name or (other in endpoints and endpoints.index(other) < i):
+                continue
+            wins, draws, losses = table.pair(name, other)
+            if wins + draws + losses == 0:
+                continue
+            elo, lower, upper = pairwise_elo(wins, draws, losses)
+            print(f"  {name} vs {other}: +{wins} ={draws} -{losses}  "
+                  f"Elo {elo:+.0f} [{lower:+.0f}, {upper:+.0f}]")
+
+    fit = bayeselo(table, anchor=anchor)
+    anchor = anchor if anchor in table.participants else (table.participants[0] if table.participants else None)
+    print(f"\nBayesElo (anchored at {anchor} = 0; white advantage {fit['advantage']:.0f}, "
+          f"draw Elo {fit['draw_elo']:.0f}):")
+    ranked = sorted(fit["ratings"].items(), key=lambda item: -item[1][0])
+    width = max((len(name) for name, _ in ranked), default=0)
+    for rank, (name, (elo, lower, upper)) in enumerate(ranked, 1):
+        games = sum(sum(table.pair(name, other)) for other in table.participants if other != name)
+        interval = "anchor" if name == anchor else f"[{lower:+.0f}, {upper:+.0f}]"
+        print(f"  {rank}. {name:<{width}}  {elo:+6.0f}  {interval}  ({games} games)")
+    print("="*70 + "\n")